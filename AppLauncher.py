@@ -1,12 +1,33 @@
 import tkinter as tk
-from tkinter import ttk, filedialog, colorchooser
-from PIL import Image, ImageTk
+from tkinter import ttk, filedialog, colorchooser, messagebox, simpledialog
 import os
-import json
-import subprocess
-from gradient_utils import setup_macos_window, create_rounded_inner_container, configure_ttk_styles
-
-class AppLauncher(tk.Toplevel):
+import uuid
+from app_discovery import AppDiscovery, discovery_enabled
+from app_search import SearchIndex, LaunchHistory
+from app_store import AppStore
+from gradient_utils import setup_macos_panel
+from launch_supervisor import LaunchSupervisor
+from panel_pool import PooledPanel
+from theme import ensure_styles, themed, current_theme
+from thumbnail_cache import request_thumbnail, thumbnail_cache
+from virtual_list import VirtualList
+
+# Wysokość wiersza aplikacji razem z odstępem - lista tworzy widgety tylko dla widocznych wierszy
+APP_ROW_HEIGHT = 32
+ICON_SIZE = (20, 20)
+# Grupy uruchamiania: ile programów startuje naraz i co ile sekund kolejny (można zmienić w apps.json)
+GROUP_DEFAULT_CONCURRENCY = 2
+GROUP_DEFAULT_STAGGER = 1.0
+# Najwięcej wpisów w grupie tworzonej z wyników wyszukiwania
+GROUP_MAX_ENTRIES = 20
+# Po tylu ms od końca uruchamiania grupy znika jej podsumowanie
+GROUP_STATUS_CLEAR_MS = 5000
+
+def new_entry_id():
+    """Stały identyfikator wpisu w apps.json - nie zmienia się przy edycji ani przesuwaniu"""
+    return uuid.uuid4().hex[:12]
+
+class AppLauncher(PooledPanel, tk.Toplevel):
     def __init__(self, master=None):
         super().__init__(master)
         self.overrideredirect(True)
@@ -14,20 +35,19 @@ class AppLauncher(tk.Toplevel):
         self.geometry("400x300+400+320")  # Below VolumeMixer (10+300+10=320)
         
         # Setup macOS style rounded window
-        self.canvas, self.container = setup_macos_window(self, 400, 300, corner_radius=16, 
-                                                        bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0)
+        self.canvas, self.container = setup_macos_panel(self, 400, 300, corner_radius=16, border_width=0,
+                                                        margin=20, inner_radius=12)
 
-        # Configure TTK styles for sliders
-        configure_ttk_styles()
+        # TTK styles are registered once per Tk interpreter - a no-op after the first panel
+        ensure_styles(self)
 
-        # Draw rounded inner container with equal margins (20px from all sides)
+        # Inner container margins (20px from all sides), drawn into the cached background
         margin = 20
         inner_width = 400 - 2 * margin  # 360
         inner_height = 300 - 2 * margin  # 260
-        create_rounded_inner_container(self.canvas, margin, margin, inner_width, inner_height, corner_radius=12, bg_color="#3A3A3C")
         
         # Title bar positioned over the gray container - slightly lighter than outer part
-        self.title_bar = tk.Frame(self.canvas, bg="#2A2A2C", height=30)
+        self.title_bar = themed(tk.Frame, self.canvas, "title_bar", height=30)
         self.canvas.create_window(margin, margin, window=self.title_bar, anchor='nw', width=inner_width, height=30)
         
         # Bind drag events to title bar only
@@ -35,58 +55,79 @@ class AppLauncher(tk.Toplevel):
         self.title_bar.bind("<B1-Motion>", self.do_move)
         
         # Menu or custom button on the left side of the title bar
-        self.menu_btn = tk.Button(
+        self.menu_btn = themed(
+            tk.Button,
             self.title_bar,
+            "button",
             text="+",  # lub "+" jeśli ma to być np. dodawanie aplikacji
-            bg="#5A5A5C",
             command=self.open_add_dialog,
-            fg="white",
-            font=("Arial", 10, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#6A6A6C"
+            font=("Arial", 10, "bold")
         )
         self.menu_btn.pack(side='left', padx=10, pady=5)
 
+        # Named launch groups ("morning") - start several entries with one click
+        self.group_btn = themed(tk.Menubutton, self.title_bar, "button", text="Grupy ▾", font=("Arial", 9))
+        self.group_menu = tk.Menu(self.group_btn, tearoff=0, postcommand=self.fill_group_menu)
+        self.delete_group_menu = tk.Menu(self.group_menu, tearoff=0)
+        self.group_btn.configure(menu=self.group_menu)
+        self.group_btn.pack(side='left', pady=4)
+
         # Close button in the title bar (right side)
-        self.close_btn = tk.Button(
+        self.close_btn = themed(
+            tk.Button,
             self.title_bar,
+            "close_button",
             text="✕",
-            command=self.destroy,
-            bg="#FF5F57",
-            fg="white",
-            font=("Arial", 8, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#FF3B30"
+            command=self.close
         )
         self.close_btn.pack(side='right', padx=10, pady=5)
         
         # Content area for app launcher inside the rounded container (below title bar)
-        self.content_frame = tk.Frame(self.canvas, bg="#3A3A3C")
+        self.content_frame = themed(tk.Frame, self.canvas, "content")
         content_margin = 15
         self.canvas.create_window(margin + content_margin, margin + 30 + 5, window=self.content_frame, anchor='nw', 
                                 width=inner_width - 2 * content_margin, height=inner_height - 30 - 15)
         
-        # Create scrollable frame for app list
-        self.scroll_canvas = tk.Canvas(self.content_frame, bg="#3A3A3C", highlightthickness=0)
-        self.scroll_canvas.pack(fill="both", expand=True, padx=5, pady=(5, 5))  # More space for enhanced "Add app" button
-        
-        # Scrollable frame that will contain all app items
-        self.scrollable_frame = tk.Frame(self.scroll_canvas, bg="#3A3A3C")
-        self.scroll_canvas_window = self.scroll_canvas.create_window(0, 0, window=self.scrollable_frame, anchor="nw")
-        
-        # Bind mouse wheel scrolling
-        self.scroll_canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
-        
-        # Bind canvas resize to update scroll region
-        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
-        self.scroll_canvas.bind("<Configure>", self._on_canvas_configure)
+        # Type-to-launch: the list narrows on every keystroke, Enter runs the top hit
+        self.search_var = tk.StringVar()
+        self.search_entry = themed(tk.Entry, self.content_frame, "entry", textvariable=self.search_var,
+                                   font=("Arial", 10))
+        self.search_entry.pack(fill="x", padx=5, pady=(5, 0))
+        self.search_entry.bind("<Return>", self.launch_top_hit)
+        self.search_entry.bind("<Escape>", lambda event: self.search_var.set(""))
+
+        # Only the rows in view exist as widgets; they are recycled while scrolling
+        self.app_list = VirtualList(self.content_frame, APP_ROW_HEIGHT, self.create_app_row, self.bind_app_row,
+                                    key=lambda app: app["id"])
+        self.app_list.pack(fill="both", expand=True, padx=5, pady=(5, 5))  # More space for enhanced "Add app" button
         
         self.app_file = "apps.json"
+        # Writes happen in the background, atomically, with the previous version kept as apps.json.bak
+        self.store = AppStore(self.app_file)
         self.apps = self.load_apps()
+        # id wpisu -> indeks w self.apps
+        self.app_index = {}
+        self.search_index = SearchIndex()
+        self.history = LaunchHistory()
+        # Wpisy aktualnie na liście - wszystkie albo wyniki wyszukiwania
+        self.shown_apps = []
+        # Programy znalezione na dysku (PANEL_DISCOVERY=1) - nie są zapisywane w apps.json
+        self.discovered = []
+        self.discovered_index = {}
+        # Launched processes are tracked so a second ▶ brings the running program forward
+        self.supervisor = LaunchSupervisor(on_change=self.launch_state_changed)
+        # id wpisu -> stan w uruchamianej grupie ("waiting", "starting", "started", "failed")
+        self.group_progress = {}
+        self.group_name = None
+        self.group_status_job = None
+        self.group_status = themed(tk.Label, self.content_frame, "muted_label", anchor="w", font=("Arial", 9))
+        self.group_status_shown = False
         self.build_ui()
+        self.search_var.trace_add("write", lambda *args: self.apply_search())
+
+        # The scan and the saved index are read in a worker - opening the launcher never waits for the disk
+        self.discovery = AppDiscovery() if discovery_enabled() else None
+        self.start_discovery()
 
     def start_move(self, event):
         self.x = event.x
@@ -99,124 +140,395 @@ class AppLauncher(tk.Toplevel):
         y = self.winfo_y() + deltay
         self.geometry(f"+{x}+{y}")
 
-    def _on_mousewheel(self, event):
-        """Handle mouse wheel scrolling"""
-        self.scroll_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-    
-    def _on_frame_configure(self, event):
-        """Update scroll region when frame size changes"""
-        self.scroll_canvas.configure(scrollregion=self.scroll_canvas.bbox("all"))
-    
-    def _on_canvas_configure(self, event):
-        """Update scrollable frame width when canvas size changes"""
-        canvas_width = event.width
-        self.scroll_canvas.itemconfig(self.scroll_canvas_window, width=canvas_width)
-
     def build_ui(self):
-
-        # App list frame inside scrollable frame
-        self.app_frame = self.scrollable_frame
-
         self.refresh_app_list()
 
         # Add app button at the top (outside scrollable area) - enhanced for better visibility
-        add_btn = tk.Button(
+        add_btn = themed(
+            tk.Button,
             self.content_frame,
+            "accent_button",
             text="+",
             command=self.open_add_dialog,
-            bg="#007AFF",
-            fg="white",
             font=("Arial", 11, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#0056CC",
             cursor="hand2",
             height=2
         )
         add_btn.pack(pady=(8, 0), padx=8, fill="x", side="bottom")
 
-    def refresh_app_list(self):
-        for widget in self.app_frame.winfo_children():
-            widget.destroy()
-
-        for idx, app in enumerate(self.apps):
-            row = tk.Frame(self.app_frame, bg=app.get("color", "#48484A"))
-            row.pack(fill="x", pady=3, padx=5)
-
-            if app.get("icon"):
-                try:
-                    img = Image.open(app["icon"])
-                    img = img.resize((20, 20), Image.Resampling.LANCZOS)
-                    photo = ImageTk.PhotoImage(img)
-                    icon_label = tk.Label(row, image=photo, bg=app.get("color", "#48484A"))
-                    icon_label.image = photo
-                    icon_label.pack(side="left", padx=5)
-                except:
-                    pass
-
-            label = tk.Label(row, text=app.get("name", os.path.basename(app["path"])), 
-                           anchor="w", bg=app.get("color", "#48484A"), fg="white",
-                           font=("Arial", 10))
-            label.pack(side="left", padx=5, expand=True)
+    def on_show(self):
+        # Only directories whose mtime changed are listed again
+        self.start_discovery()
 
-            run_btn = tk.Button(row, text="▶", command=lambda p=app["path"]: self.run_app(p),
-                              bg="#5A5A5C", fg="white", font=("Arial", 8), bd=0, 
-                              relief='flat', activebackground="#6A6A6C")
-            run_btn.pack(side="right", padx=3)
+    def start_discovery(self):
+        if self.discovery is not None:
+            self.discovery.start(self.discovery_done)
 
-            edit_btn = tk.Button(row, text="✎", command=lambda i=idx: self.edit_app(i),
-                               bg="#5A5A5C", fg="white", font=("Arial", 8), bd=0,
-                               relief='flat', activebackground="#6A6A6C")
-            edit_btn.pack(side="right", padx=3)
+    def discovery_done(self, entries):
+        """Worker thread"""
+        try:
+            self.after(0, self.set_discovered, entries)
+        except (RuntimeError, tk.TclError):
+            pass  # Launcher already destroyed
 
-            del_btn = tk.Button(row, text="✕", command=lambda i=idx: self.delete_app(i),
-                              bg="#FF5F57", fg="white", font=("Arial", 8), bd=0,
-                              relief='flat', activebackground="#FF3B30")
-            del_btn.pack(side="right", padx=3)
+    def set_discovered(self, entries):
+        self.discovered = entries
+        self.refresh_app_list()
+
+    def refresh_app_list(self):
+        """Keyed update - only rows whose entry was added, changed or removed are touched"""
+        self.app_index = {app["id"]: index for index, app in enumerate(self.apps)}
+        # Discovered programs already added by hand are shown once, as the hand-made entry
+        manual_paths = {os.path.normcase(app["path"]) for app in self.apps}
+        self.discovered_index = {entry["id"]: entry for entry in self.discovered
+                                 if os.path.normcase(entry["path"]) not in manual_paths
+                                 and entry["id"] not in self.app_index}
+        self.all_entries = self.apps + list(self.discovered_index.values())
+        # Only entries whose name changed are reindexed
+        self.search_index.sync({entry["id"]: self.app_name(entry) for entry in self.all_entries})
+        self.apply_search()
+
+    def entry_for(self, entry_id):
+        """Wpis z apps.json albo znaleziony na dysku; None, jeśli go nie ma"""
+        index = self.find_app(entry_id)
+        if index is not None:
+            return self.apps[index]
+        return self.discovered_index.get(entry_id)
+
+    def app_name(self, app):
+        return app.get("name") or os.path.basename(app["path"])
+
+    def apply_search(self):
+        query = self.search_var.get().strip()
+        if query:
+            found = self.search_index.search(query, boost=self.history.frecency)
+            self.shown_apps = [self.entry_for(entry_id) for entry_id in found]
+        else:
+            self.shown_apps = self.all_entries
+        self.app_list.set_items(self.shown_apps)
+        if query:
+            self.app_list.see(0)
+
+    def launch_top_hit(self, event=None):
+        if self.search_var.get().strip() and self.shown_apps:
+            self.run_entry(self.shown_apps[0]["id"])
+            self.search_var.set("")
+
+    def find_app(self, entry_id):
+        """Index of the entry, or None if it is gone"""
+        return self.app_index.get(entry_id)
+
+    def create_app_row(self, parent):
+        """Empty row widgets - bind_app_row fills them for whichever app scrolls into view"""
+        row = tk.Frame(parent)
+        row.entry_id = None
+        row.icon_path = None
+        row.icon_label = tk.Label(row)
+        row.icon_shown = False
+
+        row.running_label = tk.Label(row, text="●", fg=current_theme().color("success"), font=("Arial", 8))
+        row.running_shown = False
+
+        row.label = tk.Label(row, anchor="w", fg="white", font=("Arial", 10))
+        row.label.pack(side="left", padx=5, expand=True)
+
+        run_btn = themed(tk.Button, row, "button", text="▶",
+                         command=lambda r=row: self.run_entry(r.entry_id), font=("Arial", 8))
+        run_btn.pack(side="right", padx=3)
+        # Shift+click starts another copy even when the program is already running
+        run_btn.bind("<Shift-Button-1>", lambda event, r=row: self.run_entry(r.entry_id, new_instance=True) or "break")
+        row.run_btn = run_btn
+
+        edit_btn = themed(tk.Button, row, "button", text="✎", command=lambda r=row: self.edit_app(r.entry_id),
+                          font=("Arial", 8))
+        edit_btn.pack(side="right", padx=3)
+
+        del_btn = themed(tk.Button, row, "danger_button", text="✕", command=lambda r=row: self.delete_app(r.entry_id),
+                         font=("Arial", 8))
+        del_btn.pack(side="right", padx=3)
+        row.del_btn = del_btn
+        return row
+
+    def bind_app_row(self, row, app, index):
+        row.entry_id = app["id"]
+        color = app.get("color", current_theme().color("field"))
+        row.config(bg=color)
+        row.label.config(text=self.app_name(app), bg=color)
+        # Discovered programs come back on the next scan - they can only be added to the list (✎), not removed
+        row.del_btn.config(state="disabled" if app.get("discovered") else "normal")
+        self.show_running(row, color)
+
+        # Icons are decoded in the thumbnail pool - until one is ready the row shows a blank placeholder
+        icon = app.get("icon")
+        row.icon_path = icon
+        photo = None
+        if icon:
+            photo = request_thumbnail(self, icon, lambda photo, r=row, i=icon: self.icon_ready(r, i, photo),
+                                      ICON_SIZE)
+            if photo is None and not thumbnail_cache.has_failed(icon, ICON_SIZE):
+                photo = self.icon_placeholder()
+        self.show_icon(row, photo, color)
+
+    def show_running(self, row, color):
+        """● przy nazwie i ⧉ (pokaż okno) zamiast ▶, gdy program uruchomiony z launchera działa.
+
+        W trakcie uruchamiania grupy: ○ czeka na swoją kolej, ◐ właśnie startuje.
+        """
+        running = self.supervisor.is_running(row.entry_id)
+        row.run_btn.config(text="⧉" if running else "▶")
+        group_state = self.group_progress.get(row.entry_id)
+        theme = current_theme()
+        if group_state in ("waiting", "starting"):
+            row.running_label.config(text="○" if group_state == "waiting" else "◐", fg=theme.color("text_muted"))
+        else:
+            row.running_label.config(text="●", fg=theme.color("success"))
+        if running or group_state in ("waiting", "starting"):
+            row.running_label.config(bg=color)
+            if not row.running_shown:
+                row.running_label.pack(side="left", before=row.label)
+                row.running_shown = True
+        elif row.running_shown:
+            row.running_label.pack_forget()
+            row.running_shown = False
+
+    def launch_state_changed(self, entry_id):
+        """Reaper thread - a tracked program exited"""
+        try:
+            self.after(0, self.update_running, entry_id)
+        except (RuntimeError, tk.TclError):
+            pass  # Launcher already destroyed
+
+    def update_running(self, entry_id):
+        for _index, _item, row in self.app_list.visible_rows():
+            if row.entry_id == entry_id:
+                self.show_running(row, row.cget("bg"))
+
+    def icon_placeholder(self):
+        """Pusty obrazek o rozmiarze ikony - wiersz nie zmienia układu, gdy ikona dojdzie"""
+        if getattr(self, "_icon_placeholder", None) is None:
+            self._icon_placeholder = tk.PhotoImage(master=self, width=ICON_SIZE[0], height=ICON_SIZE[1])
+        return self._icon_placeholder
+
+    def icon_ready(self, row, icon, photo):
+        """Tk thread - the row may have been recycled for another app in the meantime"""
+        if not row.winfo_exists() or row.icon_path != icon:
+            return
+        self.show_icon(row, photo, row.cget("bg"))
+
+    def show_icon(self, row, photo, color):
+        if photo is not None:
+            row.icon_label.config(image=photo, bg=color)
+            if not row.icon_shown:
+                row.icon_label.pack(side="left", padx=5, before=row.label)
+                row.icon_shown = True
+        elif row.icon_shown:
+            row.icon_label.pack_forget()
+            row.icon_shown = False
 
     def load_apps(self):
-        if os.path.exists(self.app_file):
-            try:
-                with open(self.app_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+        data = self.store.load()
+        # [{"name": "morning", "entries": [id, ...], "concurrency": 2, "stagger": 1.0}]
+        self.groups = data.get("groups", [])
+        apps = data["apps"]
+        # Entries from before ids existed get one now, saved on the next change
+        for app in apps:
+            if not app.get("id"):
+                app["id"] = new_entry_id()
+        return apps
 
     def save_apps(self):
-        try:
-            with open(self.app_file, 'w', encoding='utf-8') as f:
-                json.dump(self.apps, f, indent=2, ensure_ascii=False)
-        except Exception as e:
-            print(f"Error saving apps: {e}")
+        """Returns at once - edits in quick succession end up as a single write"""
+        self.store.save({"apps": self.apps, "groups": self.groups})
+
+    def on_hide(self):
+        self.store.flush()
 
-    def run_app(self, path):
+    def destroy(self):
+        self.store.close()
+        self.supervisor.stop()
+        super().destroy()
+
+    def run_app(self, entry_id, path):
+        """Latency and exit status of every launch go to logs/launches.log"""
         try:
-            subprocess.Popen(path, shell=True)
+            self.supervisor.launch(entry_id, path)
         except Exception as e:
-            tk.messagebox.showerror("Error", f"Could not run application: {str(e)}")
+            messagebox.showerror("Error", f"Could not run application: {str(e)}")
+            return False
+        return True
 
-    def delete_app(self, index):
-        if 0 <= index < len(self.apps):
+    def run_entry(self, entry_id, new_instance=False):
+        entry = self.entry_for(entry_id)
+        if entry is None:
+            return
+        # Bring the running program forward instead of starting a second copy; launch if it has no window
+        if not new_instance and self.supervisor.is_running(entry_id) and self.supervisor.focus(entry_id):
+            return
+        self.history.record(entry_id)
+        self.history.save()
+        if self.run_app(entry_id, entry["path"]):
+            self.update_running(entry_id)
+
+    def delete_app(self, entry_id):
+        index = self.find_app(entry_id)
+        if index is not None:
             self.apps.pop(index)
+            for group in self.groups:
+                if entry_id in group.get("entries", []):
+                    group["entries"] = [member for member in group["entries"] if member != entry_id]
+            self.history.forget(entry_id)
+            self.history.save()
             self.save_apps()
             self.refresh_app_list()
 
-    def edit_app(self, index):
-        if 0 <= index < len(self.apps):
-            self.open_edit_dialog(index)
+    def edit_app(self, entry_id):
+        if self.find_app(entry_id) is not None:
+            self.open_edit_dialog(entry_id)
+        elif entry_id in self.discovered_index:
+            # Saving turns the discovered program into a normal entry; it keeps the id and launch history
+            entry = self.discovered_index[entry_id]
+            self.open_edit_dialog(template={"id": entry_id, "name": entry["name"], "path": entry["path"]})
+
+    def fill_group_menu(self):
+        theme = current_theme()
+        self.group_menu.configure(bg=theme.color("control"), fg=theme.color("text"),
+                                  activebackground=theme.color("accent"), activeforeground="white")
+        self.group_menu.delete(0, "end")
+        busy = self.group_name is not None
+        for group in self.groups:
+            self.group_menu.add_command(label=f"▶ {group['name']} ({len(group.get('entries', []))})",
+                                        command=lambda name=group["name"]: self.launch_group(name),
+                                        state="disabled" if busy else "normal")
+        if self.groups:
+            self.group_menu.add_separator()
+        self.group_menu.add_command(label="Zapisz widoczne jako grupę...", command=self.save_group_from_view)
+        if self.groups:
+            # One submenu for the panel's lifetime - only its entries are rebuilt
+            self.delete_group_menu.configure(bg=theme.color("control"), fg=theme.color("text"),
+                                             activebackground=theme.color("danger"), activeforeground="white")
+            self.delete_group_menu.delete(0, "end")
+            for group in self.groups:
+                self.delete_group_menu.add_command(label=group["name"],
+                                                   command=lambda name=group["name"]: self.delete_group(name))
+            self.group_menu.add_cascade(label="Usuń grupę", menu=self.delete_group_menu)
+
+    def find_group(self, name):
+        for group in self.groups:
+            if group["name"] == name:
+                return group
+        return None
+
+    def save_group_from_view(self):
+        """Grupa z wpisów na liście - wyników wyszukiwania albo wszystkich dodanych ręcznie"""
+        entries = self.shown_apps if self.search_var.get().strip() else self.apps
+        entries = entries[:GROUP_MAX_ENTRIES]
+        if not entries:
+            return
+        name = simpledialog.askstring("Grupa", f"Nazwa grupy ({len(entries)} aplikacji):", parent=self)
+        if not name or not name.strip():
+            return
+        group = self.find_group(name.strip())
+        if group is None:
+            group = {"name": name.strip(), "concurrency": GROUP_DEFAULT_CONCURRENCY, "stagger": GROUP_DEFAULT_STAGGER}
+            self.groups.append(group)
+        group["entries"] = [entry["id"] for entry in entries]
+        self.save_apps()
+
+    def delete_group(self, name):
+        group = self.find_group(name)
+        if group is not None:
+            self.groups.remove(group)
+            self.save_apps()
+
+    def launch_group(self, name):
+        """Starts in the supervisor's group thread - the UI only receives progress"""
+        group = self.find_group(name)
+        if group is None or self.group_name is not None:
+            return
+        entries = []
+        # Programs already running are not started a second time - they count as started
+        already_running = []
+        for entry_id in group.get("entries", []):
+            entry = self.entry_for(entry_id)
+            if entry is None:
+                continue
+            if self.supervisor.is_running(entry_id):
+                already_running.append(entry_id)
+            else:
+                entries.append((entry_id, entry["path"]))
+        if not entries and not already_running:
+            return
+        for entry_id, _path in entries:
+            self.history.record(entry_id)
+        self.history.save()
+        if self.group_status_job is not None:
+            self.after_cancel(self.group_status_job)
+            self.group_status_job = None
+        self.group_name = name
+        self.group_progress = {entry_id: "started" for entry_id in already_running}
+        if not entries:
+            self.show_group_progress(None, "done", 0.0)
+            return
+        self.supervisor.launch_group(entries, concurrency=group.get("concurrency", GROUP_DEFAULT_CONCURRENCY),
+                                     stagger=group.get("stagger", GROUP_DEFAULT_STAGGER),
+                                     progress=self.group_progress_changed)
+
+    def group_progress_changed(self, entry_id, state, detail):
+        """Group threads"""
+        try:
+            self.after(0, self.show_group_progress, entry_id, state, detail)
+        except (RuntimeError, tk.TclError):
+            pass  # Launcher already destroyed
+
+    def show_group_progress(self, entry_id, state, detail):
+        if entry_id is None:
+            failed = sum(1 for group_state in self.group_progress.values() if group_state == "failed")
+            summary = f"{self.group_name}: {len(self.group_progress) - failed} uruchomiono"
+            if failed:
+                summary += f", {failed} błędów"
+            self.set_group_status(f"{summary} w {detail:.1f} s")
+            self.group_name = None
+            self.group_status_job = self.after(GROUP_STATUS_CLEAR_MS, self.set_group_status, None)
+            return
+        self.group_progress[entry_id] = state
+        started = sum(1 for group_state in self.group_progress.values() if group_state in ("started", "failed"))
+        status = f"{self.group_name}: {started}/{len(self.group_progress)}"
+        if state == "started":
+            status += f" · {detail:.1f} s"
+        self.set_group_status(status)
+        self.update_running(entry_id)
+
+    def set_group_status(self, text):
+        if self.group_status_job is not None:
+            self.after_cancel(self.group_status_job)
+            self.group_status_job = None
+        if text:
+            self.group_status.config(text=text)
+            if not self.group_status_shown:
+                self.group_status.pack(side="bottom", fill="x", padx=8, before=self.app_list)
+                self.group_status_shown = True
+        elif self.group_status_shown:
+            self.group_status.pack_forget()
+            self.group_status_shown = False
+            self.group_progress = {}
 
     def open_add_dialog(self):
         self.open_edit_dialog()
 
-    def open_edit_dialog(self, edit_index=None):
-        dialog = AppEditDialog(self, self.apps[edit_index] if edit_index is not None else None)
+    def open_edit_dialog(self, edit_id=None, template=None):
+        index = self.find_app(edit_id) if edit_id is not None else None
+        dialog = AppEditDialog(self, self.apps[index] if index is not None else template)
         self.wait_window(dialog)
         
         if dialog.result:
-            if edit_index is not None:
-                self.apps[edit_index] = dialog.result
+            # The list may have changed while the dialog was open - look the entry up again by id
+            index = self.find_app(edit_id) if edit_id is not None else None
+            if index is not None:
+                # A new dict, not an in-place update, so the list sees the row as changed
+                self.apps[index] = dialog.result
             else:
+                if not dialog.result.get("id"):
+                    dialog.result["id"] = new_entry_id()
                 self.apps.append(dialog.result)
             self.save_apps()
             self.refresh_app_list()
@@ -232,42 +544,37 @@ class AppEditDialog(tk.Toplevel):
         self.geometry("400x350+810+10")  # Obok AppLauncher, 10px od góry
 
         # Setup macOS style rounded window
-        self.canvas, self.container = setup_macos_window(self, 400, 350, corner_radius=16, 
-                                                    bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0)
+        self.canvas, self.container = setup_macos_panel(self, 400, 350, corner_radius=16, border_width=0,
+                                                    margin=20, inner_radius=12)
 
-        # Draw rounded inner container with equal margins
+        # Inner container margins, drawn into the cached background
         margin = 20
         inner_width = 400 - 2 * margin  # 360
         inner_height = 350 - 2 * margin  # 310
-        create_rounded_inner_container(self.canvas, margin, margin, inner_width, inner_height, corner_radius=12, bg_color="#3A3A3C")
         
         # Title bar positioned over the gray container
-        self.title_bar = tk.Frame(self.canvas, bg="#2A2A2C", height=30)
+        self.title_bar = themed(tk.Frame, self.canvas, "title_bar", height=30)
         self.canvas.create_window(margin, margin, window=self.title_bar, anchor='nw', width=inner_width, height=30)
         
         # Bind drag events to title bar
         self.title_bar.bind("<Button-1>", self.start_move)
         self.title_bar.bind("<B1-Motion>", self.do_move)
         
-        title_label = tk.Label(self.title_bar, text="Dodaj/Edytuj aplikację", 
-                              bg="#2A2A2C", fg="white", font=("Arial", 12, "bold"))
+        title_label = themed(tk.Label, self.title_bar, "title_label", text="Dodaj/Edytuj aplikację",
+                             font=("Arial", 12, "bold"))
         title_label.pack(side="left", padx=10, pady=5)
 
-        close_btn = tk.Button(
+        close_btn = themed(
+            tk.Button,
             self.title_bar,
+            "close_button",
             text="✕",
-            command=self.destroy,
-            bg="#FF5F57",
-            fg="white",
-            font=("Arial", 8, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#FF3B30"
+            command=self.destroy
         )
         close_btn.pack(side="right", padx=10, pady=5)
 
         # Content frame inside the rounded container
-        self.content_frame = tk.Frame(self.canvas, bg="#3A3A3C")
+        self.content_frame = themed(tk.Frame, self.canvas, "content")
         content_margin = 15
         self.canvas.create_window(margin + content_margin, margin + 30 + 5, 
                                 window=self.content_frame, anchor='nw',
@@ -287,76 +594,71 @@ class AppEditDialog(tk.Toplevel):
     
     def build_content(self):
         # Name
-        tk.Label(self.content_frame, text="Nazwa:", bg="#3A3A3C", fg="white", 
-                font=("Arial", 10)).pack(anchor="w", pady=(5, 2))
-        self.name_entry = tk.Entry(self.content_frame, bg="#48484A", fg="white", 
-                                  font=("Arial", 10), bd=0, relief='flat')
+        themed(tk.Label, self.content_frame, "label", text="Nazwa:",
+               font=("Arial", 10)).pack(anchor="w", pady=(5, 2))
+        self.name_entry = themed(tk.Entry, self.content_frame, "entry",
+                                 font=("Arial", 10))
         self.name_entry.pack(fill="x", pady=(0, 5))
         self.name_entry.insert(0, self.app_data.get("name", ""))
 
         # Path
-        tk.Label(self.content_frame, text="Ścieżka:", bg="#3A3A3C", fg="white", 
-                font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
+        themed(tk.Label, self.content_frame, "label", text="Ścieżka:",
+               font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
         
-        path_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        path_frame = themed(tk.Frame, self.content_frame, "content")
         path_frame.pack(fill="x", pady=(0, 5))
         
-        self.path_entry = tk.Entry(path_frame, bg="#48484A", fg="white", 
-                                  font=("Arial", 10), bd=0, relief='flat')
+        self.path_entry = themed(tk.Entry, path_frame, "entry",
+                                 font=("Arial", 10))
         self.path_entry.pack(side="left", fill="x", expand=True)
         self.path_entry.insert(0, self.app_data.get("path", ""))
         
-        browse_btn = tk.Button(path_frame, text="...", command=self.browse_file,
-                              bg="#5A5A5C", fg="white", font=("Arial", 8), bd=0,
-                              relief='flat', activebackground="#6A6A6C")
+        browse_btn = themed(tk.Button, path_frame, "button", text="...", command=self.browse_file,
+                            font=("Arial", 8))
         browse_btn.pack(side="right", padx=(5, 0))
 
         # Icon
-        tk.Label(self.content_frame, text="Ikona:", bg="#3A3A3C", fg="white", 
-                font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
+        themed(tk.Label, self.content_frame, "label", text="Ikona:",
+               font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
         
-        icon_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        icon_frame = themed(tk.Frame, self.content_frame, "content")
         icon_frame.pack(fill="x", pady=(0, 5))
         
-        self.icon_entry = tk.Entry(icon_frame, bg="#48484A", fg="white", 
-                                  font=("Arial", 10), bd=0, relief='flat')
+        self.icon_entry = themed(tk.Entry, icon_frame, "entry",
+                                 font=("Arial", 10))
         self.icon_entry.pack(side="left", fill="x", expand=True)
         self.icon_entry.insert(0, self.app_data.get("icon", ""))
         
-        icon_browse_btn = tk.Button(icon_frame, text="...", command=self.browse_icon,
-                                   bg="#5A5A5C", fg="white", font=("Arial", 8), bd=0,
-                                   relief='flat', activebackground="#6A6A6C")
+        icon_browse_btn = themed(tk.Button, icon_frame, "button", text="...", command=self.browse_icon,
+                                 font=("Arial", 8))
         icon_browse_btn.pack(side="right", padx=(5, 0))
 
         # Color
-        tk.Label(self.content_frame, text="Kolor:", bg="#3A3A3C", fg="white", 
-                font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
+        themed(tk.Label, self.content_frame, "label", text="Kolor:",
+               font=("Arial", 10)).pack(anchor="w", pady=(0, 2))
         
-        color_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        color_frame = themed(tk.Frame, self.content_frame, "content")
         color_frame.pack(fill="x", pady=(0, 10))
         
-        self.color_entry = tk.Entry(color_frame, bg="#48484A", fg="white", 
-                                   font=("Arial", 10), bd=0, relief='flat')
+        self.color_entry = themed(tk.Entry, color_frame, "entry",
+                                  font=("Arial", 10))
         self.color_entry.pack(side="left", fill="x", expand=True)
         self.color_entry.insert(0, self.app_data.get("color", "#48484A"))
         
-        color_btn = tk.Button(color_frame, text="🎨", command=self.choose_color,
-                             bg="#5A5A5C", fg="white", font=("Arial", 10), bd=0,
-                             relief='flat', activebackground="#6A6A6C")
+        color_btn = themed(tk.Button, color_frame, "button", text="🎨", command=self.choose_color,
+                           font=("Arial", 10))
         color_btn.pack(side="right", padx=(5, 0))
 
         # Buttons
-        btn_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        btn_frame = themed(tk.Frame, self.content_frame, "content")
         btn_frame.pack(fill="x", pady=(5, 0))
         
-        cancel_btn = tk.Button(btn_frame, text="Anuluj", command=self.destroy,
-                              bg="#5A5A5C", fg="white", font=("Arial", 10), bd=0,
-                              relief='flat', activebackground="#6A6A6C")
+        cancel_btn = themed(tk.Button, btn_frame, "button", text="Anuluj", command=self.destroy,
+                            font=("Arial", 10))
         cancel_btn.pack(side="right", padx=(5, 0))
         
-        save_btn = tk.Button(btn_frame, text="Zapisz", command=self.save_app,
-                            bg="#34C759", fg="white", font=("Arial", 10), bd=0,
-                            relief='flat', activebackground="#2FB850")
+        save_btn = themed(tk.Button, btn_frame, "success_button", text="Zapisz", command=self.save_app,
+                          font=("Arial", 10))
         save_btn.pack(side="right")
 
     def browse_file(self):
@@ -392,10 +694,12 @@ class AppEditDialog(tk.Toplevel):
         path = self.path_entry.get().strip()
         
         if not name or not path:
-            tk.messagebox.showerror("Error", "Nazwa i ścieżka są wymagane!")
+            messagebox.showerror("Error", "Nazwa i ścieżka są wymagane!")
             return
         
+        # Other fields of the entry (its id) are kept
         self.result = {
+            **self.app_data,
             "name": name,
             "path": path,
             "icon": self.icon_entry.get().strip(),
@@ -1,51 +1,59 @@
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pygame
 import os
-import random
 import threading
-import time
-from gradient_utils import setup_macos_window, create_rounded_inner_container, configure_ttk_styles
+from audio_client import DaemonError, connect_playback_engine
+from gradient_utils import setup_macos_panel
+from mixer_backend import MixerWorker
+from panel_pool import PooledPanel
+from theme import ensure_styles, themed, current_theme
 
-class MusicPlayer(tk.Toplevel):
+# Co ile odświeżać stan odtwarzacza, gdy panel jest widoczny
+STATUS_POLL_MS = 1000
+
+class MusicPlayer(PooledPanel, tk.Toplevel):
     def __init__(self, master=None):
         super().__init__(master)
         self.overrideredirect(True)
         self.attributes('-topmost', True)
         self.geometry("400x400+400+630")  # Reduced height by 50px (taskbar height + 10px margin)
         
-        # Initialize pygame mixer
-        pygame.mixer.init()
-        
-        # Music player state
-        self.current_song = None
+        # Playback runs in the audio daemon when it is running, otherwise in this process. Connecting
+        # and every engine call happen on the worker thread - a slow or absent daemon never stalls Tk
+        self.is_closing = False  # Flag to prevent operations during closing
+        self.worker = MixerWorker(lambda: connect_playback_engine("Music"), name="music-worker",
+                                  on_error=lambda e: self.post(self.show_result, False, f"Playback unavailable: {e}"))
+        
+        # What the panel currently shows - the engine owns the real state
+        self.engine_remote = False
+        self.engine_playing = False
+        self.status_pending = False
+        self.volume_shown = False
+        self.syncing = False
+        # Ostatnia wartość suwaka czekająca na wysłanie; None - nic nie czeka
+        self.pending_volume = None
+        self.volume_lock = threading.Lock()
         self.current_index = 0
-        self.is_playing = False
-        self.is_paused = False
         self.shuffle_mode = False
         self.playlist = []
-        self.music_folder = "Music"
-        self.is_closing = False  # Flag to prevent operations during closing
-        
-        # Ensure music folder exists
-        if not os.path.exists(self.music_folder):
-            os.makedirs(self.music_folder)
+        self.playlist_version = None
+        self.shown_song = None
+        self.poll_job = None
         
         # Setup macOS style rounded window - updated height to 400
-        self.canvas, self.container = setup_macos_window(self, 400, 400, corner_radius=16, 
-                                                        bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0)
+        self.canvas, self.container = setup_macos_panel(self, 400, 400, corner_radius=16, border_width=0,
+                                                        margin=20, inner_radius=12)
         
-        # Configure TTK styles for sliders
-        configure_ttk_styles()
+        # TTK styles are registered once per Tk interpreter - a no-op after the first panel
+        ensure_styles(self)
 
-        # Draw rounded inner container with equal margins (20px from all sides)
+        # Inner container margins (20px from all sides), drawn into the cached background
         margin = 20
         inner_width = 400 - 2 * margin  # 360
         inner_height = 400 - 2 * margin  # 360 (reduced from 410)
-        create_rounded_inner_container(self.canvas, margin, margin, inner_width, inner_height, corner_radius=12, bg_color="#3A3A3C")
         
         # Title bar positioned over the gray container - slightly lighter than outer part
-        self.title_bar = tk.Frame(self.canvas, bg="#2A2A2C", height=30)
+        self.title_bar = themed(tk.Frame, self.canvas, "title_bar", height=30)
         self.canvas.create_window(margin, margin, window=self.title_bar, anchor='nw', width=inner_width, height=30)
         
         # Bind drag events to title bar only
@@ -53,27 +61,25 @@ class MusicPlayer(tk.Toplevel):
         self.title_bar.bind("<B1-Motion>", self.do_move)
         
         # Close button in the title bar (right side)
-        self.close_btn = tk.Button(
+        self.close_btn = themed(
+            tk.Button,
             self.title_bar,
+            "close_button",
             text="✕",
-            command=self.destroy,
-            bg="#FF5F57",
-            fg="white",
-            font=("Arial", 8, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#FF3B30"
+            command=self.close
         )
         self.close_btn.pack(side='right', padx=10, pady=5)
         
         # Content area for music player controls inside the rounded container (below title bar)
-        self.content_frame = tk.Frame(self.canvas, bg="#3A3A3C")
+        self.content_frame = themed(tk.Frame, self.canvas, "content")
         content_margin = 15
         self.canvas.create_window(margin + content_margin, margin + 30 + 5, window=self.content_frame, anchor='nw', 
                                 width=inner_width - 2 * content_margin, height=inner_height - 30 - 15)
         
         self.build_ui()
         self.load_playlist()
+        self.refresh_status()
+        self.start_polling()
 
     def start_move(self, event):
         self.x = event.x
@@ -88,113 +94,98 @@ class MusicPlayer(tk.Toplevel):
 
     def build_ui(self):
         # Current song display (bez tytułu "Music Player")
-        self.current_song_frame = tk.Frame(self.content_frame, bg="#48484A", relief="flat", bd=0)
+        self.current_song_frame = themed(tk.Frame, self.content_frame, "field", relief="flat", bd=0)
         self.current_song_frame.pack(fill="x", pady=(5, 10), padx=5)
         
-        self.current_song_label = tk.Label(
+        self.current_song_label = themed(
+            tk.Label,
             self.current_song_frame,
+            "field_label",
             text="No song selected",
             font=("SF Pro Text", 12, "bold"),
-            bg="#48484A",
-            fg="#FFFFFF",
             anchor="center"
         )
         self.current_song_label.pack(pady=10)
         
         # Control buttons frame
-        self.controls_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        self.controls_frame = themed(tk.Frame, self.content_frame, "content")
         self.controls_frame.pack(fill="x", pady=(0, 10))
         
         # Previous button
-        self.prev_btn = tk.Button(
+        self.prev_btn = themed(
+            tk.Button,
             self.controls_frame,
+            "button",
             text="⏮",
             command=self.previous_song,
-            bg="#5A5A5C",
-            fg="white",
             font=("Arial", 12),
-            bd=0,
-            relief='flat',
-            activebackground="#6A6A6C",
             width=4,
             height=1
         )
         self.prev_btn.pack(side="left", padx=5)
         
         # Play/Pause button
-        self.play_btn = tk.Button(
+        self.play_btn = themed(
+            tk.Button,
             self.controls_frame,
+            "accent_button",
             text="▶",
             command=self.toggle_play_pause,
-            bg="#007AFF",
-            fg="white",
             font=("Arial", 12),
-            bd=0,
-            relief='flat',
-            activebackground="#0056CC",
             width=4,
             height=1
         )
         self.play_btn.pack(side="left", padx=5)
         
         # Next button
-        self.next_btn = tk.Button(
+        self.next_btn = themed(
+            tk.Button,
             self.controls_frame,
+            "button",
             text="⏭",
             command=self.next_song,
-            bg="#5A5A5C",
-            fg="white",
             font=("Arial", 12),
-            bd=0,
-            relief='flat',
-            activebackground="#6A6A6C",
             width=4,
             height=1
         )
         self.next_btn.pack(side="left", padx=5)
         
         # Shuffle button
-        self.shuffle_btn = tk.Button(
+        self.shuffle_btn = themed(
+            tk.Button,
             self.controls_frame,
+            "button",
             text="🔀",
             command=self.toggle_shuffle,
-            bg="#5A5A5C",
-            fg="white",
             font=("Arial", 10),
-            bd=0,
-            relief='flat',
-            activebackground="#6A6A6C",
             width=4,
             height=1
         )
         self.shuffle_btn.pack(side="right", padx=5)
         
         # Add music button
-        self.add_btn = tk.Button(
+        self.add_btn = themed(
+            tk.Button,
             self.controls_frame,
+            "success_button",
             text="➕",
             command=self.add_music,
-            bg="#34C759",
-            fg="white",
             font=("Arial", 12),
-            bd=0,
-            relief='flat',
-            activebackground="#248A3D",
             width=4,
             height=1
         )
         self.add_btn.pack(side="right", padx=5)
         
         # Volume control
-        self.volume_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        self.volume_frame = themed(tk.Frame, self.content_frame, "content")
         self.volume_frame.pack(fill="x", pady=(0, 10))
         
-        tk.Label(
+        themed(
+            tk.Label,
             self.volume_frame,
+            "label",
             text="Volume:",
-            font=("SF Pro Text", 10),
-            bg="#3A3A3C",
-            fg="#FFFFFF"
+            font=("SF Pro Text", 10)
         ).pack(side="left")
         
         self.volume_scale = ttk.Scale(
@@ -205,31 +196,30 @@ class MusicPlayer(tk.Toplevel):
             style="Gray.Horizontal.TScale",
             command=self.set_volume
         )
+        # Replaced by the engine volume with the first status
+        self.syncing = True
         self.volume_scale.set(70)
+        self.syncing = False
         self.volume_scale.pack(side="left", fill="x", expand=True, padx=(10, 0))
         
         # Playlist frame
-        tk.Label(
+        themed(
+            tk.Label,
             self.content_frame,
+            "label",
             text="Playlist:",
             font=("SF Pro Text", 12, "bold"),
-            bg="#3A3A3C",
-            fg="#FFFFFF",
             anchor="w"
         ).pack(fill="x", pady=(10, 5))
         
         # Playlist listbox without scrollbar - removed scroll functionality
-        self.playlist_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        self.playlist_frame = themed(tk.Frame, self.content_frame, "content")
         self.playlist_frame.pack(fill="both", expand=True, pady=(0, 10))
         
-        self.playlist_listbox = tk.Listbox(
+        self.playlist_listbox = themed(
+            tk.Listbox,
             self.playlist_frame,
-            bg="#48484A",
-            fg="white",
-            selectbackground="#007AFF",
-            selectforeground="white",
-            bd=0,
-            highlightthickness=0,
+            "listbox",
             font=("SF Pro Text", 10)
         )
         self.playlist_listbox.pack(fill="both", expand=True)
@@ -237,17 +227,39 @@ class MusicPlayer(tk.Toplevel):
         # Bind double-click to play song
         self.playlist_listbox.bind("<Double-Button-1>", self.on_song_select)
 
+    def call_engine(self, method, *args, then=None):
+        """engine.method(*args) w wątku silnika; then(wynik) w wątku Tk, None przy błędzie demona"""
+        def task(engine):
+            try:
+                result = getattr(engine, method)(*args)
+            except DaemonError as e:
+                print(f"Error talking to audio daemon: {e}")
+                result = None
+            if then is not None:
+                self.post(then, result)
+        self.worker.submit(task)
+
+    def post(self, callback, *args):
+        """Worker thread -> Tk thread"""
+        if self.is_closing:
+            return
+        try:
+            self.after(0, callback, *args)
+        except (RuntimeError, tk.TclError):
+            pass  # Panel already destroyed
+
     def load_playlist(self):
-        """Load all supported audio files from Music folder"""
-        self.playlist = []
-        supported_formats = ('.mp3', '.wav', '.ogg', '.m4a')
-        
-        if os.path.exists(self.music_folder):
-            for file in os.listdir(self.music_folder):
-                if file.lower().endswith(supported_formats):
-                    self.playlist.append(file)
-        
+        """Fetch the playlist from the playback engine"""
+        self.call_engine("get_playlist", then=self.show_playlist)
+
+    def show_playlist(self, playlist):
+        if playlist is None or self.is_closing:
+            return
+        self.playlist = playlist["songs"]
+        self.playlist_version = playlist["version"]
+        self.shown_song = None
         self.update_playlist_display()
+        self.refresh_status()
 
     def update_playlist_display(self):
         """Update the playlist display in the listbox"""
@@ -255,6 +267,47 @@ class MusicPlayer(tk.Toplevel):
         for song in self.playlist:
             self.playlist_listbox.insert(tk.END, os.path.splitext(song)[0])
 
+    def refresh_status(self):
+        """Show the engine state - the song may have changed without the UI (end of song, daemon)"""
+        if not self.status_pending:
+            self.status_pending = True
+            self.worker.submit(self._read_status)
+
+    def _read_status(self, engine):
+        """Runs on the engine worker"""
+        try:
+            status = engine.status()
+        except DaemonError as e:
+            print(f"Error talking to audio daemon: {e}")
+            status = None
+        self.post(self.show_status, status, engine.is_remote)
+
+    def show_status(self, status, remote):
+        self.status_pending = False
+        self.engine_remote = remote
+        if status is None or self.is_closing:
+            return
+        self.engine_playing = status["is_playing"]
+        if status["playlist_version"] != self.playlist_version:
+            self.load_playlist()
+        if not self.volume_shown:
+            self.volume_shown = True
+            self.syncing = True
+            self.volume_scale.set(status["volume"] * 100)
+            self.syncing = False
+        playing = status["is_playing"] and not status["is_paused"]
+        self.play_btn.config(text="⏸" if playing else "▶")
+        shown = (status["current_song"], status["current_index"])
+        if status["current_song"] and shown != self.shown_song:
+            self.shown_song = shown
+            self.current_song_label.config(text=os.path.splitext(status["current_song"])[0])
+            self.playlist_listbox.selection_clear(0, tk.END)
+            self.playlist_listbox.selection_set(status["current_index"])
+        self.current_index = status["current_index"]
+        if status["shuffle_mode"] != self.shuffle_mode:
+            self.shuffle_mode = status["shuffle_mode"]
+            self.update_shuffle_button()
+
     def add_music(self):
         """Add music files to the playlist"""
         file_types = [
@@ -272,19 +325,13 @@ class MusicPlayer(tk.Toplevel):
         )
         
         if files:
-            for file_path in files:
-                filename = os.path.basename(file_path)
-                dest_path = os.path.join(self.music_folder, filename)
-                
-                try:
-                    # Copy file to Music folder
-                    import shutil
-                    shutil.copy2(file_path, dest_path)
-                except Exception as e:
-                    messagebox.showerror("Error", f"Could not copy {filename}: {str(e)}")
-            
-            # Reload playlist
-            self.load_playlist()
+            # Copy files to Music folder, then reload the playlist
+            self.call_engine("add_files", list(files), then=self.show_added)
+
+    def show_added(self, errors):
+        for filename, error in errors or []:
+            messagebox.showerror("Error", f"Could not copy {filename}: {error}")
+        self.load_playlist()
 
     def on_song_select(self, event):
         """Handle song selection from listbox"""
@@ -293,120 +340,108 @@ class MusicPlayer(tk.Toplevel):
             self.current_index = selection[0]
             self.play_current_song()
 
+    def command(self, method, *args):
+        """Playback command on the engine worker; the panel refreshes when it is done"""
+        def task(engine):
+            try:
+                ok = getattr(engine, method)(*args)
+            except DaemonError as e:
+                print(f"Error talking to audio daemon: {e}")
+                ok = None
+            self.post(self.show_result, ok, engine.last_error)
+        self.worker.submit(task)
+
+    def show_result(self, ok, error):
+        """Refresh the display after a playback command, report a song that failed to load"""
+        if ok is False and error:
+            messagebox.showerror("Error", error)
+        self.refresh_status()
+
     def play_current_song(self):
         """Play the currently selected song"""
-        if self.is_closing:
-            return
-            
-        if not self.playlist:
-            return
-        
-        if 0 <= self.current_index < len(self.playlist):
-            song_file = self.playlist[self.current_index]
-            song_path = os.path.join(self.music_folder, song_file)
-            
-            try:
-                pygame.mixer.music.load(song_path)
-                pygame.mixer.music.play()
-                self.is_playing = True
-                self.is_paused = False
-                self.current_song = song_file
-                
-                # Update display
-                song_name = os.path.splitext(song_file)[0]
-                self.current_song_label.config(text=song_name)
-                self.play_btn.config(text="⏸")
-                
-                # Update listbox selection
-                self.playlist_listbox.selection_clear(0, tk.END)
-                self.playlist_listbox.selection_set(self.current_index)
-                
-                # Start monitoring thread
-                threading.Thread(target=self.monitor_song, daemon=True).start()
-                
-            except pygame.error as e:
-                messagebox.showerror("Error", f"Could not play {song_file}: {str(e)}")
+        self.command("play", self.current_index)
 
     def toggle_play_pause(self):
         """Toggle between play and pause"""
-        if self.is_closing:
-            return
-            
-        if self.is_playing:
-            if self.is_paused:
-                pygame.mixer.music.unpause()
-                self.is_paused = False
-                self.play_btn.config(text="⏸")
-            else:
-                pygame.mixer.music.pause()
-                self.is_paused = True
-                self.play_btn.config(text="▶")
-        else:
-            if self.current_song:
-                pygame.mixer.music.unpause()
-                self.is_playing = True
-                self.is_paused = False
-                self.play_btn.config(text="⏸")
-            else:
-                # Start playing first song if available
-                if self.playlist:
-                    self.current_index = 0
-                    self.play_current_song()
+        self.command("toggle_play_pause")
 
     def next_song(self):
         """Play next song in playlist"""
-        if not self.playlist:
-            return
-        
-        if self.shuffle_mode:
-            self.current_index = random.randint(0, len(self.playlist) - 1)
-        else:
-            self.current_index = (self.current_index + 1) % len(self.playlist)
-        
-        self.play_current_song()
+        self.command("next")
 
     def previous_song(self):
         """Play previous song in playlist"""
-        if not self.playlist:
-            return
-        
-        if self.shuffle_mode:
-            self.current_index = random.randint(0, len(self.playlist) - 1)
-        else:
-            self.current_index = (self.current_index - 1) % len(self.playlist)
-        
-        self.play_current_song()
+        self.command("previous")
 
     def toggle_shuffle(self):
         """Toggle shuffle mode"""
-        self.shuffle_mode = not self.shuffle_mode
+        self.call_engine("set_shuffle", not self.shuffle_mode, then=self.show_shuffle)
+
+    def show_shuffle(self, enabled):
+        if enabled is not None:
+            self.shuffle_mode = enabled
+            self.update_shuffle_button()
+
+    def update_shuffle_button(self):
+        theme = current_theme()
         if self.shuffle_mode:
-            self.shuffle_btn.config(bg="#007AFF", activebackground="#0056CC")
+            self.shuffle_btn.config(bg=theme.color("accent"), activebackground=theme.color("accent_active"))
         else:
-            self.shuffle_btn.config(bg="#5A5A5C", activebackground="#6A6A6C")
+            self.shuffle_btn.config(bg=theme.color("control"), activebackground=theme.color("control_active"))
 
     def set_volume(self, value):
-        """Set the volume of the music player"""
-        volume = float(value) / 100
-        pygame.mixer.music.set_volume(volume)
-
-    def monitor_song(self):
-        """Monitor if the current song has finished playing"""
-        while self.is_playing and not self.is_closing:
-            if not pygame.mixer.music.get_busy() and not self.is_paused:
-                # Song finished, play next song
-                self.after(100, self.next_song)
-                break
-            time.sleep(0.5)
+        """Set the volume of the music player - slider motion is coalesced, one call in flight at a time"""
+        if self.syncing:
+            return
+        with self.volume_lock:
+            queued = self.pending_volume is not None
+            self.pending_volume = float(value) / 100
+        if not queued:
+            self.worker.submit(self._send_volume)
+
+    def _send_volume(self, engine):
+        """Runs on the engine worker - sends whatever value the slider has by now"""
+        with self.volume_lock:
+            volume, self.pending_volume = self.pending_volume, None
+        if volume is None:
+            return
+        try:
+            engine.set_volume(volume)
+        except DaemonError as e:
+            print(f"Error talking to audio daemon: {e}")
+
+    def start_polling(self):
+        if self.poll_job is None:
+            self.poll_job = self.after(STATUS_POLL_MS, self.poll_status)
+
+    def poll_status(self):
+        """Visible panel follows the engine state; a hidden one does not poll at all"""
+        self.poll_job = None
+        if self.is_closing or not self.panel_visible:
+            return
+        self.refresh_status()
+        self.start_polling()
+
+    def on_show(self):
+        self.refresh_status()
+        self.start_polling()
+
+    def on_hide(self):
+        """Only the UI refresh stops (see poll_status); the engine keeps checking for the end of the
+        song at its usual rate, otherwise a hidden player would leave gaps between tracks"""
+
+    def can_evict(self):
+        """A playing (or paused) local player stays in the pool so the music keeps going"""
+        return self.engine_remote or not self.engine_playing
 
     def destroy(self):
         """Override destroy to properly cleanup"""
         self.is_closing = True
-        try:
-            pygame.mixer.music.stop()
-            pygame.mixer.quit()
-        except:
-            pass
+        if self.poll_job is not None:
+            self.after_cancel(self.poll_job)
+            self.poll_job = None
+        # The worker closes the engine: a local one stops the music, a daemon client only disconnects
+        self.worker.stop()
         super().destroy()
 
 if __name__ == "__main__":
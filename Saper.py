@@ -1,9 +1,11 @@
 import tkinter as tk
 from tkinter import messagebox
 import random
-from gradient_utils import setup_macos_window, create_rounded_inner_container
+from gradient_utils import setup_macos_panel
+from panel_pool import PooledPanel
+from theme import themed
 
-class Saper(tk.Toplevel):
+class Saper(PooledPanel, tk.Toplevel):
     def __init__(self, master=None):
         super().__init__(master)
         self.overrideredirect(True)
@@ -24,17 +26,16 @@ class Saper(tk.Toplevel):
         self.game_won = False
         self.mines_remaining = self.mines
           # Setup macOS style rounded window
-        self.canvas, self.container = setup_macos_window(self, 500, 650, corner_radius=16, 
-                                                        bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0)
+        self.canvas, self.container = setup_macos_panel(self, 500, 650, corner_radius=16, border_width=0,
+                                                        margin=20, inner_radius=12)
 
-        # Draw rounded inner container with equal margins (20px from all sides)
+        # Inner container margins (20px from all sides), drawn into the cached background
         margin = 20
         inner_width = 500 - 2 * margin  # 460
         inner_height = 650 - 2 * margin  # 610
-        create_rounded_inner_container(self.canvas, margin, margin, inner_width, inner_height, corner_radius=12, bg_color="#3A3A3C")
         
         # Title bar positioned over the gray container - slightly lighter than outer part
-        self.title_bar = tk.Frame(self.canvas, bg="#2A2A2C", height=30)
+        self.title_bar = themed(tk.Frame, self.canvas, "title_bar", height=30)
         self.canvas.create_window(margin, margin, window=self.title_bar, anchor='nw', width=inner_width, height=30)
         
         # Bind drag events to title bar only
@@ -42,21 +43,17 @@ class Saper(tk.Toplevel):
         self.title_bar.bind("<B1-Motion>", self.do_move)
         
         # Close button in the title bar (right side)
-        self.close_btn = tk.Button(
+        self.close_btn = themed(
+            tk.Button,
             self.title_bar,
+            "close_button",
             text="✕",
-            command=self.destroy,
-            bg="#FF5F57",
-            fg="white",
-            font=("Arial", 8, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#FF3B30"
+            command=self.close
         )
         self.close_btn.pack(side='right', padx=10, pady=5)
         
         # Content area for game inside the rounded container (below title bar)
-        self.content_frame = tk.Frame(self.canvas, bg="#3A3A3C")
+        self.content_frame = themed(tk.Frame, self.canvas, "content")
         content_margin = 15
         self.canvas.create_window(margin + content_margin, margin + 30 + 5, window=self.content_frame, anchor='nw', 
                                 width=inner_width - 2 * content_margin, height=inner_height - 30 - 15)
@@ -77,62 +74,60 @@ class Saper(tk.Toplevel):
 
     def build_ui(self):
         # Title
-        title_label = tk.Label(
+        title_label = themed(
+            tk.Label,
             self.content_frame,
+            "label",
             text="Saper",
             font=("SF Pro Display", 16, "bold"),
-            bg="#3A3A3C",
-            fg="#FFFFFF",
             anchor="w"
         )
         title_label.pack(fill="x", pady=(5, 10))
         
         # Info panel
-        self.info_frame = tk.Frame(self.content_frame, bg="#48484A", relief="flat", bd=0)
+        self.info_frame = themed(tk.Frame, self.content_frame, "field", relief="flat", bd=0)
         self.info_frame.pack(fill="x", pady=(0, 10), padx=5)
         
         # Mines counter
-        self.mines_label = tk.Label(
+        self.mines_label = themed(
+            tk.Label,
             self.info_frame,
+            "field_label",
             text=f"Miny: {self.mines_remaining}",
-            font=("SF Pro Text", 12, "bold"),
-            bg="#48484A",
-            fg="#FFFFFF"
+            font=("SF Pro Text", 12, "bold")
         )
         self.mines_label.pack(side="left", padx=10, pady=8)
         
         # New game button
-        self.new_game_btn = tk.Button(
+        self.new_game_btn = themed(
+            tk.Button,
             self.info_frame,
+            "accent_button",
             text="Nowa Gra",
             command=self.new_game,
-            bg="#007AFF",
-            fg="white",
-            font=("SF Pro Text", 10, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#0056CC"
+            font=("SF Pro Text", 10, "bold")
         )
         self.new_game_btn.pack(side="right", padx=10, pady=5)
         
         # Game status
-        self.status_label = tk.Label(
+        self.status_label = themed(
+            tk.Label,
             self.info_frame,
+            "field_label",
             text="Powodzenia!",
-            font=("SF Pro Text", 10),
-            bg="#48484A",
-            fg="#FFFFFF"
+            font=("SF Pro Text", 10)
         )
         self.status_label.pack(side="right", padx=10, pady=8)
         
         # Game board frame
-        self.board_frame = tk.Frame(self.content_frame, bg="#3A3A3C")
+        self.board_frame = themed(tk.Frame, self.content_frame, "content")
         self.board_frame.pack(fill="both", expand=True, pady=(0, 10))
         
         # Create scrollable canvas for the board
-        self.board_canvas = tk.Canvas(
-            self.board_frame, 
-            bg="#2C2C2E",
+        self.board_canvas = themed(
+            tk.Canvas,
+            self.board_frame,
+            "row",
             highlightthickness=0,
             width=400,
             height=400
@@ -140,32 +135,30 @@ class Saper(tk.Toplevel):
         self.board_canvas.pack(fill="both", expand=True)
         
         # Scrollbars for large boards
-        self.v_scrollbar = tk.Scrollbar(
-            self.board_frame, 
-            orient="vertical", 
-            command=self.board_canvas.yview,
-            bg="#5A5A5C",
-            troughcolor="#3A3A3C",
-            activebackground="#6A6A6C"
+        self.v_scrollbar = themed(
+            tk.Scrollbar,
+            self.board_frame,
+            "scrollbar",
+            orient="vertical",
+            command=self.board_canvas.yview
         )
-        self.h_scrollbar = tk.Scrollbar(
-            self.board_frame, 
-            orient="horizontal", 
-            command=self.board_canvas.xview,
-            bg="#5A5A5C",
-            troughcolor="#3A3A3C",
-            activebackground="#6A6A6C"
+        self.h_scrollbar = themed(
+            tk.Scrollbar,
+            self.board_frame,
+            "scrollbar",
+            orient="horizontal",
+            command=self.board_canvas.xview
         )
         
         self.board_canvas.configure(yscrollcommand=self.v_scrollbar.set, xscrollcommand=self.h_scrollbar.set)
         
         # Instructions
-        instructions = tk.Label(
+        instructions = themed(
+            tk.Label,
             self.content_frame,
+            "muted_label",
             text="Lewy klik - odkryj pole | Prawy klik - flaga",
-            font=("SF Pro Text", 9),
-            bg="#3A3A3C",
-            fg="#CCCCCC"
+            font=("SF Pro Text", 9)
         )
         instructions.pack(pady=(5, 0))
 
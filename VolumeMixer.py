@@ -1,30 +1,56 @@
 import tkinter as tk
-from tkinter import ttk
-from ctypes import windll
-from pycaw.pycaw import AudioUtilities, ISimpleAudioVolume
-from gradient_utils import setup_macos_window, configure_ttk_styles, create_rounded_inner_container
+from tkinter import ttk, simpledialog
+import time
+from audio_client import connect_mixer_backend
+from mixer_backend import MixerWorker, VolumeWriter
+from gradient_utils import setup_macos_panel
+from panel_pool import PooledPanel
+from theme import ensure_styles, themed, current_theme
+from virtual_list import VirtualList
+from volume_profiles import VolumeProfileStore, app_key
 
-class VolumeMixer(tk.Toplevel):
+# Wiersze sesji trafiają do UI paczkami: po tylu sesjach albo po tylu sekundach
+SESSION_BATCH_SIZE = 16
+SESSION_BATCH_SECONDS = 0.05
+# Co ile sprawdzać nowe/zamknięte sesje i zmiany głośności z innych programów
+SESSION_POLL_MS = 1000
+# Schowany mikser sprawdza sesje rzadziej i tylko wtedy, gdy ma zapamiętane głośności do przywrócenia
+SESSION_POLL_HIDDEN_MS = 3000
+# Zapis profili głośności odkładany, żeby seria zmian dała jeden zapis pliku
+PROFILE_SAVE_DELAY_MS = 1000
+# Tyle po własnym zapisie nie nadpisujemy suwaka odczytem, który mógł go wyprzedzić
+OWN_WRITE_GRACE = 1.0
+# Najwyżej tyle paczek zapisów głośności na sekundę podczas przeciągania suwaka
+VOLUME_WRITES_PER_SECOND = 30
+# Mierniki poziomu: jeden odczyt wszystkich sesji i jedno przerysowanie na klatkę
+METER_FRAME_MS = 50
+METER_HEIGHT = 3
+# Wysokość wiersza sesji razem z odstępem - lista tworzy widgety tylko dla widocznych wierszy
+SESSION_ROW_HEIGHT = 52
+
+def mute_text(volume, muted):
+    return "🔇" if muted or volume == 0 else "🔊"
+
+class VolumeMixer(PooledPanel, tk.Toplevel):
     def __init__(self, master=None):
         super().__init__(master)
         self.overrideredirect(True)
         self.attributes('-topmost', True)  # Zawsze na wierzchu
         self.geometry("400x300+400+10")  # Top position with margin 10px  # Mniejsza wysokość, 10px od góry
           # Setup macOS style rounded window
-        self.canvas, self.container = setup_macos_window(self, 400, 300, corner_radius=16, 
-                                                        bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0)
+        self.canvas, self.container = setup_macos_panel(self, 400, 300, corner_radius=16, border_width=0,
+                                                        margin=20, inner_radius=12)
 
-        # Configure TTK styles for sliders
-        configure_ttk_styles()
+        # TTK styles are registered once per Tk interpreter - a no-op after the first panel
+        ensure_styles(self)
 
-        # Draw rounded inner container with equal margins (20px from all sides)
+        # Inner container margins (20px from all sides), drawn into the cached background
         margin = 20
         inner_width = 400 - 2 * margin  # 360
         inner_height = 300 - 2 * margin  # 260
-        create_rounded_inner_container(self.canvas, margin, margin, inner_width, inner_height, corner_radius=12, bg_color="#3A3A3C")
         
         # Title bar positioned over the gray container - slightly lighter than outer part
-        self.title_bar = tk.Frame(self.canvas, bg="#2A2A2C", height=30)
+        self.title_bar = themed(tk.Frame, self.canvas, "title_bar", height=30)
         self.canvas.create_window(margin, margin, window=self.title_bar, anchor='nw', width=inner_width, height=30)
         
         # Bind drag events to title bar only
@@ -32,40 +58,59 @@ class VolumeMixer(tk.Toplevel):
         self.title_bar.bind("<B1-Motion>", self.do_move)
         
         # Close button in the title bar (right side)
-        self.close_btn = tk.Button(
+        self.close_btn = themed(
+            tk.Button,
             self.title_bar,
+            "close_button",
             text="✕",
-            command=self.destroy,
-            bg="#FF5F57",
-            fg="white",
-            font=("Arial", 8, "bold"),
-            bd=0,
-            relief='flat',
-            activebackground="#FF3B30"
+            command=self.close
         )
         self.close_btn.pack(side='right', padx=10, pady=5)        # Content area for volume controls inside the rounded container (below title bar)
-        self.content_frame = tk.Frame(self.canvas, bg="#3A3A3C")
+        self.content_frame = themed(tk.Frame, self.canvas, "content")
         content_margin = 15
         self.canvas.create_window(margin + content_margin, margin + 30 + 5, window=self.content_frame, anchor='nw', 
                                 width=inner_width - 2 * content_margin, height=inner_height - 30 - 15)
 
-        # Create scrollable frame for volume controls
-        self.scroll_canvas = tk.Canvas(self.content_frame, bg="#3A3A3C", highlightthickness=0)
-        self.scroll_canvas.pack(fill="both", expand=True, padx=5, pady=5)
-        
-        # Scrollable frame that will contain all volume controls
-        self.scrollable_frame = tk.Frame(self.scroll_canvas, bg="#3A3A3C")
-        self.scroll_canvas_window = self.scroll_canvas.create_window(0, 0, window=self.scrollable_frame, anchor="nw")
-        
-        # Bind mouse wheel scrolling
-        self.scroll_canvas.bind("<MouseWheel>", self._on_mousewheel)
-        self.scrollable_frame.bind("<MouseWheel>", self._on_mousewheel)
-          # Bind canvas resize to update scroll region
-        self.scrollable_frame.bind("<Configure>", self._on_frame_configure)
-        self.scroll_canvas.bind("<Configure>", self._on_canvas_configure)
-
-        self.volume_controls = []
+        # Only the rows in view exist as widgets; they are recycled while scrolling
+        self.session_list = VirtualList(self.content_frame, SESSION_ROW_HEIGHT, self.create_session_row,
+                                        self.bind_session_row, key=lambda key: key)
+        self.session_list.pack(fill="both", expand=True, padx=5, pady=5)
+
+        # Sessions come from the audio daemon when it is running, otherwise straight from pycaw -
+        # either way only on the worker thread, so opening the panel never waits for COM
+        self.is_closing = False
+        self.worker = MixerWorker(connect_mixer_backend, on_error=self.on_backend_failed)
+        # Slider motion is coalesced - only the latest value per session reaches COM, at a capped rate
+        self.writer = VolumeWriter(self.worker, max_rate=VOLUME_WRITES_PER_SECOND)
+        # klucze sesji w kolejności wierszy listy
+        self.session_keys = []
+        self.meter_job = None
+        self.meter_pending = False
+        # klucz sesji -> (volume, muted) ostatnio pokazane w wierszu
+        self.session_state = {}
+        self.last_write = {}
+        self.dragging_key = None
+        self.syncing = False
+        self.poll_job = None
+        self.poll_pending = False
+        self.change_flagged = False
+        self.enumerated = False
+        # Volume/mute remembered per exe, reapplied when the app's session appears again
+        self.profiles = VolumeProfileStore()
+        # klucz sesji -> nazwa exe
+        self.session_names = {}
+        self.save_job = None
+
+        # Named volume profiles ("meeting", "gaming") - left side of the title bar
+        self.profile_btn = themed(tk.Menubutton, self.title_bar, "button", text="Profile ▾", font=("SF Pro Text", 9))
+        self.profile_menu = tk.Menu(self.profile_btn, tearoff=0, postcommand=self.fill_profile_menu)
+        self.profile_btn.configure(menu=self.profile_menu)
+        self.profile_btn.pack(side='left', padx=10, pady=4)
+
+        # Backends with their own change events (the simulator) trigger a poll right away
+        self.worker.submit(lambda backend: backend.subscribe(self.on_backend_change))
         self.build_ui()
+        self.start_meters()
 
     def start_move(self, event):
         self.x = event.x
@@ -78,86 +123,401 @@ class VolumeMixer(tk.Toplevel):
         y = self.winfo_y() + deltay
         self.geometry(f"+{x}+{y}")
 
-    def _on_mousewheel(self, event):
-        """Handle mouse wheel scrolling"""
-        self.scroll_canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
-    
-    def _on_frame_configure(self, event):
-        """Update scroll region when frame size changes"""
-        self.scroll_canvas.configure(scrollregion=self.scroll_canvas.bbox("all"))
-    
-    def _on_canvas_configure(self, event):
-        """Update scrollable frame width when canvas size changes"""
-        canvas_width = event.width
-        self.scroll_canvas.itemconfig(self.scroll_canvas_window, width=canvas_width)
-
     def build_ui(self):
-        sessions = AudioUtilities.GetAllSessions()
+        """Sessions are enumerated on the mixer worker and stream in as rows"""
+        self.loading_label = themed(
+            tk.Label,
+            self.content_frame,
+            "muted_label",
+            text="Loading audio sessions...",
+            font=("SF Pro Text", 10)
+        )
+        self.loading_label.pack(pady=10, before=self.session_list)
+        self.worker.submit(self._enumerate_sessions)
+
+    def _enumerate_sessions(self, backend):
+        """Runs on the mixer worker - hands rows to the Tk thread in small batches"""
+        batch = []
+        last_flush = time.perf_counter()
+        try:
+            for session in backend.iter_sessions():
+                batch.append(session)
+                if len(batch) >= SESSION_BATCH_SIZE or time.perf_counter() - last_flush > SESSION_BATCH_SECONDS:
+                    self.after(0, self.add_session_rows, batch)
+                    batch = []
+                    last_flush = time.perf_counter()
+        finally:
+            # Even after a failure (daemon down, COM error) the loading label goes away and polling starts
+            self.after(0, self.add_session_rows, batch, True)
+
+    def on_backend_failed(self, error):
+        """Called on the mixer worker when neither the daemon nor pycaw could be reached"""
+        if self.is_closing:
+            return
+        try:
+            self.after(0, self.show_backend_error, error)
+        except (RuntimeError, tk.TclError):
+            pass  # Panel already destroyed
+
+    def show_backend_error(self, error):
+        """No session will ever arrive - say so instead of loading forever"""
+        if not self.is_closing:
+            self.loading_label.config(text=f"Audio sessions unavailable: {error}")
+
+    def add_session_rows(self, sessions, done=False):
+        if self.is_closing:
+            return
         for session in sessions:
-            if session.Process and session._ctl.QueryInterface(ISimpleAudioVolume):
-                app_name = session.Process.name()
-                volume_interface = session._ctl.QueryInterface(ISimpleAudioVolume)                # Kontener dla każdej aplikacji z zaokrąglonym tłem
-                app_frame = tk.Frame(self.scrollable_frame, bg="#2C2C2E", relief="flat", bd=0)
-                app_frame.pack(fill="x", pady=3, padx=5)
-                
-                # Wewnętrzny frame z paddingiem
-                inner_frame = tk.Frame(app_frame, bg="#2C2C2E")
-                inner_frame.pack(fill="x", padx=8, pady=6)
-
-                # App name label
-                label = tk.Label(
-                    inner_frame,
-                    text=app_name.replace('.exe', ''),
-                    font=("SF Pro Text", 12),
-                    bg='#2C2C2E',
-                    fg='#FFFFFF',
-                    anchor='w'
-                )
-                label.pack(side="left")
-
-                # Container dla kontrolek po prawej
-                controls_frame = tk.Frame(inner_frame, bg="#2C2C2E")
-                controls_frame.pack(side="right", fill="x", expand=True, padx=(10, 0))                # Volume slider (macOS style)
-                slider_frame = tk.Frame(controls_frame, bg="#2C2C2E")
-                slider_frame.pack(side="right", fill="x", expand=True)
-                
-                scale = ttk.Scale(
-                    slider_frame,
-                    from_=0,
-                    to=100,
-                    orient="horizontal",
-                    style="Gray.Horizontal.TScale",
-                    command=lambda val, v=volume_interface: self.set_volume(v, val)
-                )
-                scale.set(volume_interface.GetMasterVolume() * 100)
-                scale.pack(side="right", fill="x", expand=True, padx=(0, 8))
-
-                # Mute button (macOS style)
-                current_volume = volume_interface.GetMasterVolume()
-                is_muted = volume_interface.GetMute()
-                mute_text = "🔇" if is_muted or current_volume == 0 else "🔊"
-                
-                mute_btn = tk.Button(
-                    controls_frame,
-                    text=mute_text,
-                    command=lambda v=volume_interface, b=None: self.toggle_mute(v),
-                    bg="#3A3A3C",
-                    fg="white",
-                    font=("Arial", 10),
-                    bd=0,
-                    relief='flat',
-                    activebackground="#48484A",
-                    width=3,
-                    height=1
-                )
-                mute_btn.pack(side="right", padx=(0, 5))
-
-                self.volume_controls.append((label, scale, volume_interface, mute_btn))
-
-    def set_volume(self, volume_interface, value):
+            if session["key"] not in self.session_state:
+                # Apps already running when the mixer starts get their remembered volume too
+                self.add_session(self.apply_remembered(session))
+        self.session_list.set_items(self.session_keys)
+        if done or self.session_keys:
+            self.loading_label.pack_forget()
+        if done:
+            self.enumerated = True
+            self.start_polling()
+
+    def watching(self):
+        """A visible mixer always watches sessions; a hidden one only to reapply remembered volumes"""
+        return self.panel_visible or (bool(self.profiles.apps) and not self.panel_suspended)
+
+    def start_polling(self):
+        if self.poll_job is None and not self.is_closing and self.enumerated and self.watching():
+            delay = SESSION_POLL_MS if self.panel_visible else SESSION_POLL_HIDDEN_MS
+            self.poll_job = self.after(delay, self.poll_sessions)
+
+    def poll_sessions(self):
+        """One poll at a time is in flight on the worker"""
+        self.poll_job = None
+        if self.is_closing or not self.watching():
+            return
+        if not self.poll_pending:
+            self.poll_pending = True
+            self.worker.submit(self._read_sessions)
+        self.start_polling()
+
+    def on_backend_change(self):
+        """Called on a backend thread - at most one wake-up is queued for Tk"""
+        if not self.change_flagged and not self.is_closing:
+            self.change_flagged = True
+            self.after(0, self.poll_now)
+
+    def poll_now(self):
+        self.change_flagged = False
+        if not self.is_closing and self.enumerated and self.watching() and not self.poll_pending:
+            self.poll_pending = True
+            self.worker.submit(self._read_sessions)
+
+    def _read_sessions(self, backend):
+        """Runs on the mixer worker"""
+        try:
+            sessions = backend.list_sessions()
+        except Exception:
+            # Daemon restarting or a session vanishing mid-enumeration - the next poll tries again
+            self.after(0, self.apply_sessions, None)
+            raise
+        self.after(0, self.apply_sessions, sessions)
+
+    def apply_sessions(self, sessions):
+        """Diff against the rows on screen - only rows that appeared, vanished or changed are touched"""
+        self.poll_pending = False
+        if self.is_closing or sessions is None:
+            return
+        current = {session["key"]: session for session in sessions}
+        # Updates first, while the list still shows the old keys at the old indexes
+        new_sessions = []
+        for key, session in current.items():
+            if key in self.session_state:
+                self.update_session(session)
+            else:
+                new_sessions.append(session)
+        removed = [key for key in self.session_keys if key not in current]
+        for key in removed:
+            self.remove_session(key)
+        for session in new_sessions:
+            self.add_session(self.apply_remembered(session))
+        if removed or new_sessions:
+            self.session_list.set_items(self.session_keys)
+
+    def apply_remembered(self, session):
+        """A session that just appeared gets the volume/mute remembered for its exe, in this same tick"""
+        target = self.profiles.target(session["name"])
+        if target is None or target == (session["volume"], session["muted"]):
+            return session
+        volume, muted = target
+        self.last_write[session["key"]] = time.monotonic()
+        self.writer.apply({session["key"]: {"volume": volume, "muted": muted}})
+        return dict(session, volume=volume, muted=muted)
+
+    def update_session(self, session):
+        """Show a volume/mute change made outside the mixer"""
+        key = session["key"]
+        state = (session["volume"], session["muted"])
+        if state == self.session_state.get(key):
+            return
+        if key == self.dragging_key or time.monotonic() - self.last_write.get(key, 0) < OWN_WRITE_GRACE:
+            return
+        self.session_state[key] = state
+        row = self.row_for(key)
+        if row is not None:
+            self.show_row_state(row)
+
+    def add_session(self, session):
+        key = session["key"]
+        self.session_keys.append(key)
+        self.session_names[key] = session["name"]
+        self.session_state[key] = (session["volume"], session["muted"])
+
+    def remove_session(self, key):
+        self.session_keys.remove(key)
+        self.session_state.pop(key, None)
+        self.last_write.pop(key, None)
+        self.session_names.pop(key, None)
+
+    def on_show(self):
+        # Restart the poll at the visible rate
+        self.stop_ticks()
+        self.start_polling()
+        self.start_meters()
+
+    def on_hide(self):
+        """Meters stop; the session poll keeps going slowly only if there are volumes to reapply"""
+        self.stop_ticks()
+        self.start_polling()
+        self.flush_profiles()
+
+    def on_suspend(self):
+        self.stop_ticks()
+
+    def on_resume(self):
+        self.start_polling()
+
+    def stop_ticks(self):
+        for job in (self.meter_job, self.poll_job):
+            if job is not None:
+                self.after_cancel(job)
+        self.meter_job = self.poll_job = None
+
+    def start_meters(self):
+        if self.meter_job is None and not self.is_closing:
+            self.meter_job = self.after(METER_FRAME_MS, self.meter_tick)
+
+    def meter_tick(self):
+        """One scheduler tick for all meters; a frame is skipped while the previous read is in flight"""
+        self.meter_job = None
+        if self.is_closing or not self.panel_visible:
+            return
+        rows = self.session_list.visible_rows()
+        if not self.meter_pending and rows:
+            # Only sessions whose rows exist are read - the cost does not grow with the session count
+            self.meter_pending = True
+            self.worker.submit(self._read_peaks, [key for _, key, _ in rows])
+        self.start_meters()
+
+    def _read_peaks(self, backend, keys):
+        """Runs on the mixer worker"""
+        try:
+            peaks = backend.get_peaks(keys)
+        except Exception:
+            self.after(0, self.draw_meters, {})
+            raise
+        self.after(0, self.draw_meters, peaks)
+
+    def draw_meters(self, peaks):
+        """All bars in one pass - only bars whose width changed are touched, Tk repaints once"""
+        self.meter_pending = False
+        if self.is_closing:
+            return
+        for _, key, row in self.session_list.visible_rows():
+            if key not in peaks:
+                continue
+            width = int(peaks[key] * row.meter.winfo_width())
+            if width != row.meter_width:
+                row.meter_width = width
+                row.meter.coords(row.meter_bar, 0, 0, width, METER_HEIGHT)
+
+    def row_for(self, key):
+        for _, row_key, row in self.session_list.visible_rows():
+            if row_key == key:
+                return row
+        return None
+
+    def create_session_row(self, parent):
+        """Empty row widgets - bind_session_row fills them for whichever session scrolls into view"""
+        # Kontener dla każdej aplikacji z zaokrąglonym tłem
+        row = themed(tk.Frame, parent, "row", relief="flat", bd=0)
+        row.key = None
+        
+        # Wewnętrzny frame z paddingiem
+        inner_frame = themed(tk.Frame, row, "row")
+        inner_frame.pack(fill="x", padx=8, pady=6)
+
+        # App name label
+        row.label = themed(
+            tk.Label,
+            inner_frame,
+            "row_label",
+            font=("SF Pro Text", 12),
+            anchor='w'
+        )
+        row.label.pack(side="left")
+
+        # Container dla kontrolek po prawej
+        controls_frame = themed(tk.Frame, inner_frame, "row")
+        controls_frame.pack(side="right", fill="x", expand=True, padx=(10, 0))
+
+        # Volume slider (macOS style)
+        slider_frame = themed(tk.Frame, controls_frame, "row")
+        slider_frame.pack(side="right", fill="x", expand=True)
+        
+        row.scale = ttk.Scale(
+            slider_frame,
+            from_=0,
+            to=100,
+            orient="horizontal",
+            style="Gray.Horizontal.TScale",
+            command=lambda val, r=row: self.set_volume(r.key, val)
+        )
+        row.scale.pack(side="right", fill="x", expand=True, padx=(0, 8))
+        # An external change must not yank the slider out from under the mouse
+        row.scale.bind("<ButtonPress-1>", lambda event, r=row: setattr(self, "dragging_key", r.key), add="+")
+        row.scale.bind("<ButtonRelease-1>", lambda event, r=row: self.end_drag(r.key), add="+")
+
+        # Mute button (macOS style)
+        row.mute_btn = themed(
+            tk.Button,
+            controls_frame,
+            "row_button",
+            command=lambda r=row: self.toggle_mute(r.key),
+            font=("Arial", 10),
+            width=3,
+            height=1
+        )
+        row.mute_btn.pack(side="right", padx=(0, 5))
+
+        # Peak meter under the controls, drawn by the shared meter tick
+        row.meter = themed(tk.Canvas, row, "row", height=METER_HEIGHT, highlightthickness=0)
+        row.meter.pack(fill="x", padx=8, pady=(0, 4))
+        row.meter_bar = row.meter.create_rectangle(0, 0, 0, METER_HEIGHT, width=0, fill=current_theme().color("success"))
+        row.meter_width = 0
+        return row
+
+    def bind_session_row(self, row, key, index):
+        if row.key != key:
+            row.key = key
+            row.label.config(text=self.session_names[key].replace('.exe', ''))
+            row.meter_width = 0
+            row.meter.coords(row.meter_bar, 0, 0, 0, METER_HEIGHT)
+        self.show_row_state(row)
+
+    def show_row_state(self, row):
+        """Slider and mute label from session_state, without writing the volume back"""
+        volume, muted = self.session_state[row.key]
+        self.syncing = True
+        try:
+            row.scale.set(volume * 100)
+        finally:
+            self.syncing = False
+        row.mute_btn.config(text=mute_text(volume, muted))
+
+    def set_volume(self, key, value):
+        if self.syncing or key not in self.session_state:
+            return
         volume = float(value) / 100.0
-        volume_interface.SetMasterVolume(volume, None)
+        self.last_write[key] = time.monotonic()
+        self.writer.set_volume(key, volume)
+        self.show_state(key, volume, self.session_state[key][1])
+
+    def end_drag(self, key):
+        """The value under the mouse on release is always written, without waiting for the rate cap"""
+        self.dragging_key = None
+        row = self.row_for(key)
+        if row is not None:
+            self.set_volume(key, row.scale.get())
+            self.writer.flush()
+            self.remember(key)
+
+    def toggle_mute(self, key):
+        if key not in self.session_state:
+            return
+        volume, muted = self.session_state[key]
+        self.last_write[key] = time.monotonic()
+        self.writer.set_mute(key, not muted)
+        # The label changes right away, the write follows on the worker
+        self.show_state(key, volume, not muted)
+        self.remember(key)
+
+    def show_state(self, key, volume, muted):
+        self.session_state[key] = (volume, muted)
+        row = self.row_for(key)
+        if row is not None:
+            row.mute_btn.config(text=mute_text(volume, muted))
+
+    def remember(self, key):
+        """The user's setting for this exe is what it gets next time its session appears"""
+        volume, muted = self.session_state[key]
+        self.profiles.remember(self.session_names[key], volume, muted)
+        self.schedule_save()
+
+    def schedule_save(self):
+        if self.save_job is None:
+            self.save_job = self.after(PROFILE_SAVE_DELAY_MS, self.save_profiles)
+
+    def save_profiles(self):
+        self.save_job = None
+        self.profiles.save()
+
+    def flush_profiles(self):
+        """Zaległy zapis profili od razu, bez czekania na PROFILE_SAVE_DELAY_MS"""
+        if self.save_job is not None:
+            self.after_cancel(self.save_job)
+        self.save_profiles()
+
+    def fill_profile_menu(self):
+        theme = current_theme()
+        self.profile_menu.configure(bg=theme.color("control"), fg=theme.color("text"),
+                                    activebackground=theme.color("accent"), activeforeground="white")
+        self.profile_menu.delete(0, "end")
+        names = self.profiles.profile_names()
+        for name in names:
+            self.profile_menu.add_command(label=name, command=lambda n=name: self.apply_profile(n))
+        if names:
+            self.profile_menu.add_separator()
+        self.profile_menu.add_command(label="Save current as...", command=self.save_current_profile)
+
+    def save_current_profile(self):
+        name = simpledialog.askstring("Volume profile", "Profile name:", parent=self)
+        if not name or not name.strip():
+            return
+        settings = {self.session_names[key]: self.session_state[key] for key in self.session_keys}
+        self.profiles.save_profile(name.strip(), settings)
+        self.schedule_save()
+
+    def apply_profile(self, name):
+        """Every session covered by the profile switches at once - one batched backend pass"""
+        targets = self.profiles.activate_profile(name)
+        batch = {}
+        now = time.monotonic()
+        for key, session_name in self.session_names.items():
+            target = targets.get(app_key(session_name))
+            if target is None:
+                continue
+            volume, muted = target
+            batch[key] = {"volume": volume, "muted": muted}
+            self.last_write[key] = now
+            self.session_state[key] = (volume, muted)
+        self.session_list.refresh()
+        if batch:
+            self.writer.apply(batch)
+        self.schedule_save()
 
-    def toggle_mute(self, volume_interface):
-        is_muted = volume_interface.GetMute()
-        volume_interface.SetMute(not is_muted, None)
\ No newline at end of file
+    def destroy(self):
+        self.is_closing = True
+        self.stop_ticks()
+        self.flush_profiles()
+        # Writer hands its last values to the worker before the worker is told to stop
+        self.writer.stop()
+        self.writer.thread.join(0.5)
+        self.worker.stop()
+        super().destroy()
\ No newline at end of file
@@ -0,0 +1,208 @@
+import hashlib
+import json
+import os
+import shlex
+import sys
+import threading
+from app_paths import get_cache_dir
+
+DISCOVERY_INDEX_VERSION = 1
+# Jak głęboko schodzić w podkatalogi (Start Menu ma zwykle 2 poziomy)
+MAX_SCAN_DEPTH = 4
+LAUNCHABLE_EXTENSIONS = (".lnk", ".exe", ".desktop")
+# Kody pól z linii Exec= w plikach .desktop (%U, %f, ...) - usuwane przed uruchomieniem
+_DESKTOP_FIELD_CODES = ("%f", "%F", "%u", "%U", "%d", "%D", "%n", "%N", "%i", "%c", "%k", "%v", "%m")
+
+def discovery_enabled():
+    """Wyszukiwanie programów jest opcjonalne - PANEL_DISCOVERY=1 je włącza"""
+    return os.environ.get("PANEL_DISCOVERY", "") not in ("", "0")
+
+def default_discovery_dirs():
+    """PANEL_DISCOVERY_DIRS (oddzielone os.pathsep) albo standardowe miejsca skrótów dla systemu"""
+    configured = os.environ.get("PANEL_DISCOVERY_DIRS")
+    if configured:
+        return [path for path in configured.split(os.pathsep) if path]
+    if sys.platform == "win32":
+        return [os.path.join(base, "Microsoft", "Windows", "Start Menu", "Programs")
+                for base in (os.environ.get("APPDATA"), os.environ.get("PROGRAMDATA")) if base]
+    data_dirs = [os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")]
+    data_dirs += (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(":")
+    return [os.path.join(base, "applications") for base in data_dirs if base]
+
+def discovered_id(path):
+    """Stały id wpisu znalezionego na dysku - historia uruchomień przetrwa ponowne skanowanie"""
+    return "disc-" + hashlib.sha1(os.path.normcase(path).encode("utf-8")).hexdigest()[:12]
+
+def read_desktop_file(path):
+    """(nazwa, polecenie) z pliku .desktop albo None dla wpisów ukrytych i nie-aplikacji"""
+    fields = {}
+    in_entry = False
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("["):
+                    in_entry = line == "[Desktop Entry]"
+                elif in_entry and "=" in line:
+                    key, value = line.split("=", 1)
+                    fields.setdefault(key.strip(), value.strip())
+    except OSError:
+        return None
+    if fields.get("Type", "Application") != "Application" or "Exec" not in fields:
+        return None
+    if fields.get("NoDisplay") == "true" or fields.get("Hidden") == "true":
+        return None
+    try:
+        args = [arg for arg in shlex.split(fields["Exec"]) if arg not in _DESKTOP_FIELD_CODES]
+    except ValueError:
+        return None
+    if not args:
+        return None
+    return fields.get("Name") or os.path.splitext(os.path.basename(path))[0], shlex.join(args)
+
+def read_item(path):
+    """Wpis dla pliku, który da się uruchomić, albo None"""
+    name, ext = os.path.splitext(os.path.basename(path))
+    ext = ext.lower()
+    if ext == ".desktop":
+        parsed = read_desktop_file(path)
+        if parsed is None:
+            return None
+        name, command = parsed
+        return {"name": name, "path": command, "source": path}
+    if ext in (".lnk", ".exe"):
+        return {"name": name, "path": path, "source": path}
+    return None
+
+class AppDiscovery:
+    """Skanuje katalogi w poszukiwaniu skrótów .lnk, programów .exe i plików .desktop.
+
+    Indeks w katalogu cache: {"version": 1, "dirs": {katalog: {"mtime": ns, "items": [...], "subdirs": [...]}}}.
+    Katalog, którego mtime się nie zmienił, nie jest listowany ponownie - przy kolejnym skanowaniu
+    sprawdzany jest tylko jego stat. Zmiana samego pliku .desktop bez zmiany katalogu nie jest widoczna
+    do czasu, aż coś w katalogu zostanie dodane albo usunięte.
+    """
+
+    def __init__(self, dirs=None, index_path=None):
+        self.dirs = dirs if dirs is not None else default_discovery_dirs()
+        self.index_path = index_path or os.path.join(get_cache_dir(), "discovery_index.json")
+        self.index = {}
+        self.loaded = False
+        self.dirs_listed = 0
+        self.thread = None
+
+    def load_index(self):
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading discovery index: {e}")
+            return
+        if data.get("version") == DISCOVERY_INDEX_VERSION:
+            self.index = data.get("dirs", {})
+
+    def save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": DISCOVERY_INDEX_VERSION, "dirs": self.index}, f, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Error saving discovery index: {e}")
+
+    def entries(self):
+        """Wpisy dla launchera z bieżącego indeksu, bez duplikatów ścieżek"""
+        found = {}
+        for directory in self.dirs:
+            self._collect(os.path.abspath(directory), found, 0)
+        return sorted(found.values(), key=lambda entry: entry["name"].lower())
+
+    def _collect(self, directory, found, depth):
+        cached = self.index.get(directory)
+        if cached is None or depth > MAX_SCAN_DEPTH:
+            return
+        for item in cached["items"]:
+            key = os.path.normcase(item["path"])
+            if key not in found:
+                found[key] = {"id": discovered_id(item["source"]), "name": item["name"], "path": item["path"],
+                              "discovered": True}
+        for subdir in cached["subdirs"]:
+            self._collect(subdir, found, depth + 1)
+
+    def scan(self):
+        """Odświeża indeks; True, jeśli coś się zmieniło"""
+        seen = set()
+        changed = False
+        for directory in self.dirs:
+            changed |= self._scan_dir(os.path.abspath(directory), seen, 0)
+        # Katalogi, których już nie ma albo przestały być skanowane
+        for directory in [directory for directory in self.index if directory not in seen]:
+            del self.index[directory]
+            changed = True
+        if changed:
+            self.save_index()
+        return changed
+
+    def _scan_dir(self, directory, seen, depth):
+        if depth > MAX_SCAN_DEPTH or directory in seen:
+            return False
+        seen.add(directory)
+        try:
+            mtime = os.stat(directory).st_mtime_ns
+        except OSError:
+            return False
+        cached = self.index.get(directory)
+        changed = False
+        if cached is None or cached["mtime"] != mtime:
+            cached = self._list_dir(directory, mtime)
+            if cached is None:
+                return False
+            self.index[directory] = cached
+            changed = True
+        for subdir in cached["subdirs"]:
+            changed |= self._scan_dir(subdir, seen, depth + 1)
+        return changed
+
+    def _list_dir(self, directory, mtime):
+        self.dirs_listed += 1
+        items = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.name.lower().endswith(LAUNCHABLE_EXTENSIONS):
+                            item = read_item(entry.path)
+                            if item is not None:
+                                items.append(item)
+                    except OSError:
+                        continue
+        except OSError as e:
+            print(f"Error scanning {directory}: {e}")
+            return None
+        return {"mtime": mtime, "items": items, "subdirs": sorted(subdirs)}
+
+    def start(self, callback):
+        """W tle: przy pierwszym uruchomieniu callback(wpisy) z zapisanego indeksu, potem - także przy
+        kolejnych - po skanowaniu, tylko jeśli coś się zmieniło.
+
+        callback jest wołany z wątku roboczego.
+        """
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, args=(callback,), daemon=True, name="app-discovery")
+        self.thread.start()
+
+    def _run(self, callback):
+        if not self.loaded:
+            # The saved index is read once; later runs work on the one kept in memory
+            self.loaded = True
+            self.load_index()
+            if self.index:
+                callback(self.entries())
+        if self.scan():
+            callback(self.entries())
@@ -0,0 +1,20 @@
+import os
+
+APP_DIR_NAME = "PanelBoczny"
+
+def _ensure_dir(path):
+    try:
+        os.makedirs(path, exist_ok=True)
+    except OSError:
+        pass
+    return path
+
+def get_cache_dir(*parts):
+    """Katalog na dane, które można odtworzyć (wyrenderowane obrazy, miniatury)"""
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return _ensure_dir(os.path.join(base, APP_DIR_NAME, "cache", *parts))
+
+def get_data_dir(*parts):
+    """Katalog na dane użytkownika, które muszą przetrwać restart"""
+    base = os.environ.get("APPDATA") or os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return _ensure_dir(os.path.join(base, APP_DIR_NAME, *parts))
@@ -0,0 +1,210 @@
+import heapq
+import json
+import math
+import os
+import time
+from app_paths import get_data_dir
+
+LAUNCH_HISTORY_VERSION = 1
+# Ile najlepszych wyników pokazuje lista podczas wyszukiwania
+SEARCH_RESULT_LIMIT = 200
+# Ile punktów może dodać historia uruchomień - wystarczy do przestawienia podobnych trafień
+FRECENCY_WEIGHT = 40.0
+
+_WORD_SEPARATORS = " _-.()[]"
+
+def match_score(query, text):
+    """Punkty za dopasowanie query do text (oba małymi literami); None, jeśli query nie jest podciągiem.
+
+    Prefiks > podciąg zaczynający się od słowa > dowolny podciąg > litery w kolejności (np. "vsc" -> "Visual Studio Code").
+    Krótsze nazwy wygrywają przy tym samym dopasowaniu.
+    """
+    length_penalty = len(text) * 0.5
+    if text.startswith(query):
+        return 300 - length_penalty
+    pos = text.find(query)
+    if pos >= 0:
+        return (200 if text[pos - 1] in _WORD_SEPARATORS else 150) - length_penalty
+
+    score = 50.0
+    pos = -1
+    for char in query:
+        found = text.find(char, pos + 1)
+        if found < 0:
+            return None
+        if found == pos + 1:
+            score += 5
+        else:
+            # Ta sama litera na początku dalszego słowa jest lepsza niż najbliższa w środku słowa
+            start = found
+            while start >= 0 and text[start - 1] not in _WORD_SEPARATORS:
+                start = text.find(char, start + 1)
+            if start >= 0:
+                found = start
+                score += 12
+            else:
+                score -= min(found - pos, 10)
+        pos = found
+    return score - length_penalty
+
+def _initials(text):
+    return {text[i] for i in range(len(text)) if i == 0 or text[i - 1] in _WORD_SEPARATORS} - set(_WORD_SEPARATORS)
+
+class SearchIndex:
+    """Indeks nazw do wyszukiwania w trakcie pisania.
+
+    Znak -> zbiór id wpisów, które go zawierają; kandydaci to przecięcie zbiorów dla liter zapytania,
+    więc punktowany jest tylko mały ułamek listy. Jedna litera szuka tylko wśród słów od niej
+    zaczynających się. Kolejny znak dopisany na końcu zapytania zawęża poprzednich kandydatów
+    zamiast szukać od nowa. Zmiany wpisów aktualizują tylko te wpisy.
+    """
+
+    def __init__(self):
+        self.texts = {}
+        self.chars = {}
+        # Pierwsza litera słowa -> id wpisów
+        self.initials = {}
+        self._last_query = None
+        self._last_candidates = None
+
+    def __len__(self):
+        return len(self.texts)
+
+    def add(self, entry_id, text):
+        """Dodaje albo aktualizuje wpis"""
+        text = text.lower()
+        old = self.texts.get(entry_id)
+        if old == text:
+            return
+        if old is not None:
+            self.remove(entry_id)
+        self.texts[entry_id] = text
+        for char in set(text):
+            self.chars.setdefault(char, set()).add(entry_id)
+        for char in _initials(text):
+            self.initials.setdefault(char, set()).add(entry_id)
+        self._last_query = None
+
+    def remove(self, entry_id):
+        text = self.texts.pop(entry_id, None)
+        if text is None:
+            return
+        for char in set(text):
+            ids = self.chars.get(char)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self.chars[char]
+        for char in _initials(text):
+            ids = self.initials.get(char)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self.initials[char]
+        self._last_query = None
+
+    def sync(self, entries):
+        """entries: {id: nazwa} - przeindeksowuje tylko wpisy dodane, zmienione albo usunięte"""
+        for entry_id in [entry_id for entry_id in self.texts if entry_id not in entries]:
+            self.remove(entry_id)
+        for entry_id, text in entries.items():
+            self.add(entry_id, text)
+
+    def _candidates(self, query):
+        if len(query) == 1:
+            return self.initials.get(query, ())
+        if self._last_query and len(self._last_query) > 1 and query.startswith(self._last_query):
+            # Dłuższe zapytanie pasuje tylko do części tego, co pasowało wcześniej
+            return self._last_candidates
+        sets = []
+        for char in set(query):
+            ids = self.chars.get(char)
+            if not ids:
+                return []
+            sets.append(ids)
+        sets.sort(key=len)
+        return set.intersection(*sets) if len(sets) > 1 else set(sets[0])
+
+    def search(self, query, limit=SEARCH_RESULT_LIMIT, boost=None):
+        """id najlepszych wpisów dla query, od najlepszego; boost(id) dodaje punkty (np. frecency)"""
+        query = query.lower()
+        if not query:
+            return []
+        scored = []
+        matched = []
+        for entry_id in self._candidates(query):
+            score = match_score(query, self.texts[entry_id])
+            if score is None:
+                continue
+            matched.append(entry_id)
+            if boost is not None:
+                score += boost(entry_id)
+            scored.append((score, entry_id))
+        self._last_query = query
+        self._last_candidates = matched
+        return [entry_id for _score, entry_id in heapq.nlargest(limit, scored, key=lambda item: item[0])]
+
+class LaunchHistory:
+    """Ile razy i kiedy ostatnio uruchomiono każdy wpis - podbija często i niedawno używane w wynikach.
+
+    Plik: {"version": 1, "launches": {"id wpisu": [liczba uruchomień, czas ostatniego]}}
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "launch_history.json")
+        self.launches = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading launch history: {e}")
+            return
+        if data.get("version") != LAUNCH_HISTORY_VERSION:
+            return
+        self.launches = {entry_id: (count, last) for entry_id, (count, last) in data.get("launches", {}).items()}
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {"version": LAUNCH_HISTORY_VERSION,
+                "launches": {entry_id: [count, round(last)] for entry_id, (count, last) in self.launches.items()}}
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving launch history: {e}")
+
+    def record(self, entry_id):
+        count, _last = self.launches.get(entry_id, (0, 0))
+        self.launches[entry_id] = (count + 1, time.time())
+        self.dirty = True
+
+    def forget(self, entry_id):
+        if self.launches.pop(entry_id, None) is not None:
+            self.dirty = True
+
+    def frecency(self, entry_id):
+        """0 dla nigdy nie uruchomionych, do FRECENCY_WEIGHT dla używanych często i niedawno"""
+        launch = self.launches.get(entry_id)
+        if launch is None:
+            return 0.0
+        count, last = launch
+        age_days = (time.time() - last) / 86400
+        if age_days < 1:
+            recency = 1.0
+        elif age_days < 7:
+            recency = 0.7
+        elif age_days < 30:
+            recency = 0.4
+        else:
+            recency = 0.2
+        return FRECENCY_WEIGHT * recency * min(math.log1p(count) / math.log1p(50), 1.0)
@@ -0,0 +1,136 @@
+import copy
+import json
+import os
+import threading
+import time
+
+APPS_SCHEMA_VERSION = 1
+# Zapis czeka tyle sekund na kolejne zmiany - seria edycji daje jeden zapis pliku
+APPS_SAVE_DELAY = 0.5
+# Po nieudanym zapisie kolejna próba dopiero po tylu sekundach (albo przy close)
+APPS_RETRY_DELAY = 5.0
+
+class AppStore:
+    """apps.json zapisywany w tle, atomowo, z kopią poprzedniej wersji.
+
+    Plik: {"version": 1, "apps": [...]} (plus inne sekcje zapisane przez save); stary format
+    - sama lista wpisów - jest czytany bez zmian i przepisywany przy pierwszym zapisie.
+    Zapis: apps.json.tmp + fsync, poprzedni plik staje się apps.json.bak, tmp zastępuje apps.json.
+    Przerwany zapis zostawia co najmniej jedną pełną wersję; load() wraca wtedy do kopii.
+    """
+
+    def __init__(self, path, delay=APPS_SAVE_DELAY):
+        self.path = path
+        self.backup_path = path + ".bak"
+        self.delay = delay
+        self.lock = threading.Lock()
+        # Zapisy nie mogą się przeplatać - wątek w tle i close() z wątku Tk
+        self.write_lock = threading.Lock()
+        self.pending = None
+        self.requested_at = 0.0
+        self.urgent = False
+        self.closing = False
+        self.wake = threading.Event()
+        self.thread = None
+        self.writes = 0
+
+    def _read(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, list):
+            return {"apps": data}
+        if not isinstance(data, dict) or not isinstance(data.get("apps"), list):
+            raise ValueError("not an apps file")
+        data.pop("version", None)
+        return data
+
+    def load(self):
+        """Sekcje pliku ({"apps": [...], ...}); przy uszkodzonym albo brakującym pliku - z kopii"""
+        try:
+            return self._read(self.path)
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            print(f"Error loading {self.path}: {e}")
+            # Kept for inspection - the next save would otherwise rotate it into the backup
+            try:
+                os.replace(self.path, self.path + ".corrupt")
+            except OSError:
+                pass
+
+        try:
+            data = self._read(self.backup_path)
+        except FileNotFoundError:
+            return {"apps": []}
+        except (OSError, ValueError) as e:
+            print(f"Error loading {self.backup_path}: {e}")
+            return {"apps": []}
+        print(f"Recovered apps from {self.backup_path}")
+        self.save(data)
+        return data
+
+    def save(self, data):
+        """Zapamiętuje stan do zapisu; plik powstaje w tle po APPS_SAVE_DELAY bez kolejnych zmian"""
+        snapshot = copy.deepcopy(data)
+        with self.lock:
+            self.pending = snapshot
+            self.requested_at = time.monotonic()
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="apps-store", daemon=True)
+            self.thread.start()
+        self.wake.set()
+
+    def flush(self):
+        """Zaległy zapis od razu, bez czekania na kolejne zmiany (nie blokuje)"""
+        with self.lock:
+            self.urgent = True
+        self.wake.set()
+
+    def close(self):
+        """Zapisuje zaległy stan w bieżącym wątku i kończy wątek zapisu"""
+        self.closing = True
+        self.wake.set()
+        self._write_pending()
+
+    def _run(self):
+        while not self.closing:
+            self.wake.wait()
+            while True:
+                with self.lock:
+                    delay = self.requested_at + self.delay - time.monotonic()
+                    if delay <= 0 or self.urgent or self.closing:
+                        self.wake.clear()
+                        self.urgent = False
+                        break
+                # Edits arriving meanwhile only replace self.pending
+                time.sleep(delay)
+            self._write_pending()
+
+    def _write_pending(self):
+        with self.write_lock:
+            with self.lock:
+                data, self.pending = self.pending, None
+            if data is None:
+                return
+            try:
+                self._write(data)
+                self.writes += 1
+            except (OSError, TypeError, ValueError) as e:
+                print(f"Error saving apps: {e}")
+                with self.lock:
+                    # Newer edits already replaced it - they are retried instead
+                    if self.pending is None:
+                        self.pending = data
+                    self.requested_at = time.monotonic() + APPS_RETRY_DELAY
+                self.wake.set()
+
+    def _write(self, data):
+        document = {"version": APPS_SCHEMA_VERSION, **data}
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(self.path):
+            os.replace(self.path, self.backup_path)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,166 @@
+import json
+import socket
+import threading
+from mixer_backend import MixerBackend, create_mixer_backend
+
+# Lokalny port protokołu sterującego demona audio (JSON, jedna linia na wiadomość)
+DAEMON_HOST = "127.0.0.1"
+DAEMON_PORT = 47652
+
+class DaemonError(Exception):
+    """Demon odpowiedział błędem albo połączenie zostało zerwane"""
+
+class DaemonClient:
+    """Synchroniczny klient protokołu demona audio - jedno połączenie, żądania po kolei"""
+
+    def __init__(self, port=DAEMON_PORT, timeout=1.0):
+        self.port = port
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock = None
+        self.reader = None
+        self.next_id = 0
+
+    def connect(self):
+        self.sock = socket.create_connection((DAEMON_HOST, self.port), timeout=self.timeout)
+        self.reader = self.sock.makefile("rb")
+
+    def close(self):
+        if self.sock is not None:
+            self.reader.close()
+            self.sock.close()
+            self.sock = self.reader = None
+
+    def call(self, cmd, **args):
+        with self.lock:
+            self.next_id += 1
+            request = json.dumps({"id": self.next_id, "cmd": cmd, "args": args}).encode("utf-8") + b"\n"
+            try:
+                if self.sock is None:
+                    self.connect()
+                self.sock.sendall(request)
+                line = self.reader.readline()
+            except OSError as e:
+                self.close()
+                raise DaemonError(f"Audio daemon unavailable: {e}")
+            if not line:
+                self.close()
+                raise DaemonError("Audio daemon closed the connection")
+        response = json.loads(line)
+        if not response.get("ok"):
+            raise DaemonError(response.get("error"))
+        return response.get("result")
+
+    def ping(self):
+        try:
+            return self.call("ping") == "pong"
+        except DaemonError:
+            return False
+
+class RemotePlaybackEngine:
+    """Ten sam interfejs co PlaybackEngine, ale odtwarzanie odbywa się w demonie"""
+
+    is_remote = True
+
+    def __init__(self, client):
+        self.client = client
+        self.last_error = None
+        self.monitor_interval = 0.5  # Unused - the daemon watches for the end of the song
+
+    def load_playlist(self):
+        self.client.call("music.reload")
+        return self.get_playlist()["songs"]
+
+    def get_playlist(self):
+        return self.client.call("music.playlist")
+
+    def add_files(self, paths):
+        return self.client.call("music.add", paths=list(paths))
+
+    def play(self, index=None):
+        ok = self.client.call("music.play", index=index)
+        if not ok:
+            self.last_error = self.status().get("last_error")
+        return ok
+
+    def toggle_play_pause(self):
+        return self.client.call("music.toggle")
+
+    def next(self):
+        return self.client.call("music.next")
+
+    def previous(self):
+        return self.client.call("music.previous")
+
+    def set_shuffle(self, enabled):
+        return self.client.call("music.shuffle", enabled=enabled)
+
+    def set_volume(self, volume):
+        return self.client.call("music.volume", volume=volume)
+
+    def status(self):
+        return self.client.call("music.status")
+
+    def close(self):
+        # The music keeps playing in the daemon after the panel goes away
+        self.client.close()
+
+class RemoteMixerBackend(MixerBackend):
+    """Backend miksera, którego sesje obsługuje demon"""
+
+    is_remote = True
+
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+
+    def list_sessions(self):
+        return self.client.call("mixer.sessions")
+
+    def iter_sessions(self):
+        # One round trip - the daemon resolves the whole list
+        yield from self.list_sessions()
+
+    def get_volume(self, key):
+        return self.client.call("mixer.get_volume", key=key)
+
+    def set_volume(self, key, volume):
+        self.client.call("mixer.set_volume", key=key, volume=volume)
+
+    def get_mute(self, key):
+        return self.client.call("mixer.get_mute", key=key)
+
+    def set_mute(self, key, muted):
+        self.client.call("mixer.set_mute", key=key, muted=muted)
+
+    def toggle_mute(self, key):
+        return self.client.call("mixer.toggle_mute", key=key)
+
+    def apply_settings(self, settings):
+        # The whole batch in one round trip
+        self.client.call("mixer.apply", settings=settings)
+
+    def get_peaks(self, keys):
+        return self.client.call("mixer.peaks", keys=list(keys))
+
+    def close(self):
+        self.client.close()
+
+def _running_daemon():
+    client = DaemonClient()
+    return client if client.ping() else None
+
+def connect_playback_engine(music_folder="Music"):
+    """Odtwarzacz w demonie, jeśli działa; w przeciwnym razie lokalny silnik w procesie UI"""
+    client = _running_daemon()
+    if client is not None:
+        return RemotePlaybackEngine(client)
+    from playback_engine import PlaybackEngine
+    return PlaybackEngine(music_folder)
+
+def connect_mixer_backend():
+    """Mikser w demonie, jeśli działa; w przeciwnym razie backend w wątku, który woła tę funkcję"""
+    client = _running_daemon()
+    if client is not None:
+        return RemoteMixerBackend(client)
+    return create_mixer_backend()
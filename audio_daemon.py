@@ -0,0 +1,130 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from audio_client import DAEMON_HOST, DAEMON_PORT
+from playback_engine import PlaybackEngine
+
+class AudioDaemon:
+    """Odtwarzanie i mikser bez Tk - działa w osobnym procesie (main.py --daemon).
+
+    Panele Tk są tylko klientami: zacięcie UI nie wstrzymuje już przejścia do kolejnego utworu.
+    Polecenia mixer.* wykonuje jeden osobny wątek COM - wolne wywołanie pycaw nie blokuje pętli
+    ani poleceń odtwarzacza innych klientów.
+    Żądanie: {"id": 1, "cmd": "music.next", "args": {}}
+    Odpowiedź: {"id": 1, "ok": true, "result": ...} albo {"id": 1, "ok": false, "error": "..."}
+    """
+
+    def __init__(self, music_folder="Music", port=DAEMON_PORT):
+        self.port = port
+        self.engine = PlaybackEngine(music_folder)
+        self._mixer = None
+        # One thread for all mixer calls - COM interfaces stay on the thread that created them
+        self.mixer_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="daemon-mixer")
+        self._stopped = None
+        self.clients = set()
+        self.commands = {
+            "ping": lambda: "pong",
+            "shutdown": self.shutdown,
+            "music.status": self.engine.status,
+            "music.playlist": self.engine.get_playlist,
+            "music.reload": self.engine.load_playlist,
+            "music.add": self.engine.add_files,
+            "music.play": self.engine.play,
+            "music.toggle": self.engine.toggle_play_pause,
+            "music.next": self.engine.next,
+            "music.previous": self.engine.previous,
+            "music.shuffle": self.engine.set_shuffle,
+            "music.volume": self.engine.set_volume,
+            "mixer.sessions": lambda: self.mixer.list_sessions(),
+            "mixer.get_volume": lambda key: self.mixer.get_volume(key),
+            "mixer.set_volume": lambda key, volume: self.mixer.set_volume(key, volume),
+            "mixer.get_mute": lambda key: self.mixer.get_mute(key),
+            "mixer.set_mute": lambda key, muted: self.mixer.set_mute(key, muted),
+            "mixer.toggle_mute": lambda key: self.mixer.toggle_mute(key),
+            "mixer.apply": lambda settings: self.mixer.apply_settings(settings),
+            "mixer.peaks": lambda keys: self.mixer.get_peaks(keys),
+        }
+
+    @property
+    def mixer(self):
+        # Created on first use, on the mixer thread
+        if self._mixer is None:
+            from mixer_backend import create_mixer_backend
+            self._mixer = create_mixer_backend()
+        return self._mixer
+
+    def close_mixer(self):
+        """Runs on the mixer thread"""
+        if self._mixer is not None:
+            try:
+                self._mixer.close()
+            except Exception as e:
+                print(f"Error closing mixer backend: {e}")
+            self._mixer = None
+
+    async def dispatch(self, request):
+        try:
+            cmd = request["cmd"]
+            handler = self.commands[cmd]
+            args = request.get("args", {})
+            if cmd.startswith("mixer."):
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.mixer_executor, lambda: handler(**args))
+            else:
+                result = handler(**args)
+            return {"id": request.get("id"), "ok": True, "result": result}
+        except Exception as e:
+            return {"id": request.get("id"), "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+    async def handle_client(self, reader, writer):
+        self.clients.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    response = {"id": None, "ok": False, "error": "invalid JSON"}
+                else:
+                    response = await self.dispatch(request)
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.clients.discard(writer)
+            writer.close()
+
+    def shutdown(self):
+        if self._stopped is not None:
+            asyncio.get_running_loop().call_soon(self._stopped.set)
+
+    async def serve(self):
+        self._stopped = asyncio.Event()
+        server = await asyncio.start_server(self.handle_client, DAEMON_HOST, self.port)
+        print(f"Audio daemon listening on {DAEMON_HOST}:{self.port}")
+        async with server:
+            await self._stopped.wait()
+            # Connected panels see end of stream instead of their handlers being cancelled
+            for writer in list(self.clients):
+                writer.close()
+            await asyncio.sleep(0.1)
+        self.engine.close()
+        await asyncio.get_running_loop().run_in_executor(self.mixer_executor, self.close_mixer)
+        self.mixer_executor.shutdown(wait=False)
+
+def run_daemon(port=DAEMON_PORT):
+    """Uruchamia demona w bieżącym wątku (bez Tk); kończy się po poleceniu 'shutdown' albo Ctrl+C"""
+    try:
+        asyncio.run(AudioDaemon(port=port).serve())
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        print(f"Error starting audio daemon: {e}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(run_daemon())
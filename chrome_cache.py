@@ -0,0 +1,117 @@
+import tkinter as tk
+import os
+import hashlib
+from collections import OrderedDict
+from app_paths import get_cache_dir
+
+# Zmień przy każdej zmianie wyglądu, żeby stare pliki z dysku nie były używane
+CHROME_CACHE_VERSION = 1
+
+class LRUCache:
+    """Prosty słownik z limitem - najdawniej używane elementy są usuwane jako pierwsze"""
+
+    def __init__(self, max_items=32):
+        self.max_items = max_items
+        self._items = OrderedDict()
+
+    def get(self, key, default=None):
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+
+    def put(self, key, value):
+        self._items[key] = value
+        self._items.move_to_end(key)
+        while len(self._items) > self.max_items:
+            self._items.popitem(last=False)
+
+    def discard(self, key):
+        self._items.pop(key, None)
+
+    def clear(self):
+        self._items.clear()
+
+    def __contains__(self, key):
+        return key in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+def render_chrome(width, height, corner_radius=16, bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0,
+                  margin=20, inner_radius=12, inner_color="#3A3A3C"):
+    """Rysuje tło okna razem z wewnętrznym kontenerem jako jeden obraz RGBA"""
+    # PIL importowany dopiero tutaj - trafienie w cache na dysku go nie potrzebuje
+    from PIL import Image, ImageDraw
+
+    # Bez wygładzania: rogi muszą mieć pełną przezroczystość dla -transparentcolor
+    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle([0, 0, width - 1, height - 1], radius=corner_radius, fill=bg_color,
+                           outline=border_color if border_width > 0 else None, width=max(border_width, 1))
+    if margin * 2 < min(width, height):
+        draw.rounded_rectangle([margin, margin, width - margin - 1, height - margin - 1],
+                               radius=inner_radius, fill=inner_color)
+    return img
+
+class ChromeCache:
+    """Cache wyrenderowanych teł okien: LRU gotowych PhotoImage w pamięci i pliki PNG na dysku"""
+
+    def __init__(self, max_items=16, cache_dir=None):
+        self.memory = LRUCache(max_items)
+        self.cache_dir = cache_dir
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key):
+        if self.cache_dir is None:
+            self.cache_dir = get_cache_dir("chrome")
+        digest = hashlib.sha1(repr((CHROME_CACHE_VERSION, key)).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"chrome_{digest}.png")
+
+    def _save_to_disk(self, image, path):
+        tmp_path = path + ".tmp"
+        try:
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving chrome cache: {e}")
+
+    def get(self, master, width, height, corner_radius=16, bg_color="#1C1C1E", border_color="#2C2C2E", border_width=0,
+            margin=20, inner_radius=12, inner_color="#3A3A3C"):
+        """Zwraca PhotoImage z tłem okna - z pamięci, z dysku albo świeżo wyrenderowany"""
+        key = (width, height, corner_radius, bg_color, border_color, border_width, margin, inner_radius, inner_color)
+        # PhotoImage należy do konkretnego interpretera Tk
+        root = master._root()
+        memory_key = (id(root), key)
+
+        photo = self.memory.get(memory_key)
+        if photo is not None:
+            self.hits += 1
+            return photo
+
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            try:
+                # Tk 8.6 czyta PNG sam, bez dekodowania przez PIL
+                photo = tk.PhotoImage(file=path, master=root)
+                self.disk_hits += 1
+            except tk.TclError:
+                photo = None
+
+        if photo is None:
+            from PIL import ImageTk
+            image = render_chrome(*key)
+            self._save_to_disk(image, path)
+            photo = ImageTk.PhotoImage(image, master=root)
+            self.misses += 1
+
+        self.memory.put(memory_key, photo)
+        return photo
+
+# Wspólny cache dla wszystkich paneli
+chrome_cache = ChromeCache()
+
+def get_chrome_image(master, width, height, **kwargs):
+    return chrome_cache.get(master, width, height, **kwargs)
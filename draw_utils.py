@@ -1,21 +1,56 @@
-
 from tkinter import Canvas
-from PIL import Image, ImageDraw, ImageTk
-
-def draw_rounded_gradient_border(canvas, width, height, radius=20, border_width=4):
-    img = Image.new("RGBA", (width, height), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
-    color1 = (8, 199, 30)
-    color2 = (251, 255, 0)
-    for i in range(border_width):
-        ratio = i / border_width
-        r = int(color1[0] * (1 - ratio) + color2[0] * ratio)
-        g = int(color1[1] * (1 - ratio) + color2[1] * ratio)
-        b = int(color1[2] * (1 - ratio) + color2[2] * ratio)
-        draw.rounded_rectangle(
-            [i, i, width - i - 1, height - i - 1],
-            radius=radius,
-            outline=(r, g, b),
-            width=1
-        )
+import numpy as np
+from PIL import Image, ImageTk
+from gradient_utils import rounded_rect_distance, rounded_rect_distance_at
+
+# Piksel, którego środek jest dalej od krawędzi niż pół przekątnej, jest w całości w środku albo na zewnątrz
+_HALF_PIXEL_DIAGONAL = 0.7072
+
+def rasterize_rounded_gradient_border(width, height, radius=20, border_width=4,
+                                      color1=(8, 199, 30), color2=(251, 255, 0),
+                                      supersample=4, scale=1.0):
+    """Rysuje wygładzony zaokrąglony border z gradientem (od zewnątrz do środka) bez pętli w Pythonie.
+
+    supersample - liczba próbek na piksel w każdej osi, scale - mnożnik dla ekranów HiDPI.
+    """
+    out_w = max(1, int(round(width * scale)))
+    out_h = max(1, int(round(height * scale)))
+    radius = radius * scale
+    border = max(border_width * scale, 1e-6)
+    ss = max(1, int(supersample))
+    c1 = np.asarray(color1, dtype=np.float32)
+    c2 = np.asarray(color2, dtype=np.float32)
+
+    # Jedna próbka na piksel wystarcza wszędzie poza pasem przy krawędziach
+    distance = rounded_rect_distance(out_w, out_h, radius)
+    coverage = ((distance <= 0) & (distance >= -border)).astype(np.float32)
+    depth = np.clip(-distance / border, 0.0, 1.0)
+    rgb = c1 + (c2 - c1) * depth[..., np.newaxis]
+
+    edge_y, edge_x = np.nonzero((np.abs(distance) < _HALF_PIXEL_DIAGONAL) |
+                                (np.abs(distance + border) < _HALF_PIXEL_DIAGONAL))
+    if ss > 1 and edge_y.size:
+        # Próbki ss x ss w środkach podpikseli, tylko dla pikseli na krawędzi
+        offsets = (np.arange(ss, dtype=np.float32) + 0.5) / ss
+        sub_x = (edge_x[:, np.newaxis] + np.tile(offsets, ss)[np.newaxis, :]).astype(np.float32)
+        sub_y = (edge_y[:, np.newaxis] + np.repeat(offsets, ss)[np.newaxis, :]).astype(np.float32)
+        sub_distance = rounded_rect_distance_at(sub_x, sub_y, out_w, out_h, radius)
+
+        sub_coverage = ((sub_distance <= 0) & (sub_distance >= -border)).astype(np.float32)
+        sub_depth = np.clip(-sub_distance / border, 0.0, 1.0)
+        # Kolor mnożony przez pokrycie, żeby uśrednianie nie przyciemniało krawędzi
+        premultiplied = ((c1 + (c2 - c1) * sub_depth[..., np.newaxis]) * sub_coverage[..., np.newaxis]).sum(axis=1)
+        hits = sub_coverage.sum(axis=1)
+
+        coverage[edge_y, edge_x] = hits / (ss * ss)
+        rgb[edge_y, edge_x] = premultiplied / np.maximum(hits, 1)[:, np.newaxis]
+
+    rgba = np.empty((out_h, out_w, 4), dtype=np.uint8)
+    rgba[..., :3] = np.rint(rgb).astype(np.uint8)
+    rgba[..., 3] = np.rint(coverage * 255).astype(np.uint8)
+    return Image.fromarray(rgba, "RGBA")
+
+def draw_rounded_gradient_border(canvas, width, height, radius=20, border_width=4, supersample=4, scale=1.0):
+    img = rasterize_rounded_gradient_border(width, height, radius, border_width,
+                                            supersample=supersample, scale=scale)
     return ImageTk.PhotoImage(img)
@@ -1,5 +1,9 @@
 import tkinter as tk
 from tkinter import ttk
+import numpy as np
+from PIL import Image, ImageTk
+from chrome_cache import get_chrome_image
+from theme import current_theme, ensure_styles, add_theme_listener
 
 def hex_to_rgb(hex_color):
     """Konwertuje kolor hex na RGB"""
@@ -14,54 +18,95 @@ def interpolate_color(color1, color2, factor):
     """Interpoluje między dwoma kolorami RGB"""
     return tuple(c1 + (c2 - c1) * factor for c1, c2 in zip(color1, color2))
 
+def parse_gradient_stops(stops):
+    """Zamienia listę kolorów lub par (pozycja, kolor) na posortowane stopy gradientu"""
+    if len(stops) < 2:
+        raise ValueError("Gradient potrzebuje co najmniej dwóch kolorów")
+    parsed = []
+    for i, stop in enumerate(stops):
+        if isinstance(stop, str):
+            parsed.append((i / (len(stops) - 1), hex_to_rgb(stop)))
+        else:
+            position, color = stop
+            parsed.append((float(position), hex_to_rgb(color) if isinstance(color, str) else tuple(color)))
+    parsed.sort(key=lambda s: s[0])
+    return parsed
+
+def rounded_rect_distance_at(px, py, width, height, corner_radius):
+    """Signed distance dla dowolnych (broadcastowalnych) tablic współrzędnych punktów"""
+    half_w = width / 2.0
+    half_h = height / 2.0
+    radius = min(float(corner_radius), half_w, half_h)
+
+    # Odległość liczona w jednej ćwiartce, reszta wynika z symetrii
+    qx = np.abs(px - half_w) - (half_w - radius)
+    qy = np.abs(py - half_h) - (half_h - radius)
+    outside = np.hypot(np.maximum(qx, 0), np.maximum(qy, 0))
+    inside = np.minimum(np.maximum(qx, qy), 0)
+    return outside + inside - radius
+
+def rounded_rect_distance(width, height, corner_radius, xs=None, ys=None):
+    """Signed distance (w pikselach) od krawędzi zaokrąglonego prostokąta - ujemna w środku"""
+    if xs is None:
+        xs = np.arange(width, dtype=np.float32) + 0.5
+    if ys is None:
+        ys = np.arange(height, dtype=np.float32) + 0.5
+    return rounded_rect_distance_at(xs[np.newaxis, :], ys[:, np.newaxis], width, height, corner_radius)
+
+def gradient_colors(width, height, stops, angle=45):
+    """Liczy tablicę RGB (height x width x 3) dla liniowego gradientu pod zadanym kątem"""
+    parsed = parse_gradient_stops(stops)
+    positions = np.array([p for p, _ in parsed], dtype=np.float32)
+    colors = np.array([c for _, c in parsed], dtype=np.float32)
+
+    # Kąt jak w matematyce: 0 = od lewej do prawej, 90 = od dołu do góry
+    rad = np.deg2rad(angle)
+    dx, dy = np.cos(rad), -np.sin(rad)
+    xs = np.arange(width, dtype=np.float32) + 0.5 - width / 2.0
+    ys = np.arange(height, dtype=np.float32) + 0.5 - height / 2.0
+    extent = abs(width / 2.0 * dx) + abs(height / 2.0 * dy) or 1.0
+    t = (xs[np.newaxis, :] * dx + ys[:, np.newaxis] * dy) / (2 * extent) + 0.5
+    t = np.clip(t, 0.0, 1.0)
+
+    rgb = np.empty((height, width, 3), dtype=np.float32)
+    for channel in range(3):
+        rgb[..., channel] = np.interp(t, positions, colors[:, channel])
+    return rgb
+
+def render_gradient_border(width, height, stops=("#FFB71C", "#FFEE00"), angle=45, border_width=2, corner_radius=0):
+    """Renderuje cały gradient border jako jeden obraz RGBA (PIL)"""
+    distance = rounded_rect_distance(width, height, corner_radius)
+    # Pokrycie piksela liczone z odległości daje wygładzone krawędzie bez pętli w Pythonie
+    coverage = np.clip(0.5 - distance, 0.0, 1.0) * np.clip(distance + border_width + 0.5, 0.0, 1.0)
+
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    rgba[..., :3] = np.rint(gradient_colors(width, height, stops, angle)).astype(np.uint8)
+    rgba[..., 3] = np.rint(coverage * 255).astype(np.uint8)
+    return Image.fromarray(rgba, "RGBA")
+
+def create_gradient_border_image(canvas, width, height, stops=("#FFB71C", "#FFEE00"), angle=45, border_width=2, corner_radius=0):
+    """Umieszcza gradient border na canvas jako jeden element obrazu"""
+    image = render_gradient_border(width, height, stops, angle, border_width, corner_radius)
+    photo = ImageTk.PhotoImage(image, master=canvas)
+    # Trzymaj referencję, inaczej Tk usunie obraz
+    canvas.gradient_border_image = photo
+    canvas.delete("gradient_border")
+    return canvas.create_image(0, 0, image=photo, anchor='nw', tags="gradient_border")
+
 def create_gradient_border(canvas, width, height, color1="#FFB71C", color2="#FFEE00", border_width=2):
     """Tworzy gradient border od lewego dolnego rogu do prawego górnego"""
-    
-    # Konwertuj kolory hex na RGB
-    rgb1 = hex_to_rgb(color1)
-    rgb2 = hex_to_rgb(color2)
-    
-    # Rysuj gradient border
-    # Górna krawędź
-    for i in range(width):
-        factor = i / width
-        color = interpolate_color(rgb1, rgb2, factor)
-        hex_color = rgb_to_hex(color)
-        for j in range(border_width):
-            canvas.create_line(i, j, i+1, j, fill=hex_color, width=1)
-    
-    # Dolna krawędź
-    for i in range(width):
-        factor = i / width
-        color = interpolate_color(rgb1, rgb2, factor)
-        hex_color = rgb_to_hex(color)
-        for j in range(border_width):
-            canvas.create_line(i, height-j-1, i+1, height-j-1, fill=hex_color, width=1)
-    
-    # Prawa krawędź
-    for i in range(height):
-        factor = (height - i) / height
-        color = interpolate_color(rgb1, rgb2, factor)
-        hex_color = rgb_to_hex(color)
-        for j in range(border_width):
-            canvas.create_line(width-j-1, i, width-j-1, i+1, fill=hex_color, width=1)
-    
-    # Lewa krawędź
-    for i in range(height):
-        factor = (height - i) / height
-        color = interpolate_color(rgb1, rgb2, factor)
-        hex_color = rgb_to_hex(color)
-        for j in range(border_width):
-            canvas.create_line(j, i, j, i+1, fill=hex_color, width=1)
-
-def setup_gradient_window(window, width, height, color1="#FFB71C", color2="#FFEE00", border_width=2):
+    return create_gradient_border_image(canvas, width, height, (color1, color2), 45, border_width)
+
+def setup_gradient_window(window, width, height, color1="#FFB71C", color2="#FFEE00", border_width=2,
+                          stops=None, angle=45, corner_radius=0):
     """Konfiguruje okno z gradient border"""
     # Twórz canvas dla gradientu
     canvas = tk.Canvas(window, highlightthickness=0)
     canvas.pack(fill='both', expand=True)
     
-    # Rysuj gradient border
-    create_gradient_border(canvas, width, height, color1, color2, border_width)
+    # Rysuj gradient border jednym obrazem zamiast linii dla każdego piksela
+    create_gradient_border_image(canvas, width, height, stops or (color1, color2), angle,
+                                 border_width, corner_radius)
     
     # Twórz główny kontener wewnątrz
     container = tk.Frame(canvas, bg="#222222")
@@ -138,8 +183,8 @@ def create_macos_rounded_window(canvas, width, height, corner_radius=12, bg_colo
                               corner_x + corner_radius, corner_y + corner_radius,
                               outline=border_color, width=border_width, fill="")
 
-def setup_macos_window(window, width, height, corner_radius=12, bg_color="#2C2C2E", border_color="#3A3A3C", border_width=1):
-    """Konfiguruje okno w stylu macOS z zaokrąglonymi rogami"""
+def _create_transparent_canvas(window):
+    """Tworzy canvas, którego tło (rogi okna) jest przezroczyste"""
     # Ustaw przezroczystość dla rogów
     try:
         window.wm_attributes("-transparentcolor", "SystemButtonFace")
@@ -153,6 +198,11 @@ def setup_macos_window(window, width, height, corner_radius=12, bg_color="#2C2C2
     except:
         canvas = tk.Canvas(window, highlightthickness=0, bg='#2F2F2F')
     canvas.pack(fill='both', expand=True)
+    return canvas
+
+def setup_macos_window(window, width, height, corner_radius=12, bg_color="#2C2C2E", border_color="#3A3A3C", border_width=1):
+    """Konfiguruje okno w stylu macOS z zaokrąglonymi rogami"""
+    canvas = _create_transparent_canvas(window)
     
     # Rysuj zaokrąglone okno
     create_macos_rounded_window(canvas, width, height, corner_radius, bg_color, border_color, border_width)
@@ -164,6 +214,41 @@ def setup_macos_window(window, width, height, corner_radius=12, bg_color="#2C2C2
     
     return canvas, container
 
+def setup_macos_panel(window, width, height, corner_radius=16, bg_color=None, border_color=None, border_width=0,
+                      margin=20, inner_radius=12, inner_color=None):
+    """Jak setup_macos_window + create_rounded_inner_container, ale tło jest jednym obrazem z cache.
+    Kolory, które nie zostały podane, pochodzą z aktualnego motywu i zmieniają się razem z nim."""
+    canvas = _create_transparent_canvas(window)
+    explicit = {k: v for k, v in (("bg_color", bg_color), ("border_color", border_color),
+                                  ("inner_color", inner_color)) if v is not None}
+    
+    def chrome_image(theme):
+        # Gotowe tło z cache - drugie okno o tym samym rozmiarze nic nie rysuje od nowa
+        return get_chrome_image(window, width, height, corner_radius=corner_radius, border_width=border_width,
+                                margin=margin, inner_radius=inner_radius, **{**theme.chrome, **explicit})
+    
+    theme = current_theme()
+    canvas.chrome_image = chrome_image(theme)
+    canvas.create_image(0, 0, image=canvas.chrome_image, anchor='nw', tags="chrome")
+    
+    # Twórz kontener wewnątrz
+    container = tk.Frame(canvas, bg=bg_color or theme.chrome["bg_color"])
+    canvas.create_window(8, 8, window=container, anchor='nw', 
+                        width=width-16, height=height-16)
+    
+    def refresh_chrome(theme):
+        if not canvas.winfo_exists():
+            return False
+        canvas.chrome_image = chrome_image(theme)
+        canvas.itemconfigure("chrome", image=canvas.chrome_image)
+        if bg_color is None:
+            container.configure(bg=theme.chrome["bg_color"])
+    
+    if len(explicit) < 3:
+        add_theme_listener(refresh_chrome)
+    
+    return canvas, container
+
 def create_rounded_inner_container(parent_canvas, x, y, width, height, corner_radius=12, bg_color="#3A3A3C"):
     """Tworzy prawdziwie zaokrąglony kontener wewnętrzny na canvas"""
     
@@ -189,36 +274,6 @@ def create_rounded_inner_container(parent_canvas, x, y, width, height, corner_ra
                                  corner_x + corner_radius, corner_y + corner_radius,
                                  fill=bg_color, outline="", tags="inner_container")
 
-def configure_ttk_styles():
-    """Konfiguruje style TTK dla lepszego wyglądu suwaków"""
-    style = ttk.Style()
-    
-    # Skonfiguruj styl dla Scale (suwaka)
-    style.configure("Gray.Horizontal.TScale", 
-                   background='#5A5A5C',      # Jasno szare tło
-                   troughcolor='#5A5A5C',     # Kolor ścieżki suwaka
-                   lightcolor='#5A5A5C',      # Jasny kolor obramowania
-                   darkcolor='#3A3A3C',       # Ciemny kolor obramowania
-                   bordercolor='#5A5A5C',     # Kolor obramowania
-                   focuscolor='#007AFF')      # Kolor przy focus
-    
-    # Mapowanie dla różnych stanów
-    style.map("Gray.Horizontal.TScale",
-             background=[('active', '#6A6A6C'), ('pressed', '#4A4A4C')],
-             troughcolor=[('active', '#6A6A6C'), ('pressed', '#4A4A4C')])
-    
-    # Skonfiguruj styl dla Scrollbar (pasek przewijania)
-    style.configure("Gray.Vertical.TScrollbar",
-                   background='#5A5A5C',      # Jasno szare tło
-                   troughcolor='#3A3A3C',     # Ciemniejsze tło ścieżki
-                   bordercolor='#5A5A5C',     # Kolor obramowania
-                   arrowcolor='#FFFFFF',      # Kolor strzałek
-                   lightcolor='#6A6A6C',      # Jasny kolor 3D
-                   darkcolor='#3A3A3C')       # Ciemny kolor 3D
-    
-    # Mapowanie dla różnych stanów scrollbara
-    style.map("Gray.Vertical.TScrollbar",
-             background=[('active', '#6A6A6C'), ('pressed', '#4A4A4C')],
-             arrowcolor=[('active', '#FFFFFF'), ('pressed', '#CCCCCC')])
-    
-    return style
+def configure_ttk_styles(master=None):
+    """Konfiguruje style TTK dla lepszego wyglądu suwaków (tylko raz na interpreter Tk)"""
+    return ensure_styles(master)
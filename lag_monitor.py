@@ -0,0 +1,163 @@
+import tkinter as tk
+from tkinter import filedialog
+import os
+import sys
+import json
+import time
+import logging
+import threading
+import traceback
+from collections import deque
+from app_paths import get_data_dir
+from theme import themed
+
+logger = logging.getLogger("lag_monitor")
+
+def _percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+class LagMonitor:
+    """Mierzy opóźnienia pętli Tk heartbeatem z after() i zrzuca stosy wątków, gdy UI stoi.
+
+    Heartbeat co interval_ms zapisuje, o ile później niż planowo został wywołany.
+    Wątek watchdog sprawdza, kiedy był ostatni heartbeat - jeśli dawniej niż
+    stall_threshold sekund, zapisuje stosy wszystkich wątków do logu.
+    """
+
+    def __init__(self, root, interval_ms=25, stall_threshold=1.0, max_samples=20000, log_path=None):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_threshold = stall_threshold
+        self.samples = deque(maxlen=max_samples)
+        self.log_path = log_path or os.path.join(get_data_dir("logs"), "ui_hangs.log")
+        self.stalls = 0
+        self.max_lag = 0.0
+        self.last_beat = time.perf_counter()
+        self._expected = None
+        self._after_id = None
+        self._running = threading.Event()
+        self._stop = threading.Event()
+        self._watchdog_thread = None
+        self._stall_reported = False
+
+    def start(self):
+        if not logger.handlers:
+            handler = logging.FileHandler(self.log_path, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+            logger.addHandler(handler)
+            logger.setLevel(logging.INFO)
+        self.resume()
+        if self._watchdog_thread is None:
+            self._watchdog_thread = threading.Thread(target=self._watchdog, daemon=True)
+            self._watchdog_thread.start()
+
+    def pause(self):
+        """Zatrzymuje heartbeat i watchdog (np. gdy panel boczny jest zwinięty)"""
+        self._running.clear()
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def resume(self):
+        if self._running.is_set():
+            return
+        self.last_beat = time.perf_counter()
+        self._expected = self.last_beat + self.interval_ms / 1000.0
+        self._running.set()
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def stop(self):
+        self.pause()
+        self._stop.set()
+        self._running.set()  # obudź watchdog, żeby mógł się zakończyć
+
+    def _beat(self):
+        now = time.perf_counter()
+        lag = max(0.0, now - self._expected)
+        self.samples.append(lag)
+        if lag > self.max_lag:
+            self.max_lag = lag
+        self.last_beat = now
+        self._stall_reported = False
+        self._expected = now + self.interval_ms / 1000.0
+        self._after_id = self.root.after(self.interval_ms, self._beat)
+
+    def _watchdog(self):
+        main_id = threading.main_thread().ident
+        while not self._stop.is_set():
+            # Uśpiony (zero pracy), dopóki monitor jest wstrzymany
+            self._running.wait()
+            if self._stop.wait(self.stall_threshold / 4):
+                break
+            if not self._running.is_set() or self._stall_reported:
+                continue
+            stalled_for = time.perf_counter() - self.last_beat
+            if stalled_for > self.stall_threshold:
+                self._stall_reported = True
+                self.stalls += 1
+                self._dump_stacks(stalled_for, main_id)
+
+    def _dump_stacks(self, stalled_for, main_id):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        lines = [f"UI thread stalled for {stalled_for:.2f}s"]
+        for thread_id, frame in sys._current_frames().items():
+            marker = " (Tk)" if thread_id == main_id else ""
+            lines.append(f"--- Thread {names.get(thread_id, thread_id)}{marker} ---")
+            lines.extend(line.rstrip() for line in traceback.format_stack(frame))
+        logger.info("\n".join(lines))
+
+    def stats(self):
+        values = sorted(self.samples)
+        return {
+            "samples": len(values),
+            "interval_ms": self.interval_ms,
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(self.max_lag * 1000, 2),
+            "stalls": self.stalls,
+            "stall_threshold_s": self.stall_threshold,
+            "log_path": self.log_path,
+        }
+
+    def export_json(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.stats(), f, indent=2)
+
+class DiagnosticsWindow(tk.Toplevel):
+    """Ukryty widok statystyk monitora (Ctrl+Shift+D)"""
+
+    def __init__(self, master, monitor):
+        super().__init__(master)
+        self.monitor = monitor
+        self.title("Diagnostyka")
+        self.attributes('-topmost', True)
+        self.geometry("320x260+400+10")
+
+        frame = themed(tk.Frame, self, "content")
+        frame.pack(fill="both", expand=True)
+        self.stats_label = themed(tk.Label, frame, "label", font=("Consolas", 10), justify="left", anchor="nw")
+        self.stats_label.pack(fill="both", expand=True, padx=10, pady=10)
+
+        buttons = themed(tk.Frame, frame, "content")
+        buttons.pack(fill="x", padx=10, pady=(0, 10))
+        themed(tk.Button, buttons, "button", text="Eksport JSON", command=self.export).pack(side="left")
+        themed(tk.Button, buttons, "button", text="Zamknij", command=self.destroy).pack(side="right")
+        self.refresh()
+
+    def refresh(self):
+        if not self.winfo_exists():
+            return
+        stats = self.monitor.stats()
+        self.stats_label.config(text="\n".join(f"{key:<18} {value}" for key, value in stats.items()
+                                               if key != "log_path"))
+        self.after(1000, self.refresh)
+
+    def export(self):
+        path = filedialog.asksaveasfilename(parent=self, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")], initialfile="lag_stats.json")
+        if path:
+            self.monitor.export_json(path)
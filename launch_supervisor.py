@@ -0,0 +1,359 @@
+import logging
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from app_paths import get_data_dir
+
+# Co ile sekund wątek sprzątający sprawdza, czy uruchomione programy jeszcze działają
+REAP_INTERVAL = 0.5
+# Ile zakończonych uruchomień pamiętać
+LAUNCH_HISTORY_SIZE = 100
+# Grupa: program zajmuje miejsce "w trakcie startu", aż pokaże okno albo minie tyle sekund
+GROUP_SETTLE_SECONDS = 5.0
+
+# Znaki, dla których polecenie musi przejść przez powłokę
+_SHELL_CHARS = "|&;<>$`*?"
+
+logger = logging.getLogger("launch_supervisor")
+
+def _setup_logger():
+    if not logger.handlers:
+        handler = logging.FileHandler(os.path.join(get_data_dir("logs"), "launches.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+def _shell_execute(path):
+    """Windows: otwiera skrót/dokument jak Explorer; PID procesu albo None, jeśli system go nie podał"""
+    import ctypes
+    from ctypes import wintypes
+
+    class SHELLEXECUTEINFOW(ctypes.Structure):
+        _fields_ = [("cbSize", wintypes.DWORD), ("fMask", ctypes.c_ulong), ("hwnd", wintypes.HWND),
+                    ("lpVerb", wintypes.LPCWSTR), ("lpFile", wintypes.LPCWSTR),
+                    ("lpParameters", wintypes.LPCWSTR), ("lpDirectory", wintypes.LPCWSTR),
+                    ("nShow", ctypes.c_int), ("hInstApp", wintypes.HINSTANCE), ("lpIDList", ctypes.c_void_p),
+                    ("lpClass", wintypes.LPCWSTR), ("hkeyClass", wintypes.HKEY), ("dwHotKey", wintypes.DWORD),
+                    ("hIconOrMonitor", wintypes.HANDLE), ("hProcess", wintypes.HANDLE)]
+
+    SEE_MASK_NOCLOSEPROCESS = 0x40
+    SW_SHOWNORMAL = 1
+    info = SHELLEXECUTEINFOW()
+    info.cbSize = ctypes.sizeof(info)
+    info.fMask = SEE_MASK_NOCLOSEPROCESS
+    info.lpVerb = "open"
+    info.lpFile = path
+    info.lpDirectory = os.path.dirname(path) or None
+    info.nShow = SW_SHOWNORMAL
+    if not ctypes.windll.shell32.ShellExecuteExW(ctypes.byref(info)):
+        raise ctypes.WinError()
+    if not info.hProcess:
+        # Handed over to an already running program (DDE) - nothing to track
+        return None
+    pid = ctypes.windll.kernel32.GetProcessId(info.hProcess)
+    ctypes.windll.kernel32.CloseHandle(info.hProcess)
+    return pid or None
+
+def _split_windows(command):
+    """Linia poleceń Windows -> lista argumentów (cudzysłowy usunięte); pusta lista przy błędzie"""
+    try:
+        args = shlex.split(command, posix=False)
+    except ValueError:
+        return []
+    return [arg[1:-1] if len(arg) > 1 and arg[0] == arg[-1] == '"' else arg for arg in args]
+
+def spawn(path):
+    """Uruchamia wpis bez pośredniczącej powłoki, jeśli się da; (Popen albo None, PID albo None)"""
+    detached = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if sys.platform == "win32":
+        if path.lower().endswith(".exe") and os.path.isfile(path):
+            process = subprocess.Popen([path], cwd=os.path.dirname(path) or None, **detached)
+            return process, process.pid
+        if not os.path.exists(path):
+            # A command line such as C:\Tools\x.exe --profile work
+            args = _split_windows(path)
+            if args and (os.path.isfile(args[0]) or shutil.which(args[0])):
+                cwd = os.path.dirname(args[0]) if os.path.isfile(args[0]) else None
+                process = subprocess.Popen(args, cwd=cwd or None, **detached)
+                return process, process.pid
+        # .lnk, documents, URLs
+        return None, _shell_execute(path)
+
+    # Own session - closing the panel does not take launched programs with it
+    detached["start_new_session"] = True
+    if os.path.isfile(path):
+        if os.access(path, os.X_OK):
+            process = subprocess.Popen([path], cwd=os.path.dirname(path) or None, **detached)
+        else:
+            opener = "open" if sys.platform == "darwin" else "xdg-open"
+            process = subprocess.Popen([opener, path], **detached)
+        return process, process.pid
+    # A command line, e.g. Exec= from a .desktop file; pipes and redirections still need the shell
+    try:
+        args = [] if any(char in path for char in _SHELL_CHARS) else shlex.split(path)
+    except ValueError:
+        args = []
+    if args and shutil.which(args[0]):
+        process = subprocess.Popen(args, **detached)
+    else:
+        process = subprocess.Popen(path, shell=True, **detached)
+    return process, process.pid
+
+def _process_tree(pids):
+    """PID-y razem z procesami potomnymi - okno ma często proces uruchomiony przez launcher programu"""
+    try:
+        import psutil
+    except ImportError:
+        return set(pids)
+    tree = set(pids)
+    for pid in pids:
+        try:
+            tree.update(child.pid for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            continue
+    return tree
+
+def _find_window(pids):
+    """Windows: pierwsze widoczne okno główne jednego z procesów albo None"""
+    import ctypes
+    from ctypes import wintypes
+
+    user32 = ctypes.windll.user32
+    GW_OWNER = 4
+    found = []
+
+    @ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+    def visit(hwnd, lparam):
+        if user32.IsWindowVisible(hwnd) and not user32.GetWindow(hwnd, GW_OWNER):
+            pid = wintypes.DWORD()
+            user32.GetWindowThreadProcessId(hwnd, ctypes.byref(pid))
+            if pid.value in pids:
+                found.append(hwnd)
+                return False
+        return True
+
+    user32.EnumWindows(visit, 0)
+    return found[0] if found else None
+
+def _focus_windows(pids):
+    import ctypes
+
+    user32 = ctypes.windll.user32
+    SW_RESTORE = 9
+    hwnd = _find_window(pids)
+    if hwnd is None:
+        return False
+    if user32.IsIconic(hwnd):
+        user32.ShowWindow(hwnd, SW_RESTORE)
+    return bool(user32.SetForegroundWindow(hwnd))
+
+def _focus_xdotool(pids):
+    if shutil.which("xdotool") is None:
+        return False
+    for pid in pids:
+        result = subprocess.run(["xdotool", "search", "--onlyvisible", "--pid", str(pid)],
+                                capture_output=True, text=True)
+        windows = result.stdout.split()
+        if windows:
+            return subprocess.run(["xdotool", "windowactivate", windows[0]], capture_output=True).returncode == 0
+    return False
+
+def focus_pids(pids):
+    """Przenosi na wierzch okno jednego z procesów; False, jeśli żadnego okna nie znaleziono"""
+    pids = _process_tree(pids)
+    try:
+        if sys.platform == "win32":
+            return _focus_windows(pids)
+        return _focus_xdotool(pids)
+    except OSError as e:
+        print(f"Error focusing window: {e}")
+        return False
+
+class LaunchRecord:
+    """Jedno uruchomienie: kiedy, ile trwało utworzenie procesu, z jakim kodem się zakończył"""
+
+    def __init__(self, entry_id, path, process, pid, latency):
+        self.entry_id = entry_id
+        self.path = path
+        self.process = process
+        self.pid = pid
+        self.latency = latency
+        self.started = time.monotonic()
+        self.exit_code = None
+        self.ended = None
+        self._watch = None
+        if process is None and pid is not None:
+            # Not our child (ShellExecuteEx) - psutil guards against the PID being reused
+            try:
+                import psutil
+                self._watch = psutil.Process(pid)
+            except Exception:
+                self._watch = None
+
+    def tracked(self):
+        return self.process is not None or self._watch is not None
+
+    def exited(self):
+        """Jak poll(), ale bez zapisywania wyniku - dla wątków innych niż sprzątający"""
+        if self.process is not None:
+            return self.process.poll() is not None
+        return self.ended is not None
+
+    def poll(self):
+        """True, jeśli proces się zakończył (wtedy ustawia exit_code i ended)"""
+        if self.process is not None:
+            # poll() also reaps the child, so no zombies are left behind
+            code = self.process.poll()
+            if code is None:
+                return False
+            self.exit_code = code
+        else:
+            try:
+                if self._watch.is_running():
+                    return False
+            except Exception:
+                pass
+        self.ended = time.monotonic()
+        return True
+
+class LaunchSupervisor:
+    """Uruchamia wpisy launchera i pilnuje ich procesów.
+
+    Wątek sprzątający działa tylko wtedy, gdy jakiś proces jest śledzony. on_change(entry_id)
+    jest wołany z tego wątku po zakończeniu procesu - panel musi przenieść to do wątku Tk.
+    """
+
+    def __init__(self, on_change=None):
+        self.on_change = on_change
+        self.lock = threading.Lock()
+        # id wpisu -> uruchomienia, których procesy jeszcze działają
+        self.running = {}
+        self.finished = deque(maxlen=LAUNCH_HISTORY_SIZE)
+        self.closing = False
+        self.wake = threading.Event()
+        self.thread = None
+
+    def launch(self, entry_id, path):
+        """Zwraca LaunchRecord; błąd uruchomienia (OSError) trafia do wołającego"""
+        start = time.perf_counter()
+        process, pid = spawn(path)
+        record = LaunchRecord(entry_id, path, process, pid, time.perf_counter() - start)
+        _setup_logger()
+        logger.info(f"launched {path} pid={pid} in {record.latency * 1000:.1f} ms")
+        if record.tracked():
+            with self.lock:
+                self.running.setdefault(entry_id, []).append(record)
+                if self.thread is None:
+                    self.thread = threading.Thread(target=self._reap, name="launch-reaper", daemon=True)
+                    self.thread.start()
+        return record
+
+    def is_running(self, entry_id):
+        with self.lock:
+            return bool(self.running.get(entry_id))
+
+    def focus(self, entry_id):
+        """Okno działającego programu na wierzch zamiast drugiej kopii; False, jeśli się nie udało"""
+        with self.lock:
+            pids = [record.pid for record in self.running.get(entry_id, ()) if record.pid]
+        return bool(pids) and focus_pids(pids)
+
+    def launch_group(self, entries, concurrency=2, stagger=1.0, settle=GROUP_SETTLE_SECONDS, progress=None):
+        """Uruchamia kilka wpisów we własnym wątku, najwyżej concurrency naraz i nie częściej niż co stagger s.
+
+        entries: [(id wpisu, ścieżka)]. progress(id, stan, szczegóły) jest wołany z wątków grupy:
+        "waiting", "starting", "started" (sekundy od startu grupy), "failed" (komunikat błędu),
+        na końcu progress(None, "done", sekundy całej grupy).
+        """
+        thread = threading.Thread(target=self._run_group, name="launch-group", daemon=True,
+                                  args=(list(entries), max(1, concurrency), max(0.0, stagger), settle,
+                                        progress or (lambda entry_id, state, detail: None)))
+        thread.start()
+        return thread
+
+    def _run_group(self, entries, concurrency, stagger, settle, progress):
+        group_start = time.monotonic()
+        # A slot is held while a program is still starting - cold starts do not all hit the disk at once
+        slots = threading.BoundedSemaphore(concurrency)
+        settling = []
+        last_start = None
+        for entry_id, _path in entries:
+            progress(entry_id, "waiting", None)
+        for entry_id, path in entries:
+            slots.acquire()
+            if last_start is not None:
+                time.sleep(max(0.0, last_start + stagger - time.monotonic()))
+            last_start = time.monotonic()
+            progress(entry_id, "starting", None)
+            try:
+                record = self.launch(entry_id, path)
+            except Exception as e:
+                progress(entry_id, "failed", str(e))
+                slots.release()
+                continue
+            thread = threading.Thread(target=self._settle, name="launch-settle", daemon=True,
+                                      args=(record, settle, slots, progress, group_start))
+            thread.start()
+            settling.append(thread)
+        for thread in settling:
+            thread.join()
+        total = time.monotonic() - group_start
+        _setup_logger()
+        logger.info(f"group of {len(entries)} started in {total:.1f} s")
+        progress(None, "done", total)
+
+    def _settle(self, record, settle, slots, progress, group_start):
+        """Czeka, aż program pokaże okno (tylko Windows), zakończy się albo minie settle sekund"""
+        deadline = record.started + settle
+        try:
+            while time.monotonic() < deadline and record.tracked() and not record.exited():
+                if sys.platform == "win32" and record.pid and _find_window(_process_tree([record.pid])):
+                    break
+                time.sleep(0.2)
+        except OSError:
+            pass
+        finally:
+            slots.release()
+        code = record.process.returncode if record.process is not None else None
+        if code:
+            progress(record.entry_id, "failed", f"exit code {code}")
+        else:
+            progress(record.entry_id, "started", time.monotonic() - group_start)
+
+    def stop(self):
+        """Kończy tylko wątek sprzątający - uruchomione programy działają dalej"""
+        self.closing = True
+        self.wake.set()
+
+    def _reap(self):
+        while not self.closing:
+            changed = []
+            with self.lock:
+                for entry_id, records in list(self.running.items()):
+                    alive = [record for record in records if not record.poll()]
+                    for record in records:
+                        if record.ended is not None:
+                            self.finished.append(record)
+                            logger.info(f"exited {record.path} pid={record.pid} code={record.exit_code} "
+                                        f"after {record.ended - record.started:.1f} s")
+                    if len(alive) != len(records):
+                        changed.append(entry_id)
+                    if alive:
+                        self.running[entry_id] = alive
+                    else:
+                        del self.running[entry_id]
+                idle = not self.running
+                if idle:
+                    # Decided under the lock, so a launch right now starts a new reaper
+                    self.thread = None
+            for entry_id in changed:
+                if self.on_change is not None:
+                    self.on_change(entry_id)
+            if idle:
+                return
+            self.wake.wait(REAP_INTERVAL)
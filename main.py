@@ -1,9 +1,76 @@
+import time
+STARTUP_T0 = time.perf_counter()
+
+import queue
+import sys
+from single_instance import InstanceServer, command_from_argv, forward_to_running_instance
+
+IPC_VERBS = {'show', 'quit', 'open', 'hide', 'toggle', 'next', 'previous', 'play'}
+# Polecenia od kolejnych uruchomień - wkładane z wątku serwera, wykonywane w wątku Tk
+incoming_commands = queue.Queue()
+
+def accept_command(command):
+    """Wołane z wątku serwera IPC - tylko kolejka, bez Tk; działa też zanim Tk wystartuje"""
+    words = command.lower().split()
+    if not words or words[0] not in IPC_VERBS:
+        return "ERR unknown command"
+    incoming_commands.put(words)
+    return "OK"
+
+# Tryb demona: odtwarzanie i mikser bez Tk, panele łączą się z nim jako klienci
+if __name__ == "__main__" and "--daemon" in sys.argv:
+    from audio_daemon import run_daemon
+    sys.exit(run_daemon())
+
+# Najpierw próba zajęcia portu - pierwsza instancja nie czeka na połączenie, którego nikt nie odbierze.
+# Tylko przy zajętym porcie polecenie idzie do działającej instancji, a ta kończy się przed importem Tk
+instance_server = None
+if __name__ == "__main__":
+    instance_server = InstanceServer(accept_command)
+    if not instance_server.start() and forward_to_running_instance(sys.argv[1:]):
+        sys.exit(0)
+
 import tkinter as tk
 from ctypes import windll, Structure, c_long, byref
-from VolumeMixer import VolumeMixer
-from AppLauncher import AppLauncher
-from MusicPlayer import MusicPlayer
-from Saper import Saper
+from typing import TYPE_CHECKING
+from theme import ensure_styles
+from panel_registry import PanelRegistry
+from lag_monitor import LagMonitor, DiagnosticsWindow
+
+if TYPE_CHECKING:
+    # Nigdy nie wykonywane - tylko po to, żeby PyInstaller spakował moduły ładowane przez importlib
+    import VolumeMixer, AppLauncher, MusicPlayer, Saper
+
+# Panele (razem z pygame, pycaw/comtypes i PIL) importowane dopiero przy pierwszym kliknięciu
+# klucz, moduł, klasa, napis na przycisku, kolor przycisku
+PANELS = (
+    ('mixer', 'VolumeMixer', 'VolumeMixer', "Mikser Głośności", "green"),
+    ('launcher', 'AppLauncher', 'AppLauncher', "Aplikacje", "blue"),
+    ('music', 'MusicPlayer', 'MusicPlayer', "Odtwarzacz Muzyki", "purple"),
+    ('saper', 'Saper', 'Saper', "Saper", "orange"),
+)
+
+# Panele budowane ukryte zaraz po starcie
+PREBUILT_PANELS = ('mixer', 'music')
+# Limit rozmiaru puli (w widgetach) - powyżej niego znikają najdawniej używane ukryte panele
+PANEL_POOL_MAX_WIDGETS = 3000
+
+# Polecenia dla odtwarzacza przyjmowane od kolejnych uruchomień
+MUSIC_COMMANDS = {
+    'next track': 'next_song',
+    'previous track': 'previous_song',
+    'play pause': 'toggle_play_pause',
+}
+# Co ile ms wątek Tk odbiera polecenia z kolejki (wątek serwera IPC nie dotyka Tk)
+COMMAND_POLL_MS = 100
+
+# Czasy startu w sekundach: nazwa etapu -> czas
+startup_timings = {'main imports': time.perf_counter() - STARTUP_T0}
+
+def print_startup_report():
+    print("Startup timing:")
+    for name, seconds in startup_timings.items():
+        print(f"  {name:<24} {seconds * 1000:8.1f} ms")
 
 # Pomocnicza struktura RECT z Windows API
 class RECT(Structure):
@@ -22,19 +89,22 @@ def get_taskbar_height():
     return 40  # domyślnie, jeśli coś pójdzie nie tak
 
 class App(tk.Tk):
-    def __init__(self):
+    def __init__(self, warmup=False, timing=False, lag_monitor=True):
+        tk_start = time.perf_counter()
         super().__init__()
+        startup_timings['Tk init'] = time.perf_counter() - tk_start
+        self.timing = timing
         self.overrideredirect(True)
         self.attributes('-topmost', True)
         self.is_collapsed = False
 
-        # Singleton pattern - track open windows
-        self.open_windows = {
-            'mixer': None,
-            'launcher': None,
-            'music': None,
-            'saper': None
-        }
+        # Style TTK rejestrowane raz dla całego interpretera - panele już ich nie konfigurują
+        ensure_styles(self)
+
+        # Rejestr paneli - leniwe ładowanie, pula schowanych okien i hooki cyklu życia
+        self.panels = PanelRegistry(self, timings=startup_timings, max_widgets=PANEL_POOL_MAX_WIDGETS)
+        for spec in PANELS:
+            self.panels.register(*spec)
 
         # Konfiguracja szerokości
         self.panel_width = 380
@@ -76,6 +146,51 @@ class App(tk.Tk):
 
         self.build_ui()
 
+        # Monitor opóźnień pętli Tk - statystyki pod Ctrl+Shift+D, zawieszenia UI trafiają do logu
+        self.lag_monitor = LagMonitor(self) if lag_monitor else None
+        if self.lag_monitor:
+            self.panels.add_suspend_listener(self.lag_monitor.pause, self.lag_monitor.resume)
+            self.bind_all("<Control-Shift-D>", self.open_diagnostics)
+
+        # Pierwsza klatka, potem (opcjonalnie) import paneli w tle, gdy UI nic nie robi
+        self.after_idle(self._on_first_frame)
+        self.after(COMMAND_POLL_MS, self._poll_commands)
+        self._warmup_queue = list(self.panels.specs) if warmup else []
+
+    def _on_first_frame(self):
+        startup_timings['first frame'] = time.perf_counter() - STARTUP_T0
+        if self.lag_monitor:
+            self.lag_monitor.start()
+        # Raport --timing dopiero po budowie paneli w tle i rozgrzewce - one też należą do startu
+        self._startup_stages = 2 if self._warmup_queue else 1
+        # Mikser i odtwarzacz budowane w tle, żeby otwierały się od razu
+        self.panels.pool.prebuild(PREBUILT_PANELS, delay=1000, on_done=self._on_prebuilt)
+        if self._warmup_queue:
+            self.after(500, self._warmup_step)
+
+    def _on_prebuilt(self):
+        startup_timings['prebuilt panels'] = time.perf_counter() - STARTUP_T0
+        self._startup_stage_done()
+
+    def _startup_stage_done(self):
+        self._startup_stages -= 1
+        if self._startup_stages == 0 and self.timing:
+            print_startup_report()
+
+    def _warmup_step(self):
+        """Importuje jeden panel na raz, żeby nie blokować pętli Tk na dłużej"""
+        # Importy zostają w wątku Tk - comtypes inicjalizuje COM w wątku, który go importuje
+        key = self._warmup_queue.pop(0)
+        try:
+            self.panels.load_class(key)
+        except Exception as e:
+            print(f"Warm-up of {key} failed: {e}")
+        if self._warmup_queue:
+            self.after(50, self._warmup_step)
+        else:
+            startup_timings['warm-up'] = time.perf_counter() - STARTUP_T0
+            self._startup_stage_done()
+
     # def start_move(self, event): # Dragowanie
     #     self.x = event.x
     #     self.y = event.y
@@ -93,33 +208,15 @@ class App(tk.Tk):
         button_height = 1  # Niższa wysokość w jednostkach tekstu
         button_spacing = 20  # 20px odstępu między przyciskami
         
-        self.mixer_button = tk.Button(
-            self.container, text="Mikser Głośności", command=self.open_mixer,
-            bg="green", fg="white", font=("Arial", 16),
-            width=button_width, height=button_height
-        )
-        self.mixer_button.pack(pady=(150, button_spacing//2))
-
-        self.app_launcher_button = tk.Button(
-            self.container, text="Aplikacje", command=self.open_app_launcher,
-            bg="blue", fg="white", font=("Arial", 16),
-            width=button_width, height=button_height
-        )
-        self.app_launcher_button.pack(pady=button_spacing//2)
-
-        self.music_player_button = tk.Button(
-            self.container, text="Odtwarzacz Muzyki", command=self.open_music_player,
-            bg="purple", fg="white", font=("Arial", 16),
-            width=button_width, height=button_height
-        )
-        self.music_player_button.pack(pady=button_spacing//2)
-
-        self.saper_button = tk.Button(
-            self.container, text="Saper", command=self.open_saper,
-            bg="orange", fg="white", font=("Arial", 16),
-            width=button_width, height=button_height
-        )
-        self.saper_button.pack(pady=button_spacing//2)
+        self.panel_buttons = {}
+        for i, spec in enumerate(self.panels.specs.values()):
+            button = tk.Button(
+                self.container, text=spec.label, command=lambda key=spec.key: self.open_panel(key),
+                bg=spec.color, fg="white", font=("Arial", 16),
+                width=button_width, height=button_height
+            )
+            button.pack(pady=(150 if i == 0 else button_spacing//2, button_spacing//2))
+            self.panel_buttons[spec.key] = button
 
     def toggle_panel(self):
         if self.is_collapsed:
@@ -129,74 +226,72 @@ class App(tk.Tk):
             self.canvas.itemconfigure(self.canvas_container, width=self.panel_width)
             self.toggle_area.place(x=self.panel_width, y=0, width=self.toggle_area_width, height=self.usable_height)
             self.toggle_btn.config(text="⇤")
+            self.panels.resume_all()
         else:
             # Zwiń
             self.geometry(f"{self.collapsed_width}x{self.usable_height}+0+0")
             self.canvas.itemconfigure(self.canvas_container, state='hidden')
             self.toggle_area.place(x=0, y=0, width=self.toggle_area_width, height=self.usable_height)
             self.toggle_btn.config(text="⇥")
+            # Zwinięty panel chowa okna i usypia ich pracę w tle
+            self.panels.suspend_all()
         self.is_collapsed = not self.is_collapsed
 
-    def open_mixer(self):
-        # Check if window already exists and is still valid
-        try:
-            if self.open_windows['mixer'] and self.open_windows['mixer'].winfo_exists():
-                # Bring existing window to front
-                self.open_windows['mixer'].lift()
-                self.open_windows['mixer'].focus_force()
-                return
-        except tk.TclError:
-            # Window was destroyed, clear reference
-            self.open_windows['mixer'] = None
-        
-        # Create new window and store reference
-        self.open_windows['mixer'] = VolumeMixer(self)
+    def open_panel(self, key):
+        self.panels.open(key)
 
-    def open_app_launcher(self):
-        # Check if window already exists and is still valid
-        try:
-            if self.open_windows['launcher'] and self.open_windows['launcher'].winfo_exists():
-                # Bring existing window to front
-                self.open_windows['launcher'].lift()
-                self.open_windows['launcher'].focus_force()
-                return
-        except tk.TclError:
-            # Window was destroyed, clear reference
-            self.open_windows['launcher'] = None
-        
-        # Create new window and store reference
-        self.open_windows['launcher'] = AppLauncher(self)
+    def queue_command(self, command):
+        """Bezpieczne z dowolnego wątku - polecenie wykona się w wątku Tk przy następnym odbiorze"""
+        return accept_command(command)
 
-    def open_music_player(self):
-        # Check if window already exists and is still valid
-        try:
-            if self.open_windows['music'] and self.open_windows['music'].winfo_exists():
-                # Bring existing window to front
-                self.open_windows['music'].lift()
-                self.open_windows['music'].focus_force()
-                return
-        except tk.TclError:
-            # Window was destroyed, clear reference
-            self.open_windows['music'] = None
-        
-        # Create new window and store reference
-        self.open_windows['music'] = MusicPlayer(self)
+    def _poll_commands(self):
+        while True:
+            try:
+                words = incoming_commands.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                self.handle_command(words)
+            except Exception as e:
+                print(f"Error running command {' '.join(words)}: {e}")
+        self.after(COMMAND_POLL_MS, self._poll_commands)
 
-    def open_saper(self):
-        # Check if window already exists and is still valid
-        try:
-            if self.open_windows['saper'] and self.open_windows['saper'].winfo_exists():
-                # Bring existing window to front
-                self.open_windows['saper'].lift()
-                self.open_windows['saper'].focus_force()
-                return
-        except tk.TclError:
-            # Window was destroyed, clear reference
-            self.open_windows['saper'] = None
-        
-        # Create new window and store reference
-        self.open_windows['saper'] = Saper(self)
+    def handle_command(self, words):
+        """Polecenia z drugiej instancji, np. 'open music', 'toggle panel', 'next track'"""
+        verb, args = words[0], words[1:]
+        phrase = " ".join(words)
+        if verb == 'show':
+            if self.is_collapsed:
+                self.toggle_panel()
+            self.lift()
+        elif verb == 'quit':
+            self.quit()
+        elif phrase == 'toggle panel':
+            self.toggle_panel()
+        elif verb in ('open', 'hide', 'toggle') and args and args[0] in self.panels.specs:
+            getattr(self.panels, verb)(args[0])
+        elif phrase in MUSIC_COMMANDS:
+            player = self.panels.get_panel('music')
+            getattr(player, MUSIC_COMMANDS[phrase])()
+        else:
+            print(f"Unknown command: {phrase}")
+
+    def open_diagnostics(self, event=None):
+        if self.lag_monitor:
+            DiagnosticsWindow(self, self.lag_monitor)
 
 if __name__ == "__main__":
-    app = App()
-    app.mainloop()
\ No newline at end of file
+    app = App(warmup="--warmup" in sys.argv, timing="--timing" in sys.argv,
+              lag_monitor="--no-lag-monitor" not in sys.argv)
+    # Pierwsze uruchomienie też wykonuje swoje polecenie (np. skrót "open music")
+    command = command_from_argv(sys.argv[1:])
+    if command != "show" and app.queue_command(command) != "OK":
+        print(f"Unknown command: {command}")
+    app.mainloop()
+    # quit() tylko kończy mainloop - destroy zamyka panele, a z nimi zaległe zapisy (apps.json, profile)
+    try:
+        app.destroy()
+    except tk.TclError:
+        pass  # Window was already closed by the window manager
+    if instance_server:
+        instance_server.stop()
\ No newline at end of file
@@ -0,0 +1,417 @@
+import abc
+import os
+import queue
+import random
+import threading
+import time
+
+# PID -> nazwa procesu; przeżywa zamknięcie i ponowne zbudowanie miksera
+_process_names = {}
+
+def process_name(pid):
+    """Nazwa procesu z cache; psutil pytany tylko o PID-y, których jeszcze nie widzieliśmy"""
+    name = _process_names.get(pid)
+    if name is None:
+        import psutil
+        try:
+            name = psutil.Process(pid).name()
+        except psutil.Error:
+            return None
+        _process_names[pid] = name
+    return name
+
+def forget_processes(live_pids):
+    """Usuwa z cache PID-y, których nie ma już wśród sesji - ponownie użyty PID dostanie świeżą nazwę"""
+    for pid in [pid for pid in _process_names if pid not in live_pids]:
+        del _process_names[pid]
+
+class MixerBackend(abc.ABC):
+    """Interfejs backendu miksera. Sesja to dict {key, pid, name, volume, muted}, volume w zakresie 0.0 - 1.0.
+
+    Metody wołane są zawsze z jednego wątku (MixerWorker albo pętla demona).
+    subscribe(callback) - callback() bez argumentów, z dowolnego wątku, gdy backend sam
+    zauważy zmianę sesji; backend bez zdarzeń (pycaw) nie woła go nigdy i UI polega na odpytywaniu.
+    """
+
+    is_remote = False
+
+    def __init__(self):
+        self._listeners = []
+
+    @abc.abstractmethod
+    def iter_sessions(self):
+        """Sesje po jednej, w miarę odczytywania"""
+
+    def list_sessions(self):
+        return list(self.iter_sessions())
+
+    @abc.abstractmethod
+    def get_volume(self, key):
+        """Głośność sesji 0.0 - 1.0; KeyError, gdy sesji już nie ma"""
+
+    @abc.abstractmethod
+    def set_volume(self, key, volume):
+        """Ustawia głośność sesji 0.0 - 1.0; KeyError, gdy sesji już nie ma"""
+
+    @abc.abstractmethod
+    def get_mute(self, key):
+        """Czy sesja jest wyciszona; KeyError, gdy sesji już nie ma"""
+
+    @abc.abstractmethod
+    def set_mute(self, key, muted):
+        """Wycisza albo włącza sesję; KeyError, gdy sesji już nie ma"""
+
+    def toggle_mute(self, key):
+        muted = not self.get_mute(key)
+        self.set_mute(key, muted)
+        return muted
+
+    def apply_settings(self, settings):
+        """Wiele zmian w jednym przejściu: {key: {"volume": v, "muted": m}}, oba pola opcjonalne"""
+        for key, setting in settings.items():
+            try:
+                if "volume" in setting:
+                    self.set_volume(key, setting["volume"])
+                if "muted" in setting:
+                    self.set_mute(key, setting["muted"])
+            except KeyError:
+                pass  # Session ended in the meantime
+            except Exception as e:
+                # One broken session must not keep the rest of the profile from being applied
+                print(f"Error applying settings to {key}: {e}")
+
+    def get_peaks(self, keys):
+        """Bieżący poziom (0.0 - 1.0) wielu sesji naraz: {key: peak}; nieznane klucze są pomijane"""
+        return {}
+
+    def subscribe(self, callback):
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _notify(self):
+        for callback in list(self._listeners):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in mixer listener: {e}")
+
+    def close(self):
+        pass
+
+class PycawMixerBackend(MixerBackend):
+    """Sesje audio Windows przez pycaw, bez Tk.
+
+    Sesje są identyfikowane kluczem (InstanceIdentifier sesji), więc lista sesji i polecenia
+    głośności dają się przesłać przez protokół sterujący demona jako zwykły JSON.
+    Obiekt należy do wątku, który go utworzył - COM jest inicjalizowany właśnie tam.
+    """
+
+    def __init__(self):
+        super().__init__()
+        # Import here - pycaw/comtypes only exist on Windows
+        import comtypes
+        from pycaw.pycaw import AudioUtilities, IAudioSessionControl2, ISimpleAudioVolume
+        from pycaw.api.endpointvolume import IAudioMeterInformation
+        try:
+            comtypes.CoInitialize()
+        except OSError:
+            pass  # Already initialised on this thread
+        self._comtypes = comtypes
+        self._utilities = AudioUtilities
+        self._control2 = IAudioSessionControl2
+        self._interface = ISimpleAudioVolume
+        self._meter_interface = IAudioMeterInformation
+        self._volumes = {}
+        self._meters = {}
+
+    def iter_sessions(self):
+        """Yield {key, pid, name, volume, muted} one session at a time, as soon as it is resolved"""
+        manager = self._utilities.GetAudioSessionManager()
+        if manager is None:
+            return
+        enumerator = manager.GetSessionEnumerator()
+        volumes = {}
+        meters = {}
+        pids = set()
+        for i in range(enumerator.GetCount()):
+            control = enumerator.GetSession(i)
+            if control is None:
+                continue
+            control2 = control.QueryInterface(self._control2)
+            pid = control2.GetProcessId()
+            pids.add(pid)
+            # PID 0 is the system sounds session - it has no process, like before
+            name = process_name(pid) if pid else None
+            if name is None:
+                continue
+            volume_interface = control.QueryInterface(self._interface)
+            if not volume_interface:
+                continue
+            key = control2.GetSessionInstanceIdentifier() or str(pid)
+            volumes[key] = volume_interface
+            self._volumes[key] = volume_interface
+            meter = control.QueryInterface(self._meter_interface)
+            if meter:
+                meters[key] = meter
+                self._meters[key] = meter
+            yield {
+                "key": key,
+                "pid": pid,
+                "name": name,
+                "volume": volume_interface.GetMasterVolume(),
+                "muted": bool(volume_interface.GetMute()),
+            }
+        # Drop sessions that are gone only after a complete pass
+        self._volumes = volumes
+        self._meters = meters
+        forget_processes(pids)
+
+    def get_volume(self, key):
+        return self._volumes[key].GetMasterVolume()
+
+    def set_volume(self, key, volume):
+        """volume in range 0.0 - 1.0"""
+        self._volumes[key].SetMasterVolume(max(0.0, min(1.0, float(volume))), None)
+
+    def get_mute(self, key):
+        return bool(self._volumes[key].GetMute())
+
+    def set_mute(self, key, muted):
+        self._volumes[key].SetMute(bool(muted), None)
+
+    def get_peaks(self, keys):
+        peaks = {}
+        for key in keys:
+            meter = self._meters.get(key)
+            if meter is not None:
+                peaks[key] = meter.GetPeakValue()
+        return peaks
+
+    def close(self):
+        self._volumes = {}
+        self._meters = {}
+        self._comtypes.CoUninitialize()
+
+class SimulatedMixerBackend(MixerBackend):
+    """Sztuczne sesje w pamięci - do pomiarów miksera bez Windows.
+
+    sessions - liczba sesji na starcie, latency - opóźnienie (s) każdego wywołania jak w COM,
+    churn - ile zmian na sekundę (nowe/zamknięte sesje, zmiany głośności z zewnątrz).
+    """
+
+    NAMES = ("chrome.exe", "firefox.exe", "spotify.exe", "discord.exe", "vlc.exe", "steam.exe",
+             "teams.exe", "obs64.exe", "game.exe", "explorer.exe")
+
+    def __init__(self, sessions=2000, latency=0.0, churn=0.0, seed=None):
+        super().__init__()
+        self.latency = latency
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.sessions = {}
+        self.next_pid = 1000
+        self.calls = 0
+        for _ in range(sessions):
+            self._add_session()
+        self.closing = threading.Event()
+        self.churn_thread = None
+        if churn > 0:
+            self.churn_thread = threading.Thread(target=self._churn, args=(churn,), name="mixer-sim-churn", daemon=True)
+            self.churn_thread.start()
+
+    def _add_session(self):
+        self.next_pid += 4
+        pid = self.next_pid
+        key = f"sim|{pid}"
+        self.sessions[key] = {
+            "key": key,
+            "pid": pid,
+            "name": self.random.choice(self.NAMES),
+            "volume": round(self.random.random(), 2),
+            "muted": self.random.random() < 0.1,
+        }
+
+    def _call(self):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def iter_sessions(self):
+        with self.lock:
+            sessions = [dict(session) for session in self.sessions.values()]
+        for session in sessions:
+            self._call()
+            yield session
+
+    def get_volume(self, key):
+        self._call()
+        with self.lock:
+            return self.sessions[key]["volume"]
+
+    def set_volume(self, key, volume):
+        self._call()
+        with self.lock:
+            self.sessions[key]["volume"] = max(0.0, min(1.0, float(volume)))
+
+    def get_mute(self, key):
+        self._call()
+        with self.lock:
+            return self.sessions[key]["muted"]
+
+    def set_mute(self, key, muted):
+        self._call()
+        with self.lock:
+            self.sessions[key]["muted"] = bool(muted)
+
+    def get_peaks(self, keys):
+        # One call for the whole batch, like one round of COM reads
+        self._call()
+        with self.lock:
+            return {key: 0.0 if self.sessions[key]["muted"] else self.random.random() * self.sessions[key]["volume"]
+                    for key in keys if key in self.sessions}
+
+    def _churn(self, rate):
+        while not self.closing.wait(1.0 / rate):
+            with self.lock:
+                roll = self.random.random()
+                if roll < 0.25 or not self.sessions:
+                    self._add_session()
+                elif roll < 0.5:
+                    del self.sessions[self.random.choice(list(self.sessions))]
+                else:
+                    session = self.sessions[self.random.choice(list(self.sessions))]
+                    session["volume"] = round(self.random.random(), 2)
+            self._notify()
+
+    def close(self):
+        self.closing.set()
+
+def create_mixer_backend():
+    """Backend wybrany zmienną środowiskową PANEL_MIXER_BACKEND: pycaw (domyślnie) albo simulator.
+
+    Symulator czyta też PANEL_MIXER_SESSIONS, PANEL_MIXER_LATENCY_MS i PANEL_MIXER_CHURN.
+    """
+    if os.environ.get("PANEL_MIXER_BACKEND", "pycaw") == "simulator":
+        return SimulatedMixerBackend(
+            sessions=int(os.environ.get("PANEL_MIXER_SESSIONS", "2000")),
+            latency=float(os.environ.get("PANEL_MIXER_LATENCY_MS", "0")) / 1000,
+            churn=float(os.environ.get("PANEL_MIXER_CHURN", "0")),
+        )
+    return PycawMixerBackend()
+
+class MixerWorker:
+    """Wątek, na którym działa backend miksera - UI nigdy nie czeka na COM ani na demona.
+
+    Zadania fn(backend, *args) wykonywane są po kolei. Backend tworzony jest już w tym wątku,
+    więc COM jest zainicjalizowany tam, gdzie potem używane są jego interfejsy.
+    Odtwarzacz używa tego samego wątku dla swojego silnika (name="music-worker").
+    Gdy backend_factory rzuci wyjątek, on_error(e) jest wołane z tego wątku, a zadania nie są wykonywane.
+    """
+
+    def __init__(self, backend_factory, name="mixer-worker", on_error=None):
+        self.backend = None
+        self.on_error = on_error
+        self.tasks = queue.Queue()
+        self.thread = threading.Thread(target=self._run, args=(backend_factory,), name=name, daemon=True)
+        self.thread.start()
+
+    def submit(self, fn, *args):
+        self.tasks.put((fn, args))
+
+    def stop(self):
+        self.tasks.put(None)
+
+    def _run(self, backend_factory):
+        try:
+            self.backend = backend_factory()
+        except Exception as e:
+            print(f"Error starting mixer backend: {e}")
+            if self.on_error is not None:
+                try:
+                    self.on_error(e)
+                except Exception as callback_error:
+                    print(f"Error reporting mixer backend failure: {callback_error}")
+            return
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                break
+            fn, args = task
+            try:
+                fn(self.backend, *args)
+            except Exception as e:
+                print(f"Error in mixer worker: {e}")
+        try:
+            self.backend.close()
+        except Exception as e:
+            print(f"Error closing mixer backend: {e}")
+
+class VolumeWriter:
+    """Zapisy z suwaków: zostaje tylko ostatnia wartość dla każdej sesji, najwyżej max_rate paczek na sekundę.
+
+    Własny wątek odmierza tempo i oddaje paczki do MixerWorker, który wykonuje wywołania COM.
+    flush() wysyła zaległe wartości od razu - np. po puszczeniu suwaka.
+    """
+
+    def __init__(self, worker, max_rate=30):
+        self.worker = worker
+        self.interval = 1.0 / max_rate
+        self.lock = threading.Lock()
+        # klucz sesji -> {"volume": v, "muted": m} czekające na zapis
+        self.settings = {}
+        self.urgent = False
+        self.closing = False
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self._run, name="volume-writer", daemon=True)
+        self.thread.start()
+
+    def set_volume(self, key, volume):
+        with self.lock:
+            self.settings.setdefault(key, {})["volume"] = volume
+        self.wake.set()
+
+    def set_mute(self, key, muted):
+        with self.lock:
+            self.settings.setdefault(key, {})["muted"] = muted
+            self.urgent = True
+        self.wake.set()
+
+    def apply(self, settings):
+        """Wiele sesji naraz (np. profil) - trafia do backendu jednym apply_settings, bez czekania"""
+        with self.lock:
+            for key, setting in settings.items():
+                self.settings.setdefault(key, {}).update(setting)
+            self.urgent = True
+        self.wake.set()
+
+    def flush(self):
+        with self.lock:
+            self.urgent = True
+        self.wake.set()
+
+    def stop(self):
+        """Zaległe wartości trafiają jeszcze do workera, potem wątek się kończy"""
+        self.closing = True
+        self.wake.set()
+
+    def _run(self):
+        last_flush = 0.0
+        while not self.closing:
+            self.wake.wait()
+            delay = last_flush + self.interval - time.monotonic()
+            if delay > 0 and not self.urgent and not self.closing:
+                # Motion events arriving meanwhile only overwrite self.settings
+                time.sleep(delay)
+            self._flush_pending()
+            last_flush = time.monotonic()
+        self._flush_pending()
+
+    def _flush_pending(self):
+        with self.lock:
+            self.wake.clear()
+            settings, self.settings = self.settings, {}
+            self.urgent = False
+        if settings:
+            self.worker.submit(lambda backend: backend.apply_settings(settings))
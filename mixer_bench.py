@@ -0,0 +1,83 @@
+"""Pomiar miksera na symulowanych sesjach, bez Windows.
+
+python mixer_bench.py [--sessions N] [--latency-ms MS] [--churn N] [--ui]
+--ui mierzy też otwarcie prawdziwego panelu VolumeMixer (wymaga ekranu dla Tk).
+"""
+import argparse
+import os
+import threading
+import time
+from mixer_backend import MixerWorker, SimulatedMixerBackend, VolumeWriter
+
+def bench_enumeration(sessions, latency):
+    worker = MixerWorker(lambda: SimulatedMixerBackend(sessions=sessions, latency=latency, seed=1))
+    first = []
+    done = threading.Event()
+    start = time.perf_counter()
+
+    def enumerate_sessions(backend):
+        count = 0
+        for _ in backend.iter_sessions():
+            if not count:
+                first.append(time.perf_counter() - start)
+            count += 1
+        done.set()
+
+    worker.submit(enumerate_sessions)
+    done.wait()
+    total = time.perf_counter() - start
+    worker.stop()
+    print(f"enumeration: first session {first[0] * 1000:.1f} ms, all {sessions} in {total * 1000:.1f} ms")
+
+def bench_writes(sessions, latency, moves=20000, max_rate=30):
+    backend = SimulatedMixerBackend(sessions=sessions, latency=latency, seed=1)
+    worker = MixerWorker(lambda: backend)
+    writer = VolumeWriter(worker, max_rate=max_rate)
+    keys = [session["key"] for session in backend.list_sessions()[:10]]
+    calls_before = backend.calls
+    start = time.perf_counter()
+    for i in range(moves):
+        writer.set_volume(keys[i % len(keys)], (i % 100) / 100)
+        if i % 200 == 0:
+            time.sleep(0.01)  # Roughly the pace of motion events while dragging
+    writer.flush()
+    writer.stop()
+    writer.thread.join()
+    done = threading.Event()
+    worker.submit(lambda backend: done.set())
+    done.wait()
+    elapsed = time.perf_counter() - start
+    worker.stop()
+    print(f"writes: {moves} slider moves -> {backend.calls - calls_before} backend calls in {elapsed * 1000:.1f} ms")
+
+def bench_ui(sessions, latency, churn):
+    os.environ["PANEL_MIXER_BACKEND"] = "simulator"
+    os.environ["PANEL_MIXER_SESSIONS"] = str(sessions)
+    os.environ["PANEL_MIXER_LATENCY_MS"] = str(latency * 1000)
+    os.environ["PANEL_MIXER_CHURN"] = str(churn)
+    import tkinter as tk
+    from VolumeMixer import VolumeMixer
+    root = tk.Tk()
+    root.withdraw()
+    start = time.perf_counter()
+    mixer = VolumeMixer(root)
+    root.update()
+    opened = time.perf_counter() - start
+    while mixer.poll_job is None:
+        root.update()
+        time.sleep(0.001)
+    print(f"ui: window in {opened * 1000:.1f} ms, {len(mixer.session_keys)} sessions in {(time.perf_counter() - start) * 1000:.1f} ms")
+    root.destroy()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="VolumeMixer benchmark on the session simulator")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--latency-ms", type=float, default=0.05)
+    parser.add_argument("--churn", type=float, default=0.0)
+    parser.add_argument("--ui", action="store_true")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    bench_enumeration(args.sessions, latency)
+    bench_writes(args.sessions, latency)
+    if args.ui:
+        bench_ui(args.sessions, latency, args.churn)
@@ -0,0 +1,170 @@
+import tkinter as tk
+from collections import OrderedDict
+
+def count_widgets(widget):
+    """Liczba widgetów w drzewie - przybliżenie tego, ile pamięci zajmuje panel"""
+    count = 1
+    for child in widget.winfo_children():
+        count += count_widgets(child)
+    return count
+
+class PooledPanel:
+    """Mixin dla paneli: zamknięcie chowa okno zamiast je niszczyć, jeśli panel należy do puli.
+
+    Hooki cyklu życia są wołane przez pulę/rejestr paneli. Panel, który ma pracę
+    w tle (wątki, timery, mierniki), zatrzymuje ją w on_hide/on_suspend.
+    """
+    pool = None
+    panel_visible = True
+    panel_suspended = False
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.hide(self)
+        else:
+            self.destroy()
+
+    def can_evict(self):
+        """Panel, który robi coś w tle (np. gra muzyka), może odmówić usunięcia z puli"""
+        return True
+
+    def on_show(self):
+        """Panel stał się widoczny"""
+
+    def on_hide(self):
+        """Panel został schowany"""
+
+    def on_suspend(self):
+        """Panel boczny zwinięty - cała praca w tle powinna stanąć"""
+
+    def on_resume(self):
+        """Panel boczny rozwinięty ponownie"""
+
+class PanelPool:
+    """Trzyma zbudowane panele: zamknięte są chowane (withdraw), a ponowne otwarcie to tylko deiconify.
+
+    max_widgets ogranicza łączny rozmiar puli - po przekroczeniu niszczone są
+    najdawniej używane ukryte panele.
+    """
+
+    def __init__(self, master, loader, max_widgets=3000):
+        self.master = master
+        self.loader = loader
+        self.max_widgets = max_widgets
+        # klucz -> panel, w kolejności od najdawniej używanego
+        self.panels = OrderedDict()
+        self.sizes = {}
+        self._prebuild_queue = []
+        self._prebuild_callbacks = []
+
+    def _alive(self, key):
+        panel = self.panels.get(key)
+        try:
+            if panel is not None and panel.winfo_exists():
+                return panel
+        except tk.TclError:
+            pass
+        # Okno zniszczone poza pulą
+        self.panels.pop(key, None)
+        self.sizes.pop(key, None)
+        return None
+
+    def alive_panels(self):
+        return [(key, panel) for key in list(self.panels) for panel in [self._alive(key)] if panel is not None]
+
+    def _build(self, key):
+        panel = self.loader(key)(self.master)
+        panel.pool = self
+        panel.pool_key = key
+        self.panels[key] = panel
+        self.sizes[key] = count_widgets(panel)
+        return panel
+
+    def _set_visible(self, panel, visible):
+        """Woła on_show/on_hide tylko przy faktycznej zmianie widoczności"""
+        if panel.panel_visible == visible:
+            return
+        panel.panel_visible = visible
+        if visible:
+            panel.on_show()
+        else:
+            panel.on_hide()
+
+    def get(self, key):
+        """Zwraca panel z puli albo buduje nowy (widoczny)"""
+        panel = self._alive(key)
+        if panel is None:
+            panel = self._build(key)
+        self.panels.move_to_end(key)
+        return panel
+
+    def ensure(self, key):
+        """Zwraca panel z puli; jeśli go nie ma, buduje go schowanego"""
+        panel = self._alive(key)
+        if panel is None:
+            panel = self._build(key)
+            # Schowane przed powrotem do pętli Tk, więc okno nigdy nie mignie na ekranie
+            panel.withdraw()
+            self._set_visible(panel, False)
+            self.panels.move_to_end(key, last=False)
+        return panel
+
+    def is_visible(self, key):
+        panel = self._alive(key)
+        return panel is not None and panel.state() != 'withdrawn'
+
+    def show(self, key):
+        panel = self._alive(key)
+        if panel is None:
+            panel = self._build(key)
+        else:
+            panel.deiconify()
+        self.panels.move_to_end(key)
+        panel.lift()
+        panel.focus_force()
+        self._set_visible(panel, True)
+        self._enforce_cap()
+        return panel
+
+    def hide(self, panel):
+        panel.withdraw()
+        self._set_visible(panel, False)
+        # Lista w panelu mogła urosnąć od zbudowania
+        self.sizes[panel.pool_key] = count_widgets(panel)
+        self._enforce_cap()
+
+    def prebuild(self, keys, delay=100, on_done=None):
+        """Buduje podane panele ukryte, po jednym w każdym wolnym momencie pętli Tk.
+
+        on_done jest wołane, gdy kolejka się opróżni."""
+        self._prebuild_queue.extend(k for k in keys if k not in self._prebuild_queue)
+        if on_done is not None:
+            self._prebuild_callbacks.append(on_done)
+        self.master.after(delay, self._prebuild_step)
+
+    def _prebuild_step(self):
+        if self._prebuild_queue:
+            key = self._prebuild_queue.pop(0)
+            if self._alive(key) is None:
+                try:
+                    self.ensure(key)
+                except Exception as e:
+                    print(f"Prebuilding {key} failed: {e}")
+        if self._prebuild_queue:
+            self.master.after_idle(lambda: self.master.after(50, self._prebuild_step))
+            return
+        callbacks, self._prebuild_callbacks = self._prebuild_callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def _enforce_cap(self):
+        total = sum(self.sizes.values())
+        for key in list(self.panels):
+            if total <= self.max_widgets:
+                break
+            panel = self.panels[key]
+            if panel.state() != 'withdrawn' or not panel.can_evict():
+                continue
+            total -= self.sizes.pop(key, 0)
+            del self.panels[key]
+            panel.destroy()
@@ -0,0 +1,87 @@
+import sys
+import time
+import importlib
+from collections import namedtuple
+from panel_pool import PanelPool
+
+PanelSpec = namedtuple("PanelSpec", "key module_name class_name label color")
+
+class PanelRegistry:
+    """Jedno miejsce, które zna wszystkie panele: ładuje je leniwie, otwiera przez pulę
+    i rozsyła hooki cyklu życia (on_show/on_hide/on_suspend/on_resume)."""
+
+    def __init__(self, master, timings=None, max_widgets=3000):
+        self.master = master
+        self.specs = {}
+        # Czasy importu modułów paneli (wspólny słownik z raportem startu)
+        self.timings = timings if timings is not None else {}
+        self.pool = PanelPool(master, self.load_class, max_widgets=max_widgets)
+        self.suspended = False
+        self._visible_before_suspend = []
+        # Inne obiekty z pracą w tle (np. monitor opóźnień) też chcą wiedzieć o zwinięciu
+        self._suspend_listeners = []
+
+    def register(self, key, module_name, class_name, label, color):
+        self.specs[key] = PanelSpec(key, module_name, class_name, label, color)
+
+    def load_class(self, key):
+        """Importuje moduł panelu przy pierwszym użyciu i zapisuje, ile to trwało"""
+        spec = self.specs[key]
+        module = sys.modules.get(spec.module_name)
+        if module is None:
+            start = time.perf_counter()
+            module = importlib.import_module(spec.module_name)
+            self.timings[f'import {spec.module_name}'] = time.perf_counter() - start
+        return getattr(module, spec.class_name)
+
+    def open(self, key):
+        if self.suspended:
+            self.resume_all()
+        return self.pool.show(key)
+
+    def get_panel(self, key):
+        """Panel bez pokazywania go - np. odtwarzacz sterowany poleceniem z zewnątrz"""
+        return self.pool.ensure(key)
+
+    def hide(self, key):
+        for panel_key, panel in self.pool.alive_panels():
+            if panel_key == key:
+                self.pool.hide(panel)
+
+    def toggle(self, key):
+        if self.pool.is_visible(key):
+            self.hide(key)
+        else:
+            self.open(key)
+
+    def add_suspend_listener(self, on_suspend, on_resume):
+        self._suspend_listeners.append((on_suspend, on_resume))
+
+    def suspend_all(self):
+        """Chowa wszystkie panele i zatrzymuje ich pracę w tle (panel boczny zwinięty)"""
+        if self.suspended:
+            return
+        self.suspended = True
+        self._visible_before_suspend = []
+        for key, panel in self.pool.alive_panels():
+            if panel.panel_visible:
+                self._visible_before_suspend.append(key)
+                self.pool.hide(panel)
+            panel.panel_suspended = True
+            panel.on_suspend()
+        for on_suspend, _ in self._suspend_listeners:
+            on_suspend()
+
+    def resume_all(self):
+        """Wznawia pracę w tle i przywraca panele, które były widoczne przed zwinięciem"""
+        if not self.suspended:
+            return
+        self.suspended = False
+        for _, on_resume in self._suspend_listeners:
+            on_resume()
+        for key, panel in self.pool.alive_panels():
+            panel.panel_suspended = False
+            panel.on_resume()
+        for key in self._visible_before_suspend:
+            self.pool.show(key)
+        self._visible_before_suspend = []
@@ -0,0 +1,172 @@
+import os
+import random
+import shutil
+import threading
+import time
+import pygame
+
+SUPPORTED_FORMATS = ('.mp3', '.wav', '.ogg', '.m4a')
+
+class PlaybackEngine:
+    """Odtwarzanie muzyki bez Tk - używane bezpośrednio przez MusicPlayer albo przez demona audio.
+
+    Wszystkie metody zwracają proste typy (dict/list/bool), więc ten sam interfejs
+    da się wystawić przez protokół sterujący demona.
+    """
+
+    is_remote = False
+
+    def __init__(self, music_folder="Music"):
+        pygame.mixer.init()
+        self.lock = threading.RLock()
+        self.music_folder = music_folder
+        self.playlist = []
+        self.playlist_version = 0
+        self.current_song = None
+        self.current_index = 0
+        self.is_playing = False
+        self.is_paused = False
+        self.shuffle_mode = False
+        self.volume = 0.7
+        self.last_error = None
+        self.is_closing = False
+        self.monitor_thread = None
+        self.monitor_interval = 0.5
+
+        # Ensure music folder exists
+        if not os.path.exists(self.music_folder):
+            os.makedirs(self.music_folder)
+        pygame.mixer.music.set_volume(self.volume)
+        self.load_playlist()
+
+    def load_playlist(self):
+        """Load all supported audio files from the music folder"""
+        with self.lock:
+            self.playlist = [file for file in sorted(os.listdir(self.music_folder))
+                             if file.lower().endswith(SUPPORTED_FORMATS)]
+            self.playlist_version += 1
+            return self.playlist
+
+    def get_playlist(self):
+        with self.lock:
+            return {"version": self.playlist_version, "songs": list(self.playlist)}
+
+    def add_files(self, paths):
+        """Copy files into the music folder; returns a list of [filename, error] for failed copies"""
+        errors = []
+        for file_path in paths:
+            filename = os.path.basename(file_path)
+            try:
+                shutil.copy2(file_path, os.path.join(self.music_folder, filename))
+            except Exception as e:
+                errors.append([filename, str(e)])
+        self.load_playlist()
+        return errors
+
+    def play(self, index=None):
+        """Play the song at index (or the current one); False with last_error set on failure"""
+        with self.lock:
+            if self.is_closing or not self.playlist:
+                return False
+            if index is not None:
+                self.current_index = index
+            if not 0 <= self.current_index < len(self.playlist):
+                return False
+            song_file = self.playlist[self.current_index]
+            try:
+                pygame.mixer.music.load(os.path.join(self.music_folder, song_file))
+                pygame.mixer.music.play()
+            except pygame.error as e:
+                self.last_error = f"Could not play {song_file}: {str(e)}"
+                return False
+            self.is_playing = True
+            self.is_paused = False
+            self.current_song = song_file
+            self.last_error = None
+        self.start_monitor()
+        return True
+
+    def toggle_play_pause(self):
+        """Toggle between play and pause"""
+        with self.lock:
+            if self.is_closing:
+                return False
+            if self.is_playing:
+                if self.is_paused:
+                    pygame.mixer.music.unpause()
+                    self.is_paused = False
+                else:
+                    pygame.mixer.music.pause()
+                    self.is_paused = True
+                return True
+            if self.current_song:
+                pygame.mixer.music.unpause()
+                self.is_playing = True
+                self.is_paused = False
+                self.start_monitor()
+                return True
+        # Start playing first song if available
+        return self.play(0)
+
+    def _step(self, direction):
+        with self.lock:
+            if not self.playlist:
+                return False
+            if self.shuffle_mode:
+                self.current_index = random.randint(0, len(self.playlist) - 1)
+            else:
+                self.current_index = (self.current_index + direction) % len(self.playlist)
+        return self.play()
+
+    def next(self):
+        return self._step(1)
+
+    def previous(self):
+        return self._step(-1)
+
+    def set_shuffle(self, enabled):
+        self.shuffle_mode = bool(enabled)
+        return self.shuffle_mode
+
+    def set_volume(self, volume):
+        """volume in range 0.0 - 1.0"""
+        with self.lock:
+            self.volume = max(0.0, min(1.0, float(volume)))
+            pygame.mixer.music.set_volume(self.volume)
+            return self.volume
+
+    def status(self):
+        with self.lock:
+            return {
+                "current_song": self.current_song,
+                "current_index": self.current_index,
+                "is_playing": self.is_playing,
+                "is_paused": self.is_paused,
+                "shuffle_mode": self.shuffle_mode,
+                "volume": self.volume,
+                "playlist_version": self.playlist_version,
+                "last_error": self.last_error,
+            }
+
+    def start_monitor(self):
+        """Start the song monitor unless one is already running"""
+        if self.monitor_thread is None or not self.monitor_thread.is_alive():
+            self.monitor_thread = threading.Thread(target=self.monitor_song, daemon=True)
+            self.monitor_thread.start()
+
+    def monitor_song(self):
+        """Go to the next song when the current one finishes"""
+        while self.is_playing and not self.is_closing:
+            if not pygame.mixer.music.get_busy() and not self.is_paused:
+                # Song finished - the next one starts from this thread, a busy UI cannot delay it
+                if not self.next():
+                    break
+            time.sleep(self.monitor_interval)
+
+    def close(self):
+        self.is_closing = True
+        try:
+            pygame.mixer.music.stop()
+            pygame.mixer.quit()
+        except:
+            pass
@@ -0,0 +1,107 @@
+import socket
+import threading
+
+# Lokalny port, na którym działająca instancja przyjmuje polecenia
+IPC_HOST = "127.0.0.1"
+IPC_PORT = 47651
+IPC_MAGIC = "PANEL1"
+
+def _parse_message(data):
+    line = data.decode("utf-8", "replace").strip()
+    if not line.startswith(IPC_MAGIC + " "):
+        return None
+    return line[len(IPC_MAGIC) + 1:]
+
+def send_command(command, timeout=0.25):
+    """Wysyła polecenie do działającej instancji. Zwraca odpowiedź albo None, jeśli nikt nie słucha.
+
+    Wołane tylko, gdy port jest zajęty - ktoś słucha, więc krótki timeout wystarcza."""
+    try:
+        with socket.create_connection((IPC_HOST, IPC_PORT), timeout=timeout) as sock:
+            sock.sendall(f"{IPC_MAGIC} {command}\n".encode("utf-8"))
+            data = b""
+            while not data.endswith(b"\n") and len(data) < 1024:
+                chunk = sock.recv(1024)
+                if not chunk:
+                    break
+                data += chunk
+    except OSError:
+        return None
+    return _parse_message(data)
+
+def command_from_argv(argv):
+    """'main.py open music' -> 'open music'; bez argumentów -> 'show'. Flagi (--...) są pomijane."""
+    words = [arg for arg in argv if not arg.startswith("--")]
+    return " ".join(words) if words else "show"
+
+def forward_to_running_instance(argv):
+    """True, jeśli inna instancja przyjęła polecenie - wtedy ta może się od razu zakończyć"""
+    return send_command(command_from_argv(argv)) is not None
+
+class InstanceServer:
+    """Nasłuchuje na lokalnym porcie i przekazuje polecenia z kolejnych uruchomień do handlera.
+
+    handler(command) jest wołany w wątku serwera - nie może dotykać Tk, tylko przekazać polecenie dalej.
+    Odpowiedź wysyłana jest od razu, więc druga instancja nie czeka na UI.
+    """
+
+    def __init__(self, handler):
+        self.handler = handler
+        self.sock = None
+        self.thread = None
+
+    def start(self):
+        """False, jeśli port jest zajęty (np. inna instancja wystartowała w tym samym momencie)"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        exclusive = getattr(socket, "SO_EXCLUSIVEADDRUSE", None)
+        if exclusive is not None:
+            # Windows: inny proces nie może przejąć portu przez SO_REUSEADDR
+            sock.setsockopt(socket.SOL_SOCKET, exclusive, 1)
+        else:
+            # Poza Windows SO_REUSEADDR pozwala tylko ominąć TIME_WAIT po restarcie, nie dzieli portu
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        try:
+            sock.bind((IPC_HOST, IPC_PORT))
+            sock.listen(8)
+        except OSError:
+            sock.close()
+            return False
+        self.sock = sock
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        sock, self.sock = self.sock, None
+        if sock is not None:
+            try:
+                # shutdown budzi wątek zablokowany w accept()
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+
+    def _serve(self):
+        while self.sock is not None:
+            try:
+                conn, _ = self.sock.accept()
+            except OSError:
+                break
+            with conn:
+                try:
+                    conn.settimeout(1.0)
+                    data = b""
+                    while not data.endswith(b"\n") and len(data) < 1024:
+                        chunk = conn.recv(1024)
+                        if not chunk:
+                            break
+                        data += chunk
+                    command = _parse_message(data)
+                    if command is None:
+                        continue
+                    reply = self.handler(command) or "OK"
+                    conn.sendall(f"{IPC_MAGIC} {reply}\n".encode("utf-8"))
+                except Exception as e:
+                    # One bad connection must not end the server - later launches would start a second copy
+                    print(f"Error handling instance command: {e}")
+                    continue
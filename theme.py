@@ -0,0 +1,178 @@
+import tkinter as tk
+from tkinter import ttk
+import weakref
+
+# Palety kolorów - jedyne miejsce, w którym zapisane są kolory interfejsu
+PALETTES = {
+    "dark": {
+        "window_bg": "#1C1C1E",
+        "window_border": "#2C2C2E",
+        "title_bar": "#2A2A2C",
+        "surface": "#3A3A3C",
+        "row": "#2C2C2E",
+        "field": "#48484A",
+        "control": "#5A5A5C",
+        "control_active": "#6A6A6C",
+        "control_pressed": "#4A4A4C",
+        "text": "#FFFFFF",
+        "text_muted": "#CCCCCC",
+        "text_pressed": "#CCCCCC",
+        "accent": "#007AFF",
+        "accent_active": "#0056CC",
+        "danger": "#FF5F57",
+        "danger_active": "#FF3B30",
+        "success": "#34C759",
+        "success_active": "#2FB850",
+    },
+    "light": {
+        "window_bg": "#E5E5EA",
+        "window_border": "#D1D1D6",
+        "title_bar": "#D1D1D6",
+        "surface": "#F2F2F7",
+        "row": "#FFFFFF",
+        "field": "#FFFFFF",
+        "control": "#C7C7CC",
+        "control_active": "#AEAEB2",
+        "control_pressed": "#D8D8DC",
+        "text": "#1C1C1E",
+        "text_muted": "#6C6C70",
+        "text_pressed": "#3A3A3C",
+        "accent": "#007AFF",
+        "accent_active": "#0056CC",
+        "danger": "#FF5F57",
+        "danger_active": "#FF3B30",
+        "success": "#34C759",
+        "success_active": "#2FB850",
+    },
+}
+
+def _compile_options(p):
+    """Zamienia paletę na gotowe zestawy opcji dla widgetów (liczone raz na motyw)"""
+    flat = {"bd": 0, "relief": "flat"}
+    return {
+        "title_bar": {"bg": p["title_bar"]},
+        "title_label": {"bg": p["title_bar"], "fg": p["text"]},
+        "close_button": {"bg": p["danger"], "fg": "white", "font": ("Arial", 8, "bold"),
+                         "activebackground": p["danger_active"], **flat},
+        "content": {"bg": p["surface"]},
+        "label": {"bg": p["surface"], "fg": p["text"]},
+        "muted_label": {"bg": p["surface"], "fg": p["text_muted"]},
+        "field": {"bg": p["field"]},
+        "field_label": {"bg": p["field"], "fg": p["text"]},
+        "entry": {"bg": p["field"], "fg": p["text"], "insertbackground": p["text"], **flat},
+        "row": {"bg": p["row"]},
+        "row_label": {"bg": p["row"], "fg": p["text"]},
+        "button": {"bg": p["control"], "fg": p["text"], "activebackground": p["control_active"], **flat},
+        "accent_button": {"bg": p["accent"], "fg": "white", "activebackground": p["accent_active"], **flat},
+        "success_button": {"bg": p["success"], "fg": "white", "activebackground": p["success_active"], **flat},
+        "danger_button": {"bg": p["danger"], "fg": "white", "activebackground": p["danger_active"], **flat},
+        "row_button": {"bg": p["surface"], "fg": p["text"], "activebackground": p["field"], **flat},
+        "scrollbar": {"bg": p["control"], "troughcolor": p["surface"], "activebackground": p["control_active"]},
+        "listbox": {"bg": p["field"], "fg": p["text"], "selectbackground": p["accent"],
+                    "selectforeground": "white", "bd": 0, "highlightthickness": 0},
+    }
+
+class Theme:
+    """Rozwiązana paleta razem z gotowymi zestawami opcji dla ról widgetów"""
+
+    def __init__(self, name, palette):
+        self.name = name
+        self.palette = dict(palette)
+        self.options = _compile_options(self.palette)
+        # Argumenty dla setup_macos_panel
+        self.chrome = {
+            "bg_color": self.palette["window_bg"],
+            "border_color": self.palette["window_border"],
+            "inner_color": self.palette["surface"],
+        }
+
+    def __getitem__(self, role):
+        return self.options[role]
+
+    def color(self, key):
+        return self.palette[key]
+
+_themes = {}
+_current_name = "dark"
+# Widgety utworzone przez themed(): widget -> (rola, klucze nadpisane ręcznie)
+_themed_widgets = weakref.WeakKeyDictionary()
+_listeners = []
+
+def get_theme(name=None):
+    """Zwraca skompilowany motyw (kompilacja tylko przy pierwszym użyciu)"""
+    name = name or _current_name
+    if name not in _themes:
+        _themes[name] = Theme(name, PALETTES[name])
+    return _themes[name]
+
+def current_theme():
+    return get_theme()
+
+def _register_ttk_styles(style, theme):
+    p = theme.palette
+    # Skonfiguruj styl dla Scale (suwaka)
+    style.configure("Gray.Horizontal.TScale",
+                    background=p["control"],
+                    troughcolor=p["control"],
+                    lightcolor=p["control"],
+                    darkcolor=p["surface"],
+                    bordercolor=p["control"],
+                    focuscolor=p["accent"])
+    style.map("Gray.Horizontal.TScale",
+              background=[('active', p["control_active"]), ('pressed', p["control_pressed"])],
+              troughcolor=[('active', p["control_active"]), ('pressed', p["control_pressed"])])
+
+    # Skonfiguruj styl dla Scrollbar (pasek przewijania)
+    style.configure("Gray.Vertical.TScrollbar",
+                    background=p["control"],
+                    troughcolor=p["surface"],
+                    bordercolor=p["control"],
+                    arrowcolor=p["text"],
+                    lightcolor=p["control_active"],
+                    darkcolor=p["surface"])
+    style.map("Gray.Vertical.TScrollbar",
+              background=[('active', p["control_active"]), ('pressed', p["control_pressed"])],
+              arrowcolor=[('active', p["text"]), ('pressed', p["text_pressed"])])
+
+def ensure_styles(widget=None):
+    """Rejestruje style ttk raz na interpreter Tk - kolejne wywołania nic nie robią"""
+    root = widget._root() if widget is not None else tk._default_root
+    theme = current_theme()
+    if getattr(root, "_ttk_theme_name", None) == theme.name:
+        return root._ttk_style
+    style = ttk.Style(root)
+    root = style.master
+    _register_ttk_styles(style, theme)
+    root._ttk_style = style
+    root._ttk_theme_name = theme.name
+    return style
+
+def themed(widget_class, parent, role, **options):
+    """Tworzy widget z gotowym zestawem opcji roli; opcje podane ręcznie mają pierwszeństwo"""
+    widget = widget_class(parent, **{**current_theme().options[role], **options})
+    _themed_widgets[widget] = (role, frozenset(options))
+    return widget
+
+def add_theme_listener(callback):
+    """callback(theme) wywoływany przy zmianie motywu; zwrócenie False usuwa go z listy"""
+    _listeners.append(callback)
+
+def _apply_theme(theme):
+    for widget, (role, overridden) in list(_themed_widgets.items()):
+        options = {k: v for k, v in theme.options[role].items() if k not in overridden}
+        try:
+            widget.configure(**options)
+        except tk.TclError:
+            # Widget został już zniszczony
+            _themed_widgets.pop(widget, None)
+    _listeners[:] = [callback for callback in _listeners if callback(theme) is not False]
+
+def set_theme(root, name):
+    """Przełącza motyw: style ttk od razu, pozostałe widgety w jednej aktualizacji przy bezczynności"""
+    global _current_name
+    if name == _current_name:
+        return
+    _current_name = name
+    theme = get_theme(name)
+    ensure_styles(root)
+    root.after_idle(_apply_theme, theme)
@@ -0,0 +1,192 @@
+import tkinter as tk
+import os
+import hashlib
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app_paths import get_cache_dir, get_data_dir
+from chrome_cache import LRUCache
+
+# Zmień przy każdej zmianie sposobu skalowania, żeby stare miniatury z dysku nie były używane
+THUMBNAIL_CACHE_VERSION = 1
+# Po tylu sekundach ikona, której nie dało się wczytać, jest próbowana ponownie
+FAILURE_RETRY_SECONDS = 300
+# Miniatura z pamięci jest sprawdzana (stat w puli) najwyżej raz na tyle sekund
+RECHECK_SECONDS = 5
+
+logger = logging.getLogger("thumbnail_cache")
+
+def _setup_logger():
+    if not logger.handlers:
+        handler = logging.FileHandler(os.path.join(get_data_dir("logs"), "icons.log"), encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+
+def render_thumbnail(path, size):
+    """Wczytuje obraz źródłowy i skaluje go do size - jedyne miejsce, które dekoduje pełny plik"""
+    from PIL import Image
+
+    img = Image.open(path)
+    # JPEG dekodowany od razu w mniejszej skali - duże zdjęcia nie są rozpakowywane w całości
+    img.draft("RGB", (size[0] * 2, size[1] * 2))
+    if img.mode not in ("RGB", "RGBA"):
+        img = img.convert("RGBA")
+    return img.resize(size, Image.Resampling.LANCZOS)
+
+class ThumbnailCache:
+    """Miniatury ikon: LRU gotowych PhotoImage w pamięci i małe pliki PNG na dysku.
+
+    Plik na dysku ma klucz (ścieżka, mtime, rozmiar pliku, docelowy rozmiar) - podmieniony plik
+    dostaje nową miniaturę. stat, odczyt i skalowanie odbywają się w puli wątków, więc wolna
+    albo niedostępna ścieżka sieciowa nie blokuje Tk; w wątku Tk powstaje tylko PhotoImage.
+    W pamięci obok PhotoImage leży ten sam klucz - trafienie jest zwracane od razu, a pula
+    sprawdza w tle, czy plik się nie zmienił, i wtedy podmienia miniaturę przez callback.
+    """
+
+    def __init__(self, max_items=256, cache_dir=None, workers=4):
+        self.memory = LRUCache(max_items)
+        self.cache_dir = cache_dir
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="icon")
+        # (id interpretera, ścieżka, rozmiar) -> callbacki czekające na tę miniaturę
+        self.pending = {}
+        # (id interpretera, ścieżka, rozmiar) -> kiedy ostatnio sprawdzono plik trafienia z pamięci
+        self.checked = {}
+        # (ścieżka, rozmiar) -> kiedy wczytanie się nie udało
+        self.failures = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def key_for(self, path, size):
+        """None, jeśli pliku nie ma"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (os.path.abspath(path), stat.st_mtime_ns, stat.st_size, tuple(size))
+
+    def _disk_path(self, key):
+        if self.cache_dir is None:
+            self.cache_dir = get_cache_dir("thumbnails")
+        digest = hashlib.sha1(repr((THUMBNAIL_CACHE_VERSION, key)).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.cache_dir, f"thumb_{digest}.png")
+
+    def _save_to_disk(self, image, path):
+        tmp_path = path + ".tmp"
+        try:
+            image.save(tmp_path, "PNG")
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Error saving thumbnail cache: {e}")
+
+    def has_failed(self, path, size=(20, 20)):
+        failed_at = self.failures.get((path, tuple(size)))
+        return failed_at is not None and time.monotonic() - failed_at < FAILURE_RETRY_SECONDS
+
+    def request(self, master, path, size, callback):
+        """Miniatura z pamięci od razu; inaczej None, a callback(photo) dostaje ją później w wątku Tk.
+
+        Przy błędzie callback dostaje None. Ikona, której nie udało się wczytać, nie jest
+        próbowana ponownie przez FAILURE_RETRY_SECONDS - wtedy callback nie jest wołany wcale.
+        """
+        size = tuple(size)
+        # PhotoImage należy do konkretnego interpretera Tk
+        root = master._root()
+        request_key = (id(root), path, size)
+
+        cached = self.memory.get(request_key)
+        if cached is not None:
+            self.hits += 1
+            file_key, photo = cached
+            if time.monotonic() - self.checked.get(request_key, 0) >= RECHECK_SECONDS:
+                self.checked[request_key] = time.monotonic()
+                self._submit(root, request_key, callback, file_key)
+            return photo
+        if self.has_failed(path, size):
+            return None
+        self._submit(root, request_key, callback, None)
+        return None
+
+    def _submit(self, root, request_key, callback, known_key):
+        waiting = self.pending.get(request_key)
+        if waiting is not None:
+            waiting.append(callback)
+            return
+        self.pending[request_key] = [callback]
+        future = self.executor.submit(self._load, request_key[1], request_key[2], known_key)
+        future.add_done_callback(lambda f: self._hand_over(root, request_key, f))
+
+    def _hand_over(self, root, request_key, future):
+        """Pool thread - moves the result to the Tk thread"""
+        try:
+            root.after(0, self._finish, root, request_key, future)
+        except (RuntimeError, tk.TclError):
+            pass  # Tk is gone
+
+    def _load(self, path, size, known_key=None):
+        """Runs in the pool: (klucz, 'file', ścieżka PNG), (klucz, 'image', obraz PIL)
+        albo (klucz, 'same', None), gdy plik ma wciąż klucz known_key"""
+        start = time.perf_counter()
+        try:
+            key = self.key_for(path, size)
+            if key is None:
+                raise FileNotFoundError(f"No such file: {path}")
+            if key == known_key:
+                return key, "same", None
+            disk_path = self._disk_path(key)
+            if os.path.exists(disk_path):
+                result = (key, "file", disk_path)
+            else:
+                image = render_thumbnail(path, size)
+                self._save_to_disk(image, disk_path)
+                result = (key, "image", image)
+        except Exception as e:
+            self.failures[(path, size)] = time.monotonic()
+            _setup_logger()
+            logger.info(f"failed {path}: {e} ({(time.perf_counter() - start) * 1000:.1f} ms)")
+            raise
+        _setup_logger()
+        logger.info(f"{'disk' if result[1] == 'file' else 'decoded'} {path} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return result
+
+    def _finish(self, root, request_key, future):
+        callbacks = self.pending.pop(request_key, [])
+        photo = None
+        if future.exception() is not None:
+            # Already logged and remembered in failures by _load; a vanished file drops its old thumbnail
+            self.memory.discard(request_key)
+        else:
+            file_key, kind, value = future.result()
+            if kind == "same":
+                cached = self.memory.get(request_key)
+                if cached is None:
+                    # Evicted while the check ran - load it again for whoever is waiting
+                    for callback in callbacks:
+                        self._submit(root, request_key, callback, None)
+                    return
+                photo = cached[1]
+            else:
+                try:
+                    if kind == "file":
+                        # Tk 8.6 czyta PNG sam, bez dekodowania przez PIL
+                        photo = tk.PhotoImage(file=value, master=root)
+                        self.disk_hits += 1
+                    else:
+                        from PIL import ImageTk
+                        photo = ImageTk.PhotoImage(value, master=root)
+                        self.misses += 1
+                    # A changed file replaces the cached thumbnail
+                    self.memory.put(request_key, (file_key, photo))
+                except Exception as e:
+                    print(f"Error loading icon {request_key[1]}: {e}")
+                    self.failures[request_key[1:]] = time.monotonic()
+                    self.memory.discard(request_key)
+        for callback in callbacks:
+            callback(photo)
+
+# Wspólny cache dla wszystkich paneli
+thumbnail_cache = ThumbnailCache()
+
+def request_thumbnail(master, path, callback, size=(20, 20)):
+    return thumbnail_cache.request(master, path, size, callback)
@@ -0,0 +1,146 @@
+import tkinter as tk
+from theme import themed
+
+class VirtualList(tk.Frame):
+    """Przewijana lista o stałej wysokości wierszy, która tworzy widgety tylko dla widocznych wierszy.
+
+    create_row(parent) buduje pusty wiersz (Frame) - wołane tylko, gdy brakuje wierszy do ponownego użycia.
+    bind_row(row, item, index) wypełnia wiersz danymi; wiersze są przepinane między elementami
+    podczas przewijania, więc komendy przycisków powinny czytać element z wiersza, a nie z lambdy.
+    Koszt otwarcia i przewijania nie zależy od liczby elementów.
+
+    key(item) - stały identyfikator elementu. Z nim set_items przesuwa wiersz razem z jego elementem
+    i wypełnia ponownie tylko wiersze, których element się zmienił (porównanie ==), więc zmieniony
+    element należy podmienić w liście, a nie modyfikować w miejscu. Bez key wiersze są przypisane do pozycji.
+    """
+
+    def __init__(self, master, row_height, create_row, bind_row, key=None, overscan=2, row_gap=6, row_padx=5,
+                 role="content", **options):
+        super().__init__(master, **options)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.bind_row = bind_row
+        self.key = key
+        self.overscan = overscan
+        self.row_gap = row_gap
+        self.row_padx = row_padx
+        self.items = []
+        # indeks elementu -> (wiersz, id okna na canvasie)
+        self.visible = {}
+        # indeks elementu -> (klucz, element), którym wiersz był ostatnio wypełniony
+        self.bound = {}
+        # wiersze schowane, gotowe do ponownego użycia
+        self.spare = []
+        self.width = 1
+
+        self.canvas = themed(tk.Canvas, self, role, highlightthickness=0, yscrollincrement=row_height // 2)
+        self.canvas.pack(fill="both", expand=True)
+        self.canvas.configure(yscrollcommand=self._on_view_change)
+        self.canvas.bind("<Configure>", self._on_configure)
+        self.bind_wheel(self.canvas)
+
+    def bind_wheel(self, widget):
+        """Kółko myszy działa nad wierszem i wszystkimi jego dziećmi"""
+        widget.bind("<MouseWheel>", self._on_mousewheel, add="+")
+        for child in widget.winfo_children():
+            self.bind_wheel(child)
+
+    def _on_mousewheel(self, event):
+        self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
+
+    def _on_configure(self, event):
+        self.width = event.width
+        for row, window in self.visible.values():
+            self.canvas.itemconfigure(window, width=self.width - 2 * self.row_padx)
+        self.update_rows()
+
+    def _on_view_change(self, first, last):
+        self.update_rows()
+
+    def set_items(self, items):
+        """Nowa lista elementów; wypełniane są tylko widoczne wiersze, których element się zmienił"""
+        # Own copy - the caller may change its list before the next set_items
+        self.items = list(items)
+        self.canvas.configure(scrollregion=(0, 0, self.width, len(items) * self.row_height))
+        self.update_rows()
+
+    def refresh(self):
+        """Wypełnia wszystkie widoczne wiersze ponownie (np. po zmianie danych poza elementami)"""
+        self.update_rows(force=True)
+
+    def visible_rows(self):
+        """(indeks, element, wiersz) dla wierszy, które są teraz zbudowane"""
+        return [(index, self.items[index], row) for index, (row, _) in self.visible.items()]
+
+    def see(self, index):
+        if not self.items:
+            return
+        top = index * self.row_height
+        view_top = self.canvas.canvasy(0)
+        view_height = self.canvas.winfo_height()
+        if top < view_top or top + self.row_height > view_top + view_height:
+            self.canvas.yview_moveto(top / (len(self.items) * self.row_height))
+
+    def _item_key(self, index):
+        return self.key(self.items[index]) if self.key is not None else index
+
+    def update_rows(self, force=False):
+        height = max(self.canvas.winfo_height(), self.row_height)
+        top = max(0.0, self.canvas.canvasy(0))
+        first = max(0, int(top // self.row_height) - self.overscan)
+        last = min(len(self.items), int((top + height) // self.row_height) + 1 + self.overscan)
+
+        # klucz -> (wiersz z oknem, poprzedni indeks, poprzedni element)
+        previous = {}
+        leftovers = []
+        for index, entry in self.visible.items():
+            key, item = self.bound[index]
+            if key in previous:
+                leftovers.append(entry)
+            else:
+                previous[key] = (entry, index, item)
+        self.visible = {}
+        self.bound = {}
+
+        # A row that still shows an item in range follows it to its new position
+        unplaced = []
+        for index in range(first, last):
+            key = self._item_key(index)
+            item = self.items[index]
+            old = previous.pop(key, None)
+            if old is None:
+                unplaced.append((index, key, item))
+                continue
+            entry, old_index, old_item = old
+            if old_index != index:
+                self._place(entry, index)
+            self.visible[index] = entry
+            self.bound[index] = (key, item)
+            if force or old_item != item:
+                self.bind_row(entry[0], item, index)
+
+        # Rows of items that left the range are reused for the ones that entered it, the rest are hidden
+        leftovers.extend(entry for entry, _, _ in previous.values())
+        for index, key, item in unplaced:
+            entry = leftovers.pop() if leftovers else self._take_row()
+            self._place(entry, index)
+            self.visible[index] = entry
+            self.bound[index] = (key, item)
+            self.bind_row(entry[0], item, index)
+        for entry in leftovers:
+            self.canvas.itemconfigure(entry[1], state="hidden")
+            self.spare.append(entry)
+
+    def _place(self, entry, index):
+        self.canvas.coords(entry[1], self.row_padx, index * self.row_height + self.row_gap // 2)
+        self.canvas.itemconfigure(entry[1], state="normal", width=self.width - 2 * self.row_padx)
+
+    def _take_row(self):
+        if self.spare:
+            return self.spare.pop()
+        row = self.create_row(self.canvas)
+        self.bind_wheel(row)
+        window = self.canvas.create_window(self.row_padx, 0, window=row, anchor="nw",
+                                           width=self.width - 2 * self.row_padx,
+                                           height=self.row_height - self.row_gap)
+        return row, window
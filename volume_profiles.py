@@ -0,0 +1,81 @@
+import json
+import os
+from app_paths import get_data_dir
+
+VOLUME_PROFILES_VERSION = 1
+
+def app_key(name):
+    """Ustawienia zapamiętywane po nazwie pliku exe, bez względu na wielkość liter"""
+    return name.lower()
+
+class VolumeProfileStore:
+    """Zapamiętana głośność/wyciszenie dla każdego programu i nazwane profile ("meeting", "gaming").
+
+    Plik: {"version": 1, "apps": {"spotify.exe": [0.3, false]}, "profiles": {"meeting": {...}}}
+    Ustawienie to para [volume, muted]; volume w zakresie 0.0 - 1.0.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(get_data_dir(), "volume_profiles.json")
+        self.apps = {}
+        self.profiles = {}
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            print(f"Error loading volume profiles: {e}")
+            return
+        if data.get("version") != VOLUME_PROFILES_VERSION:
+            return
+        self.apps = {name: tuple(setting) for name, setting in data.get("apps", {}).items()}
+        self.profiles = {profile: {name: tuple(setting) for name, setting in apps.items()}
+                         for profile, apps in data.get("profiles", {}).items()}
+
+    def save(self):
+        if not self.dirty:
+            return
+        data = {
+            "version": VOLUME_PROFILES_VERSION,
+            "apps": {name: [round(volume, 3), muted] for name, (volume, muted) in self.apps.items()},
+            "profiles": {profile: {name: [round(volume, 3), muted] for name, (volume, muted) in apps.items()}
+                         for profile, apps in self.profiles.items()},
+        }
+        tmp_path = self.path + ".tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+        except OSError as e:
+            print(f"Error saving volume profiles: {e}")
+
+    def remember(self, name, volume, muted):
+        setting = (volume, bool(muted))
+        if self.apps.get(app_key(name)) != setting:
+            self.apps[app_key(name)] = setting
+            self.dirty = True
+
+    def target(self, name):
+        """(volume, muted) zapamiętane dla programu albo None"""
+        return self.apps.get(app_key(name))
+
+    def profile_names(self):
+        return sorted(self.profiles)
+
+    def save_profile(self, profile, settings):
+        """settings: {nazwa exe: (volume, muted)} - zwykle stan wszystkich sesji w tej chwili"""
+        self.profiles[profile] = {app_key(name): (volume, bool(muted)) for name, (volume, muted) in settings.items()}
+        self.dirty = True
+
+    def activate_profile(self, profile):
+        """Ustawienia profilu stają się zapamiętanymi ustawieniami programów; zwraca je"""
+        settings = self.profiles.get(profile, {})
+        for name, (volume, muted) in settings.items():
+            self.remember(name, volume, muted)
+        return settings